@@ -0,0 +1,54 @@
+"""Compare per-record flatten_dict/nested_dict with Utils.normalize/Utils.denormalize.
+
+Usage::
+
+    python benchmarks/bench_normalize.py --records 200000
+"""
+
+import argparse
+import time
+
+from pandas import DataFrame
+from pytoolkit.utilities import flatten_dict, nested_dict
+
+from splunksdk.utils.splunk_utils import Utils
+
+
+def make_records(count: int):
+    """Nested KV Store style documents."""
+    return [
+        {
+            "_key": f"key{_}",
+            "host": f"host{_ % 50}",
+            "value": _,
+            "meta": {"owner": "admin", "level": _ % 7, "location": {"site": f"s{_ % 3}", "rack": _ % 11}},
+        }
+        for _ in range(count)
+    ]
+
+
+def timed(label: str, func):
+    """Run ``func`` once and print the elapsed time."""
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<40}{time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+    records = make_records(args.records)
+
+    timed("flatten_dict + DataFrame", lambda: DataFrame.from_records(
+        [flatten_dict(_) for _ in records], index="_key"))
+    frame = timed("Utils.normalize", lambda: Utils.normalize(records))
+
+    flat = [dict(_key=key, **row) for key, row in zip(frame.index, frame.to_dict(orient="records"))]
+    timed("nested_dict per record", lambda: [nested_dict(_) for _ in flat])
+    timed("Utils.denormalize", lambda: list(Utils.denormalize(frame)))
+
+
+if __name__ == "__main__":
+    main()
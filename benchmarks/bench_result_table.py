@@ -0,0 +1,80 @@
+"""Compare the memory of list-of-dict search results with the column oriented ResultTable.
+
+Parses the same ``json`` output mode payload with ``Utils.splunk_exporter`` both ways and
+reports the traced memory held by the results, the parse time and the time to build a
+DataFrame from each.
+
+Usage::
+
+    python benchmarks/bench_result_table.py --rows 500000
+"""
+
+import argparse
+import gc
+import io
+import json
+import time
+import tracemalloc
+
+from pandas import DataFrame
+
+from splunksdk.utils.splunk_utils import Utils
+
+
+def make_payload(count: int) -> bytes:
+    """Search results in the ``json`` output mode, ten fields per event."""
+    results = [
+        {
+            "_time": f"2023-01-01T00:{_ // 60 % 60:02d}:{_ % 60:02d}.000+00:00",
+            "_raw": f"event {_} status=200 bytes={_ * 7 % 5000}",
+            "host": f"host{_ % 50}",
+            "source": "/var/log/access.log",
+            "sourcetype": "access_combined",
+            "index": "main",
+            "status": "200" if _ % 10 else "404",
+            "bytes": str(_ * 7 % 5000),
+            "clientip": f"10.0.{_ // 256 % 256}.{_ % 256}",
+            "uri": f"/page/{_ % 1000}",
+        }
+        for _ in range(count)
+    ]
+    return json.dumps({"preview": False, "init_offset": 0, "messages": [], "results": results}).encode()
+
+
+def measure(payload: bytes, compact: bool):
+    """Parse ``payload`` and return the results, traced bytes held and seconds taken."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = Utils.splunk_exporter(service=io.BufferedReader(io.BytesIO(payload)), compact=compact)
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, held, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+    payload = make_payload(args.rows)
+
+    rows, rows_bytes, rows_seconds = measure(payload, compact=False)
+    start = time.perf_counter()
+    DataFrame.from_records(rows.json_response)
+    rows_frame = time.perf_counter() - start
+    del rows
+
+    table, table_bytes, table_seconds = measure(payload, compact=True)
+    start = time.perf_counter()
+    table.json_response.to_dataframe()
+    table_frame = time.perf_counter() - start
+
+    print(f"{'':<16}{'memory MiB':>12}{'parse s':>10}{'DataFrame s':>13}")
+    print(f"{'list of dicts':<16}{rows_bytes / 2**20:>12.1f}{rows_seconds:>10.3f}{rows_frame:>13.3f}")
+    print(f"{'ResultTable':<16}{table_bytes / 2**20:>12.1f}{table_seconds:>10.3f}{table_frame:>13.3f}")
+    print(f"memory saved: {1 - table_bytes / rows_bytes:.0%}")
+
+
+if __name__ == "__main__":
+    main()
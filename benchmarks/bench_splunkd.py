@@ -0,0 +1,236 @@
+"""Search and KV Store hot path benchmarks against the local fake splunkd.
+
+Every case runs ``--iterations`` times and reports throughput (rows per second),
+latency percentiles, the peak RSS of the process and the peak Python allocation of
+one extra traced run. REST calls made by each case are summarized with the
+instrumentation hooks. Results are written as JSON; pass an earlier file with
+``--compare`` to print the change per case and fail on throughput regressions.
+
+Usage::
+
+    python benchmarks/bench_splunkd.py --rows 50000 --docs 20000 --output bench.json
+    python benchmarks/bench_splunkd.py --rows 50000 --docs 20000 --compare bench.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+
+from fake_splunkd import FakeSplunkd  # noqa: E402  pylint: disable=wrong-import-position
+
+from splunksdk import __version__  # noqa: E402  pylint: disable=wrong-import-position
+from splunksdk.splunk import SplunkApi  # noqa: E402  pylint: disable=wrong-import-position
+from splunksdk.utils.splunk_utils import Utils  # noqa: E402  pylint: disable=wrong-import-position
+
+RESULT_FORMATS: Dict[str, str] = {
+    "json": "search_resp",
+    "csv": "csv_results",
+    "json_cols": "json_cols_results",
+    "json_rows": "json_rows_results",
+    "xml": "xml_results",
+}
+COLLECTION: str = "bench"
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the process in MiB."""
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest rank percentile of sorted values."""
+    return values[min(len(values) - 1, max(0, int(round(percent / 100 * len(values))) - 1))]
+
+
+def measure(client: SplunkApi, func: Callable[[], Any], rows: int, iterations: int) -> Dict[str, Any]:
+    """Time ``func`` ``iterations`` times, then trace one more run for its peak allocation."""
+    latencies: List[float] = []
+    with client.summary() as summary:
+        for _ in range(iterations):
+            start: float = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    total: float = sum(latencies)
+    return {
+        "iterations": iterations,
+        "rows": rows,
+        "throughput_rows_per_s": rows * iterations / total if total else 0.0,
+        "latency": {
+            "mean": total / iterations,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1],
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_alloc_mb": peak_alloc / (1024 * 1024),
+        "rest": {
+            key: {"count": value["count"], "bytes": value["bytes"], "p95": value["p95"]}
+            for key, value in summary.report().items()
+            if key.startswith("rest ")
+        },
+    }
+
+
+def search_cases(client: SplunkApi, rows: int, page_size: int) -> Dict[str, Callable[[], Any]]:
+    """
+    ``Search.get_results`` per output mode, sequential ``iter_results`` against parallel ``download``
+    in ``page_size`` windows and ``Utils.splunk_exporter`` on a prefetched payload.
+    """
+    handle = client.Search.start_search(query=f"search index=main count={rows}")
+    handle.watch().result()
+    cases: Dict[str, Callable[[], Any]] = {}
+    for output_mode, attribute in RESULT_FORMATS.items():
+
+        def get_results(output_mode: str = output_mode, attribute: str = attribute) -> Any:
+            handle.get_results(memory_budget=0)
+            return getattr(handle, attribute)
+
+        cases[f"Search.get_results[{output_mode}]"] = get_results
+    cases["Search.iter_results"] = lambda: sum(1 for _ in handle.iter_results(chunk_size=page_size))
+    cases["Search.download"] = lambda: sum(1 for _ in handle.download(window_size=page_size))
+    payload: bytes = handle.job.results(output_mode="json", count=0).read()
+    cases["Utils.splunk_exporter"] = lambda: Utils.splunk_exporter(service=io.BufferedReader(io.BytesIO(payload)))
+    cases["Utils.splunk_exporter[compact]"] = lambda: Utils.splunk_exporter(
+        service=io.BufferedReader(io.BytesIO(payload)), compact=True
+    )
+    return cases
+
+
+def kvstore_cases(client: SplunkApi, splunkd: FakeSplunkd, docs: int, page_size: int) -> Dict[str, Callable[[], Any]]:
+    """``KVstore.get_collection_data`` over ``docs`` documents and single document ``insert_data``."""
+    splunkd.load_documents(
+        COLLECTION, [{"_key": f"key{_}", "host": f"host{_ % 50}", "value": _, "meta": {"level": _ % 7}} for _ in range(docs)]
+    )
+    client.KVstore.set_kvstore(COLLECTION)
+    counter: List[int] = [0]
+
+    def insert_data() -> None:
+        counter[0] += 1
+        client.KVstore.insert_data({"_key": f"new{counter[0]}", "host": "bench", "value": counter[0]})
+
+    return {
+        "KVstore.get_collection_data": lambda: client.KVstore.get_collection_data(page_size=page_size),
+        "KVstore.insert_data": insert_data,
+    }
+
+
+def run(
+    rows: int = 10000,
+    docs: int = 10000,
+    page_size: int = 1000,
+    latency: float = 0.0,
+    iterations: int = 5,
+    pooled: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run every case against a fresh fake splunkd.
+
+    :return: Benchmark report
+    :rtype: Dict[str, Any]
+    """
+    config: Dict[str, Any] = {
+        "rows": rows,
+        "docs": docs,
+        "page_size": page_size,
+        "latency": latency,
+        "iterations": iterations,
+        "pooled": pooled,
+    }
+    results: Dict[str, Any] = {}
+    with FakeSplunkd(result_rows=rows, latency=latency, max_rows_per_query=page_size) as splunkd:
+        client = SplunkApi(pooled=pooled, **splunkd.login_kwargs())
+        for name, func in search_cases(client, rows, page_size).items():
+            results[name] = measure(client, func, rows, iterations)
+        for name, func in kvstore_cases(client, splunkd, docs, page_size).items():
+            count: int = docs if name == "KVstore.get_collection_data" else 1
+            results[name] = measure(client, func, count, iterations if count > 1 else iterations * 20)
+        client.watcher.stop()
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "config": config,
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Print the change of every case against ``baseline``.
+
+    :return: Cases whose throughput dropped by more than ``threshold``
+    :rtype: List[str]
+    """
+    regressions: List[str] = []
+    print(f"{'case':<36}{'baseline rows/s':>18}{'rows/s':>14}{'change':>9}{'p95 change':>12}")
+    for name, result in report["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            print(f"{name:<36}{'-':>18}{result['throughput_rows_per_s']:>14.0f}")
+            continue
+        change: float = result["throughput_rows_per_s"] / before["throughput_rows_per_s"] - 1
+        p95: float = result["latency"]["p95"] / before["latency"]["p95"] - 1 if before["latency"]["p95"] else 0.0
+        print(
+            f"{name:<36}{before['throughput_rows_per_s']:>18.0f}{result['throughput_rows_per_s']:>14.0f}"
+            f"{change:>+9.1%}{p95:>+12.1%}"
+        )
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="search result rows")
+    parser.add_argument("--docs", type=int, default=10000, help="KV Store documents")
+    parser.add_argument("--page-size", type=int, default=1000, help="KV Store page size (max_rows_per_query)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--pooled", action="store_true", help="use the pooled keep-alive handler")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    parser.add_argument("--compare", help="JSON report of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="throughput drop reported as a regression")
+    args = parser.parse_args()
+
+    report = run(
+        rows=args.rows,
+        docs=args.docs,
+        page_size=args.page_size,
+        latency=args.latency,
+        iterations=args.iterations,
+        pooled=args.pooled,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if not args.compare:
+        print(json.dumps(report["results"], indent=2))
+        return 0
+    with open(args.compare, "r", encoding="utf-8") as f:
+        regressions = compare(report, json.load(f), args.threshold)
+    if regressions:
+        print(f"throughput regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
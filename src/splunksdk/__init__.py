@@ -40,3 +40,24 @@ __all__: list[str] = [
     "SplunkSearchError",
     "SplunkSearchFatal",
 ]
+
+# Loaded on first attribute access (PEP 562) so ``import splunksdk`` stays cheap
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "SplunkApi": "splunksdk.splunk",
+    "AsyncSplunkApi": "splunksdk.async_splunk",
+    "Utils": "splunksdk.utils.splunk_utils",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib  # pylint: disable=import-outside-toplevel
+
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
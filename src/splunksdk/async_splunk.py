@@ -0,0 +1,629 @@
+#  pylint: disable=invalid-name,protected-access
+"""Asyncio Splunk Options."""
+
+import asyncio
+import json
+import ssl
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+from splunksdk import (
+    InvalidNameException,
+    NoSuchCapability,
+    OperationError,
+    SplunkApiNoOperationRunning,
+    SplunkSearchError,
+    SplunkSearchFatal,
+)
+from splunksdk.utils.kvstore import BulkSaveResults
+from splunksdk.utils.login import SplunkLogin
+from splunksdk.utils.statics import (
+    ASYNC_MAX_CONCURRENCY,
+    KVSTORE_BATCH_SAVE_LIMIT,
+    KVSTORE_PAGE_SIZE,
+    KVSTORE_QUERY,
+    KVSTORE_RETRIES,
+    KVSTORE_RETRY_DELAY,
+    POOL_IDLE_TIMEOUT,
+    POOL_SIZE,
+    RESULTS_CHUNK_SIZE,
+)
+from splunksdk.utils.watcher import WATCHER_BACKOFF, WATCHER_MAX_INTERVAL, WATCHER_MIN_INTERVAL
+
+
+class AsyncHTTPError(OperationError):
+    """Non 2xx response from splunkd."""
+
+    def __init__(self, status: int, reason: str, body: str) -> None:
+        super().__init__(f"HTTP {status} {reason}: {body}")
+        self.status: int = status
+        self.reason: str = reason
+        self.body: str = body
+
+
+def _is_true(value: Any) -> bool:
+    """Splunk JSON flags are booleans, older versions send "1"/"0"."""
+    return value in (True, 1, "1", "true", "True")
+
+
+def _check_messages(messages: Iterable[Dict[str, Any]]) -> None:
+    """Raise on ERROR and FATAL search messages."""
+    found: Dict[str, str] = {str(_.get("type")): str(_.get("text")) for _ in messages}
+    if "ERROR" in found:
+        raise SplunkSearchError(f'ERROR: {found["ERROR"]}')
+    if "FATAL" in found:
+        raise SplunkSearchFatal(f'FATAL: {found["FATAL"]}')
+
+
+class AsyncSplunkApi:
+    """
+    Asyncio Splunk API.
+
+    Same ``KVstore`` and ``Search`` surface as ``SplunkApi`` with awaitable calls, on a
+    pooled ``aiohttp`` transport. At most ``max_concurrency`` requests are in flight at
+    once; requests over the limit wait for a slot. Logs in on first use and again when
+    splunkd answers 401, one login at a time. Requires the optional ``aiohttp`` dependency
+    (``pip install splunk-sdk928[async]``).
+
+    :param max_concurrency: Requests in flight, defaults to ASYNC_MAX_CONCURRENCY
+    :type max_concurrency: int, optional
+    :param pool_size: Keep-alive connections per host, defaults to POOL_SIZE
+    :type pool_size: int, optional
+    :param idle_timeout: Seconds an idle connection is kept, defaults to POOL_IDLE_TIMEOUT
+    :type idle_timeout: float, optional
+
+    See ``SplunkLogin`` for the connection parameters.
+
+    **Example**::
+
+        async with AsyncSplunkApi(host="splunk", username="admin", password="changeme") as splunk:
+            await splunk.Search.start_search(query="search index=main | head 10")
+            async for row in splunk.Search.iter_results():
+                print(row)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+        pool_size: int = POOL_SIZE,
+        idle_timeout: float = POOL_IDLE_TIMEOUT,
+        **kwargs: Any,
+    ) -> None:
+        if aiohttp is None:
+            raise OperationError("aiohttp is required for AsyncSplunkApi: pip install splunk-sdk928[async]")
+        if "host" not in kwargs:
+            kwargs["host"] = kwargs.get("splunk_host", kwargs.get("hostname", "localhost"))
+        self.login_config: SplunkLogin = SplunkLogin.create_from_kwargs(**kwargs)
+        self.max_concurrency: int = max_concurrency
+        self.pool_size: int = pool_size
+        self.idle_timeout: float = idle_timeout
+        token: Any = self.login_config.token
+        self.token: Optional[str] = token if isinstance(token, str) and token else None
+        self.logins: int = 0
+        self._session: Any = None
+        self._semaphore: Union[asyncio.Semaphore, None] = None
+        self._login_lock: Union[asyncio.Lock, None] = None
+        self.KVstore: AsyncKVstore = AsyncKVstore(self)
+        self.Search: AsyncSearch = AsyncSearch(self)
+
+    def __repr__(self) -> str:
+        """Class Representation."""
+        return self.__str__()
+
+    def __str__(self) -> str:
+        """String Representation of Class."""
+        return str(self.__class__).split(".", maxsplit=-1)[-1]
+
+    async def __aenter__(self) -> "AsyncSplunkApi":
+        await self.login()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def base_url(self) -> str:
+        """Scheme, host and port of splunkd."""
+        return f"{self.login_config.scheme}://{self.login_config.host}:{self.login_config.port}"
+
+    def _ssl(self) -> Union[ssl.SSLContext, bool]:
+        if self.login_config.scheme != "https":
+            return False
+        if not self.login_config.verify:
+            return False
+        context: Any = self.login_config.context
+        return context if isinstance(context, ssl.SSLContext) else True
+
+    def _open(self) -> Any:
+        """Transport session, created on first use inside the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.idle_timeout,
+                ssl=self._ssl(),
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._login_lock = asyncio.Lock()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the transport and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def path(self, endpoint: str, namespaced: bool = True) -> str:
+        """Absolute path of an endpoint in the connection's namespace."""
+        owner: Any = self.login_config.owner
+        app: Any = self.login_config.app
+        if namespaced and (isinstance(owner, str) or isinstance(app, str)):
+            owner = owner if isinstance(owner, str) else "-"
+            app = app if isinstance(app, str) else "-"
+            return f"/servicesNS/{quote(owner, safe='')}/{quote(app, safe='')}/{endpoint}"
+        return f"/services/{endpoint}"
+
+    async def login(self, rejected: Optional[str] = None) -> str:
+        """
+        Log in and store the session token.
+
+        Concurrent callers wait for a single login; a caller whose token was already
+        replaced by another login reuses that token.
+
+        :param rejected: Token splunkd rejected, defaults to the current token
+        :type rejected: str, optional
+        :return: Session token
+        :rtype: str
+        """
+        self._open()
+        rejected = rejected or self.token
+        async with self._login_lock:  # type: ignore
+            if self.token and self.token != rejected:
+                return self.token
+            async with self._session.post(
+                self.base_url + self.path("auth/login", namespaced=False),
+                data={
+                    "username": self.login_config.username,
+                    "password": self.login_config.password,
+                    "output_mode": "json",
+                },
+            ) as response:
+                body: str = await response.text()
+                if response.status >= 400:
+                    raise AsyncHTTPError(response.status, response.reason or "", body)
+            self.token = f"Splunk {json.loads(body)['sessionKey']}"
+            self.logins += 1
+        return self.token
+
+    async def _send(self, method: str, endpoint: str, **kwargs: Any) -> Tuple[int, str, Optional[str]]:
+        """Send one request, returns the status, body and the token it was sent with."""
+        session = self._open()
+        if not self.token:
+            await self.login()
+        async with self._semaphore:  # type: ignore
+            token: Optional[str] = self.token
+            async with session.request(method, self.base_url + self.path(endpoint), **self._options(kwargs)) as response:
+                return response.status, await response.text(), token
+
+    def _options(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Request options with JSON output and the session token."""
+        options: Dict[str, Any] = dict(kwargs)
+        options["params"] = {"output_mode": "json", **(kwargs.get("params") or {})}
+        options["headers"] = {"Authorization": self.token, **(kwargs.get("headers") or {})}
+        return options
+
+    async def request(self, method: str, endpoint: str, **kwargs: Any) -> Any:
+        """
+        Send a request and decode the JSON response.
+
+        :param method: HTTP method
+        :type method: str
+        :param endpoint: Endpoint relative to the namespace, e.g. ``storage/collections/config``
+        :type endpoint: str
+        :param params: Query parameters, ``output_mode`` defaults to json
+        :type params: Dict[str, Any], optional
+        :raises AsyncHTTPError: Non 2xx response
+        :return: Decoded response body, None when empty
+        :rtype: Any
+        """
+        status, body, token = await self._send(method, endpoint, **kwargs)
+        if status == 401 and self.login_config.password:
+            await self.login(rejected=token)
+            status, body, token = await self._send(method, endpoint, **kwargs)
+        if status >= 400:
+            raise AsyncHTTPError(status, "", body)
+        return json.loads(body) if body.strip() else None
+
+    async def stream_lines(self, method: str, endpoint: str, **kwargs: Any) -> AsyncIterator[bytes]:
+        """
+        Send a request and yield the response body line by line as it arrives.
+
+        The concurrency slot is held until the stream is consumed or closed. A rejected
+        session is renewed once before the first line is yielded, like :meth:`request`.
+        """
+        session = self._open()
+        if not self.token:
+            await self.login()
+        for attempt in range(2):
+            token = self.token
+            async with self._semaphore:  # type: ignore
+                async with session.request(
+                    method, self.base_url + self.path(endpoint), **self._options(kwargs)
+                ) as response:
+                    if response.status == 401 and not attempt and self.login_config.password:
+                        await response.read()
+                    else:
+                        if response.status >= 400:
+                            raise AsyncHTTPError(response.status, response.reason or "", await response.text())
+                        async for line in response.content:
+                            yield line
+                        return
+            await self.login(rejected=token)
+
+
+class AsyncKVstore:
+    """
+    Asyncio Splunk KVstore
+    see: https://docs.splunk.com/Documentation/SplunkCloud/9.0.2305/RESTREF/RESTkvstore
+    """
+
+    def __init__(self, parent: AsyncSplunkApi) -> None:
+        self._parent_class: AsyncSplunkApi = parent
+        self.store: Optional[str] = None
+
+    def __repr__(self) -> str:
+        """Class Representation."""
+        return f"{self._parent_class.__str__()}.{self.__str__()}"
+
+    def __str__(self) -> str:
+        """String Representation of Class."""
+        return str(self.__class__).split(".", maxsplit=-1)[-1]
+
+    def _data(self, suffix: str = "") -> str:
+        if not self.store:
+            raise NoSuchCapability("Requires a KVstore to be defined")
+        return f"storage/collections/data/{quote(self.store, safe='')}{suffix}"
+
+    async def collections(self) -> List[str]:
+        """KVStore Collections."""
+        response = await self._parent_class.request("GET", "storage/collections/config", params={"count": 0})
+        return [_["name"] for _ in response.get("entry") or []]
+
+    async def set_kvstore(self, collection_name: str) -> None:
+        """Sets KVStore Collection."""
+        if collection_name not in await self.collections():
+            raise InvalidNameException(f"Collection {collection_name} does not exist")
+        self.store = collection_name
+
+    async def create_collection(self, name: str, **kwargs: Any) -> None:
+        """Create a collection and set it as the current KVStore."""
+        if name in await self.collections():
+            raise InvalidNameException(f"Collection {name} already exists")
+        await self._parent_class.request("POST", "storage/collections/config", data={"name": name, **kwargs})
+        self.store = name
+
+    async def delete_collection(self, collection_name: str) -> None:
+        """Delete a collection."""
+        await self._parent_class.request("DELETE", f"storage/collections/config/{quote(collection_name, safe='')}")
+        if self.store == collection_name:
+            self.store = None
+
+    async def get_item(self, key: str) -> Dict[str, Any]:
+        """Get Item by ID or _key."""
+        return await self._parent_class.request("GET", self._data(f"/{quote(key, safe='')}"))
+
+    async def insert_data(self, data: Union[str, Dict[str, Any]]) -> str:
+        """Insert a document, returns its ``_key``."""
+        document: str = data if isinstance(data, str) else json.dumps(data)
+        response = await self._parent_class.request(
+            "POST", self._data(), data=document, headers={"Content-Type": "application/json"}
+        )
+        if not response or not response.get("_key"):
+            raise OperationError(f"Unable to insert data {data}")
+        return response["_key"]
+
+    async def update_data(self, key: str, data: Union[Dict[str, Any], str]) -> None:
+        """Update entry"""
+        document: str = data if isinstance(data, str) else json.dumps(data)
+        await self._parent_class.request(
+            "POST", self._data(f"/{quote(key, safe='')}"), data=document, headers={"Content-Type": "application/json"}
+        )
+
+    async def delete_data(self, query: Union[Dict[str, Any], None] = None) -> None:
+        """Delete documents matching ``query``, every document when omitted."""
+        params: Dict[str, Any] = {"query": json.dumps(query)} if query else {}
+        await self._parent_class.request("DELETE", self._data(), params=params)
+
+    async def iter_collection_data(
+        self, page_size: int = KVSTORE_PAGE_SIZE, batch: bool = False, **kwargs: Any
+    ) -> AsyncIterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Page through the collection with ``skip``/``limit``, sorted by ``_key`` unless ``sort`` is given.
+
+        :param page_size: Documents requested per page, defaults to KVSTORE_PAGE_SIZE
+        :type page_size: int, optional
+        :param batch: Yield a list of documents per page instead of single documents, defaults to False
+        :type batch: bool, optional
+        :param query: Query dictionary, see ``KVstore.get_collection_data``
+        :type query: Dict[str, Any], optional
+        :yield: Documents or pages of documents
+        :rtype: AsyncIterator[Union[Dict[str, Any], List[Dict[str, Any]]]]
+        """
+        params: Dict[str, Any] = {k: v for k, v in kwargs.items() if k in KVSTORE_QUERY}
+        if kwargs.get("query"):
+            query = kwargs["query"]
+            params["query"] = query if isinstance(query, str) else json.dumps(query)
+        params.setdefault("sort", "_key")
+        limit: int = int(params.pop("limit", 0) or 0)
+        skip: int = int(params.pop("skip", 0) or 0)
+        fetched: int = 0
+        while not limit or fetched < limit:
+            count: int = min(page_size, limit - fetched) if limit else page_size
+            page: List[Dict[str, Any]] = await self._parent_class.request(
+                "GET", self._data(), params={**params, "skip": skip + fetched, "limit": count}
+            )
+            if page:
+                if batch:
+                    yield page
+                else:
+                    for document in page:
+                        yield document
+            fetched += len(page)
+            if len(page) < count:
+                break
+
+    async def get_collection_data(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Get collection data, see ``iter_collection_data``."""
+        return [_ async for _ in self.iter_collection_data(**kwargs)]  # type: ignore
+
+    async def bulk_upsert(
+        self,
+        data: Iterable[Union[str, Dict[str, Any]]],
+        batch_size: int = KVSTORE_BATCH_SAVE_LIMIT,
+        retries: int = KVSTORE_RETRIES,
+    ) -> BulkSaveResults:
+        """
+        Insert or replace documents with ``batch_save``, batches sent concurrently.
+
+        ``data`` is consumed lazily and at most ``max_concurrency`` batches are in
+        flight, so memory stays bounded for large inputs. Failed batches are
+        retried; batches splunkd rejects are split to isolate the failing documents,
+        as in ``KVstore.bulk_upsert``.
+
+        :param data: Documents to save
+        :type data: Iterable[Union[str, Dict[str, Any]]]
+        :param batch_size: Documents per request, defaults to KVSTORE_BATCH_SAVE_LIMIT
+        :type batch_size: int, optional
+        :param retries: Retries of a failed batch, defaults to KVSTORE_RETRIES
+        :type retries: int, optional
+        :return: Saved keys and per-document errors
+        :rtype: BulkSaveResults
+        """
+        results = BulkSaveResults()
+        saved: Dict[int, List[Optional[str]]] = {}
+
+        def collect(tasks: Iterable["asyncio.Task"]) -> None:
+            for task in tasks:
+                start, keys, errors, attempts = task.result()
+                saved[start] = keys
+                results.errors.extend(errors)
+                results.retries += attempts
+
+        documents: Iterator[Dict[str, Any]] = (json.loads(_) if isinstance(_, str) else _ for _ in data)
+        pending: set = set()
+        start: int = 0
+        try:
+            for batch in iter(lambda: list(islice(documents, batch_size)), []):
+                pending.add(asyncio.ensure_future(self._batch_save(start, batch, retries)))
+                results.batches += 1
+                start += len(batch)
+                # Bound the number of batches held in memory
+                if len(pending) >= self._parent_class.max_concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+            if pending:
+                collect((await asyncio.wait(pending))[0])
+        finally:
+            for task in pending:
+                task.cancel()
+        results.keys = [key for start in sorted(saved) for key in saved[start] if key is not None]
+        results.errors.sort(key=lambda _: _["index"])
+        return results
+
+    async def _batch_save(
+        self, start: int, documents: List[Dict[str, Any]], retries: int
+    ) -> Tuple[int, List[Optional[str]], List[Dict[str, Any]], int]:
+        """Save a batch of documents, isolating failing documents by bisection."""
+        attempt: int = 0
+        while True:
+            try:
+                keys = await self._parent_class.request(
+                    "POST", self._data("/batch_save"), data=json.dumps(documents),
+                    headers={"Content-Type": "application/json"},
+                )
+                return start, list(keys), [], attempt
+            except Exception as err:  # pylint: disable=broad-except
+                rejected: bool = isinstance(err, AsyncHTTPError) and 400 <= err.status < 500
+                if not rejected and attempt < retries:
+                    await asyncio.sleep(KVSTORE_RETRY_DELAY * 2**attempt)
+                    attempt += 1
+                    continue
+                if len(documents) == 1:
+                    from pytoolkit.utils import reformat_exception  # pylint: disable=import-outside-toplevel
+
+                    error = {"index": start, "_key": documents[0].get("_key"), "error": reformat_exception(err)}
+                    return start, [None], [error], attempt
+            half: int = len(documents) // 2
+            (_, left, left_errors, left_attempts), (_, right, right_errors, right_attempts) = await asyncio.gather(
+                self._batch_save(start, documents[:half], 0), self._batch_save(start + half, documents[half:], 0)
+            )
+            return start, left + right, left_errors + right_errors, attempt + left_attempts + right_attempts
+
+
+class AsyncSearch:
+    """Asyncio Splunk Search."""
+
+    def __init__(self, parent: AsyncSplunkApi) -> None:
+        self._parent_class: AsyncSplunkApi = parent
+        self.sid: Optional[str] = None
+        self.search_query: Optional[str] = None
+        self.job_content: Optional[Dict[str, Any]] = None
+
+    def __repr__(self) -> str:
+        """Class Representation."""
+        return f"{self._parent_class.__str__()}.{self.__str__()}"
+
+    def __str__(self) -> str:
+        """String Representation of Class."""
+        return str(self.__class__).split(".", maxsplit=-1)[-1]
+
+    async def start_search(self, query: str, **kwargs: Any) -> str:
+        """
+        Start a search job, returns its SID.
+
+        :param query: Search query
+        :type query: str
+        :return: Search ID
+        :rtype: str
+        """
+        if not query:
+            raise OperationError("Unable to run search without a search query")
+        response = await self._parent_class.request("POST", "search/jobs", data={"search": query, **kwargs})
+        self.sid = response["sid"]
+        self.search_query = query
+        self.job_content = None
+        return self.sid  # type: ignore
+
+    def _sid(self, sid: Optional[str]) -> str:
+        sid = sid or self.sid
+        if not sid:
+            raise SplunkApiNoOperationRunning("No Job to read results from")
+        return sid
+
+    async def job_status(self, sid: Optional[str] = None) -> Dict[str, Any]:
+        """Content of a search job."""
+        response = await self._parent_class.request("GET", f"search/jobs/{quote(self._sid(sid), safe='')}")
+        content: Dict[str, Any] = response["entry"][0]["content"]
+        if sid is None or sid == self.sid:
+            self.job_content = content
+        return content
+
+    async def wait(
+        self,
+        sid: Optional[str] = None,
+        timeout: Optional[float] = None,
+        min_interval: float = WATCHER_MIN_INTERVAL,
+        max_interval: float = WATCHER_MAX_INTERVAL,
+    ) -> Dict[str, Any]:
+        """
+        Wait for a search job to finish, polling with backoff.
+
+        :param sid: Search ID, defaults to the current job
+        :type sid: str, optional
+        :param timeout: Seconds to wait, defaults to None
+        :type timeout: float, optional
+        :raises SplunkSearchFatal: Job failed
+        :raises asyncio.TimeoutError: Job did not finish within ``timeout``
+        :return: Finished job content
+        :rtype: Dict[str, Any]
+        """
+
+        async def poll() -> Dict[str, Any]:
+            interval: float = min_interval
+            while True:
+                content = await self.job_status(sid)
+                if _is_true(content.get("isFailed")) or content.get("dispatchState") == "FAILED":
+                    raise SplunkSearchFatal(f"FATAL: Search job {self._sid(sid)} failed")
+                if _is_true(content.get("isDone")):
+                    return content
+                await asyncio.sleep(interval)
+                interval = min(interval * WATCHER_BACKOFF, max_interval)
+
+        return await asyncio.wait_for(poll(), timeout)
+
+    async def iter_results(
+        self, chunk_size: int = RESULTS_CHUNK_SIZE, batch: bool = False, **kwargs: Any
+    ) -> AsyncIterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Page through the results of a search job, waiting for it to finish first.
+
+        :param chunk_size: Number of rows to request per page, defaults to RESULTS_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :param batch: Yield a list of rows per page instead of single rows, defaults to False
+        :type batch: bool, optional
+        :param sid: Search ID, defaults to the current job
+        :type sid: str, optional
+        :param offset: Row to start from, defaults to 0
+        :type offset: int, optional
+        :param search: Post-process search applied to the results, defaults to None
+        :type search: str, optional
+        :yield: Result rows or pages of result rows
+        :rtype: AsyncIterator[Union[Dict[str, Any], List[Dict[str, Any]]]]
+        """
+        sid: str = self._sid(kwargs.pop("sid", None))
+        content = await self.wait(sid)
+        # A post-process search changes the row count, page until a short page instead
+        total: int = 0 if kwargs.get("search") else int(content.get("resultCount", 0) or 0)
+        offset: int = int(kwargs.pop("offset", 0))
+        while True:
+            response = await self._parent_class.request(
+                "GET", f"search/jobs/{quote(sid, safe='')}/results",
+                params={**kwargs, "offset": offset, "count": chunk_size},
+            )
+            _check_messages(response.get("messages") or [])
+            page: List[Dict[str, Any]] = response.get("results") or []
+            if page:
+                if batch:
+                    yield page
+                else:
+                    for row in page:
+                        yield row
+            offset += len(page)
+            if not page or (total and offset >= total) or (not total and len(page) < chunk_size):
+                break
+
+    async def get_results(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        """All result rows of a search job, see ``iter_results``."""
+        return [_ async for _ in self.iter_results(**kwargs)]  # type: ignore
+
+    async def stream(self, query: str, include_preview: bool = False, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream search results from the export endpoint while the search runs.
+
+        See ``Search.stream``.
+
+        :param query: Search query
+        :type query: str
+        :param include_preview: Also yield preview rows, defaults to False
+        :type include_preview: bool, optional
+        :yield: Result rows
+        :rtype: AsyncIterator[Dict[str, Any]]
+        """
+        params: Dict[str, Any] = {"preview": str(include_preview).lower(), **kwargs}
+        async for line in self._parent_class.stream_lines(
+            "POST", "search/jobs/export", data={"search": query, **params}
+        ):
+            if not line.strip():
+                continue
+            parsed: Dict[str, Any] = json.loads(line)
+            _check_messages(parsed.get("messages") or [])
+            if not include_preview and parsed.get("preview"):
+                continue
+            if "result" in parsed:
+                yield parsed["result"]
+
+    async def cancel_job(self, sid: Optional[str] = None) -> None:
+        """Cancel a search job."""
+        await self._parent_class.request(
+            "POST", f"search/jobs/{quote(self._sid(sid), safe='')}/control", data={"action": "cancel"}
+        )
+        if sid is None or sid == self.sid:
+            self.sid = None
+            self.job_content = None
@@ -1,35 +1,83 @@
 #  pylint: disable=invalid-name,wildcard-import,unused-wildcard-import,protected-access,undefined-variable,too-few-public-methods,unsubscriptable-object,raise-missing-from
 """Splunk Options."""
 
-from typing import Any, Union, Dict, List, Container
-from pandas import DataFrame
+from __future__ import annotations
 
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Union, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
+
+from splunklib.binding import HTTPError
 from splunklib.data import Record
 from splunklib.client import KVStoreCollection, Service, KVStoreCollections, Jobs, Job
 
-from pytoolkit.utilities import flatten_dict, nested_dict
-from pytoolkit.utils import reformat_exception
-
 from splunksdk import *
+from splunksdk.utils.advisor import KVstoreAdvisor, existing_definitions
+from splunksdk.utils.cache import LRUCache, MISSING
+from splunksdk.utils.connection import PooledHandler, PoolStats
+from splunksdk.utils.handle import SearchHandle, check_search_for_error, require_handle
+from splunksdk.utils.instrument import Instrumentation, InstrumentedHandler, OperationSummary, Sink
+from splunksdk.utils.jobcache import JobCache
+from splunksdk.utils.kvstore import BulkSaveResults, Collections
+from splunksdk.utils.lazy import is_dataframe
 from splunksdk.utils.login import _splunk_connection
-from splunksdk.utils.search import SearchJobResults, SplunkSearchResults
-from splunksdk.utils.statics import SPLUNK_OUTPUTMODES
+from splunksdk.utils.pool import SearchPool
+from splunksdk.utils.results import LazySearchResults
+from splunksdk.utils.search import SearchJobResults, SearchTask, SplunkSearchResults
+from splunksdk.utils.statics import (
+    DOWNLOAD_RETRIES,
+    DOWNLOAD_WORKERS,
+    JOB_CACHE_MAX_BYTES,
+    JOB_CACHE_MAX_STALENESS,
+    KVSTORE_BATCH_SAVE_LIMIT,
+    KVSTORE_COLLECTIONS_TTL,
+    KVSTORE_OR_KEYS,
+    KVSTORE_PAGE_SIZE,
+    KVSTORE_QUERY,
+    KVSTORE_RETRIES,
+    KVSTORE_RETRY_DELAY,
+    RESULTS_CHUNK_SIZE,
+    RESULTS_MEMORY_BUDGET,
+    SEARCH_HISTORY_SIZE,
+    SPLUNK_OUTPUTMODES,
+)
 from splunksdk.utils.splunk_utils import Utils
+from splunksdk.utils.sync import KVstoreSync
+from splunksdk.utils.watcher import JobWatcher
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+    from splunksdk.utils.export import ResultsExporter
 
 
 class SplunkApi:
     """Splunk API."""
 
     _conn: Service
+    _watcher: Union[JobWatcher, None] = None
     subclasses: list[str] = []
 
     def __init__(self, **kwargs: Any) -> None:
         """
         Initialize Splunk API.
+
+        See ``SplunkLogin`` for the connection parameters.
+
+        :param sinks: Event sinks installed before logging in, so the login is reported, defaults to None
+        :type sinks: List[Callable[[Event], Any]], optional
         """
-        self._conn = _splunk_connection(**kwargs)
+        self.instrumentation = Instrumentation()
+        for sink in kwargs.pop("sinks", None) or []:
+            self.instrumentation.add_sink(sink)
+        self._conn = _splunk_connection(instrumentation=self.instrumentation, **kwargs)
         subclasses: Dict[str, Any] = self._subclass_container()
         self.subclasses = list(subclasses)
         self.KVstore: Any = subclasses["KVstore"]()
@@ -44,6 +92,62 @@ class SplunkApi:
         """
         return self._conn
 
+    @property
+    def watcher(self) -> JobWatcher:
+        """Background Search Job Watcher shared by all searches of this connection.
+
+        :return: Job Watcher
+        :rtype: JobWatcher
+        """
+        if self._watcher is None:
+            self._watcher = JobWatcher(self._conn, instrumentation=self.instrumentation)
+        return self._watcher
+
+    @property
+    def pool_stats(self) -> Union[PoolStats, None]:
+        """Connection reuse metrics when connected with ``pooled=True``.
+
+        :return: Pool metrics or None when the default handler is used
+        :rtype: Union[PoolStats, None]
+        """
+        handler: Any = self._conn.http.handler
+        if isinstance(handler, InstrumentedHandler):
+            handler = handler.handler
+        return handler.stats if isinstance(handler, PooledHandler) else None
+
+    def instrument(self, sink: Sink) -> Sink:
+        """Send the events of every REST call, job state change and result conversion to ``sink``.
+
+        A sink is any callable taking an ``Event``; ``LoggingSink``, ``PrometheusExporter``
+        and ``OperationSummary`` are provided.
+
+        :param sink: Event sink
+        :type sink: Callable[[Event], Any]
+        :return: The sink
+        :rtype: Callable[[Event], Any]
+
+        **Example**::
+
+            exporter = splunk.instrument(PrometheusExporter())
+            splunk.Search.fetch("search index=main | head 10")
+            print(exporter.render())
+        """
+        return self.instrumentation.add_sink(sink)
+
+    def summary(self) -> ContextManager[OperationSummary]:
+        """Context manager collecting per-operation statistics of the block.
+
+        :return: Context manager yielding an ``OperationSummary``
+        :rtype: ContextManager[OperationSummary]
+
+        **Example**::
+
+            with splunk.summary() as summary:
+                splunk.KVstore.get_collection_data(collection="lookups")
+            print(summary)
+        """
+        return self.instrumentation.summary()
+
     def __repr__(self) -> str:
         """Class Representation."""
         return self.__str__()
@@ -68,6 +172,7 @@ class SplunkApi:
             """SearchWrapper"""
 
             def __init__(self) -> None:
+                super().__init__()
                 self._parent_class: SplunkApi = _parent_class
 
         return_object["Search"] = SearchWrapper
@@ -82,13 +187,16 @@ class KVstore:
 
     _parent_class = None
     _stores: KVStoreCollections
-    _collections: List[str]
+    _index: Union[Collections, None] = None
+    collections_ttl: float = KVSTORE_COLLECTIONS_TTL
     store: KVStoreCollection
     raw_data: Union[list[Dict[str, Any]], None] = None
-    flat_data: Union[list[Dict[str, Any]], None] = None
-    nested_data: Union[list[Dict[str, Any]], None] = None
+    _flat_data: Union[list[Dict[str, Any]], None] = None
+    _nested_data: Union[list[Dict[str, Any]], None] = None
+    _cache: Union[LRUCache, None] = None
+    _cache_ttl: Dict[str, float] = {}
+    _advisor: Union[KVstoreAdvisor, None] = None
 
-    #TODO: Figure out hwo to handle colllections as a property or as something else as getting attribute errors
     def __repr__(self) -> str:
         """Class Representation."""
         return f"{self._parent_class.__str__()}.{self.__str__()}"
@@ -100,33 +208,341 @@ class KVstore:
     def set_kvstore(self, collection_name: str) -> None:
         """Sets KVStore Collection."""
         self._collection_not_exists(collection_name)
-        self.store: KVStoreCollection = self.stores[collection_name]
+        self.store: KVStoreCollection = self._collection_index().entities[collection_name]
 
     @property
     def collections(self) -> List[str]:
         """KVStore Collections."""
-        setattr(self,"_collections",[_.name for _ in self.stores])# type: ignore
-        return self._collections
+        return self._collection_index().collections
+
+    def _collection_index(self, refresh: bool = False) -> Collections:
+        """
+        Cached index of collections, listed again once older than ``collections_ttl``.
+
+        :param refresh: List the collections even if the index is still valid, defaults to False
+        :type refresh: bool, optional
+        :return: Collection Index
+        :rtype: Collections
+        """
+        if refresh or self._index is None or self._index.expired:
+            self._index = Collections(entities={_.name: _ for _ in self.stores}, ttl=self.collections_ttl)
+        return self._index
+
+    def refresh_collections(self) -> List[str]:
+        """List the collections from the server and rebuild the cached index."""
+        return self._collection_index(refresh=True).collections
+
+    def invalidate_collections(self) -> None:
+        """Drop the cached collection index, the next lookup lists the collections again."""
+        self._index = None
+
+    def enable_cache(
+        self, max_size: int = 1024, ttl: float = 60.0, collection_ttl: Union[Dict[str, float], None] = None
+    ) -> LRUCache:
+        """
+        Cache documents read with ``get_item`` and ``get_items``.
+
+        Writes made through this client invalidate the documents they touch; writes made by
+        anyone else are seen once the entry expires.
+
+        :param max_size: Documents kept across all collections, defaults to 1024
+        :type max_size: int, optional
+        :param ttl: Seconds a document stays cached, defaults to 60.0
+        :type ttl: float, optional
+        :param collection_ttl: Seconds a document stays cached keyed by collection name, defaults to None
+        :type collection_ttl: Dict[str, float], optional
+        :return: Cache
+        :rtype: LRUCache
+        """
+        self._cache = LRUCache(max_size=max_size, ttl=ttl)
+        self._cache_ttl = dict(collection_ttl or {})
+        return self._cache
+
+    def disable_cache(self) -> None:
+        """Stop caching documents."""
+        self._cache = None
+
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Cache hit and miss counters."""
+        return self._cache.stats if self._cache is not None else {}
+
+    def enable_advisor(self, advisor: Union[KVstoreAdvisor, None] = None) -> KVstoreAdvisor:
+        """
+        Record the query shapes and latency of ``get_collection_data`` and ``get_item``.
+
+        See ``KVstoreAdvisor`` for the recommendations and the before/after report.
+
+        :param advisor: Advisor to record into, defaults to a new one
+        :type advisor: KVstoreAdvisor, optional
+        :return: Advisor
+        :rtype: KVstoreAdvisor
+        """
+        self._advisor = advisor or KVstoreAdvisor()
+        return self._advisor
+
+    def disable_advisor(self) -> None:
+        """Stop recording query shapes."""
+        self._advisor = None
+
+    @property
+    def advisor(self) -> Union[KVstoreAdvisor, None]:
+        """Advisor recording the queries of this client."""
+        return self._advisor
+
+    def recommend_accelerated_fields(self, collection_name: Union[str, None] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Accelerated fields serving the recorded queries of a collection.
+
+        :param collection_name: Collection, defaults to the current collection
+        :type collection_name: str, optional
+        :raises NoSuchCapability: Advisor not enabled
+        :return: Definitions keyed by accelerated field name, existing definitions are left out
+        :rtype: Dict[str, Dict[str, int]]
+        """
+        if self._advisor is None:
+            raise NoSuchCapability("Requires the advisor to be enabled")
+        store: KVStoreCollection = self._accelerate_target(collection_name)
+        return self._advisor.recommend(store.name, existing=existing_definitions(store))
+
+    def apply_accelerated_fields(self, collection_name: Union[str, None] = None, replay: int = 0) -> Dict[str, Dict[str, int]]:
+        """
+        Create the recommended accelerated fields of a collection.
+
+        With ``replay`` every recorded query shape is run ``replay`` times before and after
+        the fields are created; ``advisor.report()`` shows the timings of both.
+
+        :param collection_name: Collection, defaults to the current collection
+        :type collection_name: str, optional
+        :param replay: Runs per query shape before and after, defaults to 0
+        :type replay: int, optional
+        :raises NoSuchCapability: Advisor not enabled
+        :return: Created definitions keyed by accelerated field name
+        :rtype: Dict[str, Dict[str, int]]
+
+        **Example**::
+
+            advisor = splunk.KVstore.enable_advisor()
+            splunk.KVstore.set_kvstore("assets")
+            splunk.KVstore.get_collection_data(query={"env": "prod", "ts": {"$gt": 1700000000}}, sort="host")
+            splunk.KVstore.apply_accelerated_fields(replay=5)
+            # {'accel_env_host_ts': {'env': 1, 'host': 1, 'ts': 1}}
+            print(advisor)
+        """
+        if self._advisor is None:
+            raise NoSuchCapability("Requires the advisor to be enabled")
+        return self._advisor.apply(self._accelerate_target(collection_name), replay=replay)
+
+    def _accelerate_target(self, collection_name: Union[str, None]) -> KVStoreCollection:
+        if collection_name is None:
+            if not getattr(self, "store", None):
+                raise NoSuchCapability("Requires a KVstore to be defined")
+            return self.store
+        self._collection_not_exists(collection_name)
+        return self._collection_index().entities[collection_name]
+
+    def _cache_get(self, key: str) -> Any:
+        """Copy of a cached document, callers may change it without touching the cache."""
+        if self._cache is None:
+            return MISSING
+        document = self._cache.get((self.store.name, key))
+        return document if document is MISSING else copy.deepcopy(document)
+
+    def _cache_set(self, key: str, document: Dict[str, Any]) -> None:
+        if self._cache is not None:
+            self._cache.set((self.store.name, key), copy.deepcopy(document), ttl=self._cache_ttl.get(self.store.name))
+
+    def _cache_invalidate(self, key: Union[str, None] = None, collection: Union[str, None] = None) -> None:
+        """Invalidate a cached document, or every document of a collection."""
+        if self._cache is None:
+            return
+        if key is not None:
+            self._cache.invalidate((self.store.name, key))
+        elif collection is not None:
+            self._cache.invalidate_where(lambda _: _[0] == collection)
 
     def get_item(self, key: str) -> Dict[str, Any]:
         """Get Item by ID or _key."""
-        return self.store.data.query_by_id(id=key)
+        document = self._cache_get(key)
+        if document is not MISSING:
+            return document
+        start: float = time.perf_counter()
+        document = self.store.data.query_by_id(id=key)
+        if self._advisor is not None:
+            self._advisor.record(self.store.name, time.perf_counter() - start, query={"_key": key})
+        self._cache_set(key, document)
+        return document
+
+    def get_items(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get many items by ``_key``.
 
-    def get_collection_data(self, **kwargs: Dict[str, Any]) -> None:
+        Cached documents are served from the cache; the rest are read with ``$or`` queries of
+        up to ``KVSTORE_OR_KEYS`` keys each instead of one request per key.
+
+        :param keys: Document keys
+        :type keys: Iterable[str]
+        :return: Documents keyed by ``_key``, keys that do not exist are left out
+        :rtype: Dict[str, Dict[str, Any]]
+        """
+        if not self.store:
+            raise NoSuchCapability("Requires a KVstore to be defined")
+        documents: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            document = self._cache_get(key)
+            if document is MISSING:
+                missing.append(key)
+            else:
+                documents[key] = document
+        for start in range(0, len(missing), KVSTORE_OR_KEYS):
+            query = {"$or": [{"_key": key} for key in missing[start : start + KVSTORE_OR_KEYS]]}
+            for document in self.store.data.query(query=json.dumps(query)):
+                documents[document["_key"]] = document
+                self._cache_set(document["_key"], document)
+        return documents
+
+    def get_collection_data(self, **kwargs: Any) -> None:
         """
         Get collection data.
 
+        Pages through the collection so results are not capped at the server's
+        ``max_rows_per_query``. ``flat_data`` and ``nested_data`` are built on first access.
+
+        :param page_size: Documents requested per page, defaults to KVSTORE_PAGE_SIZE
+        :type page_size: int, optional
         :raises NoSuchCapability: _description_
         """
         if not self.store:
             raise NoSuchCapability("Requires a KVstore to be defined")
         # Use standard ops to get filtered resutls
-        # Example: s.KVstore.kvstore.data.query(**{"$and":[{"env": {"$eq": "prod"},"isActive":{"$eq": True}}]})
-        self.raw_data = self.store.data.query(**kwargs)
-        self.flat_data = [flatten_dict(_dict) for _dict in self.raw_data]
-        self.nested_data = [nested_dict(_dict) for _dict in self.raw_data]
-        # TODO: Build out a recursive yeild that llows for a inline search using exra **params
-        # search_results = [data if {} for data in flat]
+        # Example: s.KVstore.get_collection_data(query={"$and":[{"env": {"$eq": "prod"}},{"isActive":{"$eq": True}}]})
+        self.raw_data = list(self.iter_collection_data(**kwargs))
+        self._flat_data = None
+        self._nested_data = None
+
+    @property
+    def flat_data(self) -> Union[list[Dict[str, Any]], None]:
+        """Flattened collection data of the last ``get_collection_data``."""
+        if self._flat_data is None and self.raw_data is not None:
+            from pytoolkit.utilities import flatten_dict  # pylint: disable=import-outside-toplevel
+
+            self._flat_data = [flatten_dict(_dict) for _dict in self.raw_data]
+        return self._flat_data
+
+    @property
+    def nested_data(self) -> Union[list[Dict[str, Any]], None]:
+        """Nested collection data of the last ``get_collection_data``."""
+        if self._nested_data is None and self.raw_data is not None:
+            from pytoolkit.utilities import nested_dict  # pylint: disable=import-outside-toplevel
+
+            self._nested_data = [nested_dict(_dict) for _dict in self.raw_data]
+        return self._nested_data
+
+    def iter_collection_data(
+        self,
+        page_size: int = KVSTORE_PAGE_SIZE,
+        batch: bool = False,
+        flatten: bool = False,
+        nested: bool = False,
+        workers: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Page through collection data with ``skip`` and ``limit``.
+
+        Only ``workers`` pages are held in memory at a time. ``sort``, ``limit``, ``skip`` and
+        ``fields`` (see ``KVSTORE_QUERY``) apply to the whole result set; results are sorted by
+        ``_key`` unless another ``sort`` is given so pages do not overlap.
+
+        :param page_size: Documents requested per page, defaults to KVSTORE_PAGE_SIZE
+        :type page_size: int, optional
+        :param batch: Yield a list of documents per page instead of single documents, defaults to False
+        :type batch: bool, optional
+        :param flatten: Flatten each document, defaults to False
+        :type flatten: bool, optional
+        :param nested: Nest each document on its dotted keys, defaults to False
+        :type nested: bool, optional
+        :param workers: Pages fetched in parallel, defaults to 1
+        :type workers: int, optional
+        :param query: KV Store query
+        :type query: Union[str, Dict[str, Any]], optional
+        :raises NoSuchCapability: KVStoreCollection not defined
+        :raises ValueError: Both ``flatten`` and ``nested`` requested
+        :yield: Documents or pages of documents
+        :rtype: Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]
+        """
+        if flatten and nested:
+            raise ValueError("flatten and nested are mutually exclusive")
+        if not self.store:
+            raise NoSuchCapability("Requires a KVstore to be defined")
+        paging: Dict[str, Any] = {key: kwargs.pop(key) for key in KVSTORE_QUERY if key in kwargs}
+        limit: int = int(paging.pop("limit", 0) or 0)
+        offset: int = int(paging.pop("skip", 0) or 0)
+        kwargs.update(paging)
+        kwargs.setdefault("sort", "_key")
+        transform: Optional[Callable[..., Dict[str, Any]]] = None
+        if flatten or nested:
+            from pytoolkit.utilities import flatten_dict, nested_dict  # pylint: disable=import-outside-toplevel
+
+            transform = flatten_dict if flatten else nested_dict
+
+        def fetch(skip: int, count: int) -> List[Dict[str, Any]]:
+            if count <= 0:
+                return []
+            start: float = time.perf_counter()
+            page: List[Dict[str, Any]] = self.store.data.query(skip=skip, limit=count, **kwargs)
+            if self._advisor is not None:
+                self._advisor.record(self.store.name, time.perf_counter() - start, limit=count, **kwargs)
+            return page
+
+        fetched: int = 0
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            while True:
+                windows: List[Tuple[int, int]] = []
+                for index in range(max(workers, 1)):
+                    start = fetched + index * page_size
+                    count = min(page_size, limit - start) if limit else page_size
+                    if count > 0:
+                        windows.append((offset + start, count))
+                pages = executor.map(lambda window: fetch(*window), windows)
+                for (_, count), page in zip(windows, pages):
+                    fetched += len(page)
+                    if transform:
+                        page = [transform(_) for _ in page]
+                    if page:
+                        if batch:
+                            yield page
+                        else:
+                            yield from page
+                    if len(page) < count:
+                        return
+                if not windows or (limit and fetched >= limit):
+                    return
+
+    def sync(self, path: str, reconcile: Union[bool, None] = None, **kwargs: Any) -> KVstoreSync:
+        """
+        Incrementally mirror the current collection into a local SQLite snapshot.
+
+        Only documents changed since the last run are fetched and written; see ``KVstoreSync``.
+
+        :param path: SQLite database holding the snapshot and watermark
+        :type path: str
+        :param reconcile: Force or skip the key-only scan for deleted documents, defaults to None
+        :type reconcile: bool, optional
+        :param modified_field: Field updated on every write used as the watermark, defaults to ``_key`` ordering
+        :type modified_field: str, optional
+        :param reconcile_every: Syncs between scans for deleted documents, defaults to 10
+        :type reconcile_every: int, optional
+        :raises NoSuchCapability: KVStoreCollection not defined
+        :return: Syncer holding the snapshot in ``documents`` and the run in ``report``
+        :rtype: KVstoreSync
+        """
+        if not self.store:
+            raise NoSuchCapability("Requires a KVstore to be defined")
+        mirror = KVstoreSync(self, path, **kwargs)
+        mirror.sync(reconcile=reconcile)
+        return mirror
 
     def to_csv(self) -> Union[DataFrame,None]:
         """
@@ -135,15 +551,17 @@ class KVstore:
         :return: _description_
         :rtype: Union[DataFrame,None]
         """
-        if self.flat_data:
-            return Utils.to_csv(data=self.flat_data)
+        if self.raw_data:
+            return Utils.normalize(self.raw_data)
         return None
 
     def _add_collection(self, name: str) -> None:
-        self._collections.append(name)
+        if self._index is not None:
+            self._index.entities[name] = self.stores[name]
 
     def _del_collection(self, name: str) -> None:
-        self._collections.remove(name)
+        if self._index is not None:
+            self._index.entities.pop(name, None)
 
     def create_collection(self, name: str, **kwargs: Dict[str, Any]) -> None:
         """
@@ -164,8 +582,8 @@ class KVstore:
         coll_return: Record = self.stores.create(name=name, **kwargs)  # type: ignore
         if coll_return.get("status") != 201:
             raise OperationError(f"Unable to create collection {name}")
-        self.set_kvstore(collection_name=name)
         self._add_collection(name=name)
+        self.set_kvstore(collection_name=name)
 
     def insert_data(self, data: Union[str, Dict[str, Any]]) -> None:
         """
@@ -183,6 +601,96 @@ class KVstore:
             data=data)  # type: ignore
         if not coll_insert.get("_key"):
             raise OperationError(f"Unable to insert data {data}")
+        self._cache_invalidate(key=coll_insert["_key"])
+
+    def bulk_upsert(
+        self,
+        data: Union[Iterable[Union[str, Dict[str, Any]]], DataFrame],
+        batch_size: int = KVSTORE_BATCH_SAVE_LIMIT,
+        workers: int = 1,
+        retries: int = KVSTORE_RETRIES,
+    ) -> BulkSaveResults:
+        """
+        Insert or update many documents with the ``batch_save`` endpoint.
+
+        Documents are read lazily from ``data`` and sent ``batch_size`` at a time, keep it at or
+        below the server's ``max_documents_per_batch_save``. Up to ``workers`` batches are sent in
+        parallel. Failed batches are retried with backoff; a batch that still fails, or is rejected
+        by the server, is split in half until the failing documents are isolated and reported.
+
+        :param data: Documents to save, documents with a ``_key`` replace the existing document.
+            A flattened DataFrame is turned back into nested documents with ``Utils.denormalize``.
+        :type data: Union[Iterable[Union[str, Dict[str, Any]]], DataFrame]
+        :param batch_size: Documents per request, defaults to KVSTORE_BATCH_SAVE_LIMIT
+        :type batch_size: int, optional
+        :param workers: Batches sent in parallel, defaults to 1
+        :type workers: int, optional
+        :param retries: Retries of a failed batch, defaults to KVSTORE_RETRIES
+        :type retries: int, optional
+        :raises NoSuchCapability: KVStoreCollection not defined
+        :return: Saved keys in input order and per document errors
+        :rtype: BulkSaveResults
+        """
+        if not self.store:
+            raise NoSuchCapability("KVStoreCollection not defined")
+        if is_dataframe(data):
+            data = Utils.denormalize(data)
+        results = BulkSaveResults()
+        saved: Dict[int, List[Optional[str]]] = {}
+
+        def collect(futures: Iterable[Future]) -> None:
+            for future in futures:
+                start, keys, errors, attempts = future.result()
+                saved[start] = keys
+                results.errors.extend(errors)
+                results.retries += attempts
+
+        documents: Iterator[Dict[str, Any]] = (json.loads(_) if isinstance(_, str) else _ for _ in data)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: set = set()
+            start: int = 0
+            for batch in iter(lambda: list(islice(documents, batch_size)), []):
+                pending.add(executor.submit(self._batch_save, start, batch, retries))
+                results.batches += 1
+                start += len(batch)
+                # Bound the number of batches held in memory
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(pending)
+        results.keys = [key for start in sorted(saved) for key in saved[start] if key is not None]
+        for key in results.keys:
+            self._cache_invalidate(key=key)
+        results.errors.sort(key=lambda _: _["index"])
+        return results
+
+    def _batch_save(
+        self, start: int, documents: List[Dict[str, Any]], retries: int
+    ) -> Tuple[int, List[Optional[str]], List[Dict[str, Any]], int]:
+        """
+        Save a batch of documents, isolating failing documents by bisection.
+
+        :return: Start index, keys (``None`` for failed documents), errors and retries used
+        """
+        attempt: int = 0
+        while True:
+            try:
+                return start, list(self.store.data.batch_save(*documents)), [], attempt
+            except Exception as err:  # pylint: disable=broad-except
+                rejected: bool = isinstance(err, HTTPError) and 400 <= err.status < 500
+                if not rejected and attempt < retries:
+                    time.sleep(KVSTORE_RETRY_DELAY * 2**attempt)
+                    attempt += 1
+                    continue
+                if len(documents) == 1:
+                    from pytoolkit.utils import reformat_exception  # pylint: disable=import-outside-toplevel
+
+                    error = {"index": start, "_key": documents[0].get("_key"), "error": reformat_exception(err)}
+                    return start, [None], [error], attempt
+            half: int = len(documents) // 2
+            _, left, left_errors, left_attempts = self._batch_save(start, documents[:half], 0)
+            _, right, right_errors, right_attempts = self._batch_save(start + half, documents[half:], 0)
+            return start, left + right, left_errors + right_errors, attempt + left_attempts + right_attempts
 
     def delete_data(self) -> None:
         """Delete entry"""
@@ -192,6 +700,7 @@ class KVstore:
         if not self.store and self.store.data.query_by_id(key):
             raise OperationError(f"Missing Collection or invalid _key {key}")
         self.store.data.update(id=key, data=data)
+        self._cache_invalidate(key=key)
 
     def delete_collection(self, collection_name: str) -> None:
         """
@@ -200,6 +709,7 @@ class KVstore:
         self._collection_not_exists(collection_name)
         self.set_kvstore(collection_name=collection_name)
         self.store.delete()
+        self._cache_invalidate(collection=collection_name)
         self._del_collection(name=collection_name)
 
     def _collection_exists(self, name: str) -> None:
@@ -210,12 +720,13 @@ class KVstore:
         :type name: str
         :raises InvalidNameException: _description_
         """
-        if name in self.collections:
+        if name in self._collection_index():
             raise InvalidNameException(f"Collection already exists {name}")
 
     def _collection_not_exists(self, name: str) -> None:
         """Check if KVStore Collection Does not exist."""
-        if name not in self.collections:
+        # Collections created by other clients since the index was built
+        if name not in self._collection_index() and name not in self._collection_index(refresh=True):
             raise InvalidNameException(f"Collection does not exists {name}")
 
     @property
@@ -226,20 +737,26 @@ class KVstore:
 
 
 class Search:
-    """Splunk Search."""
+    """
+    Splunk Search.
+
+    Every ``start_search`` returns an independent ``SearchHandle``. The ``job``, ``job_content``,
+    ``search_resp``, ``results`` and ``*_results`` attributes refer to the last search started
+    by the calling thread, so one ``SplunkApi`` can be shared by a thread pool. Handles are
+    kept in a history of at most ``history_size`` searches; the oldest are evicted along with
+    their cached results.
+    """
 
     _parent_class = None
     _output_mode: str = "json"
-    _orig_results: Job
-    search_resp: Union[SplunkSearchResults, None] = None
-    csv_results: Union[DataFrame, None] = None
-    job_content: Union[dict[str, Any], None] = None
-    json_cols_results: Union[dict[str, Any], None] = None
-    json_rows_results: Union[dict[str, Any], None] = None
-    xml_results: Union[list[Any], None] = None
-    job: Job
-    raw_results: Container[SearchJobResults] = []
-    search_query: Union[str, None] = None # type: ignore
+    results_memory_budget: int = RESULTS_MEMORY_BUDGET
+    history_size: int = SEARCH_HISTORY_SIZE
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._history: "OrderedDict[str, SearchHandle]" = OrderedDict()
+        self._history_lock = threading.Lock()
+        self._job_cache: Union[JobCache, None] = None
 
     def __repr__(self) -> str:
         """Class Representation."""
@@ -252,8 +769,111 @@ class Search:
     @property
     def jobs(self) -> Jobs:
         """Splunk Jobs."""
-        self._jobs = self._parent_class._conn.jobs  # type: ignore
-        return self._jobs  # type: ignore
+        return self._parent_class._conn.jobs  # type: ignore
+
+    @property
+    def handle(self) -> Union[SearchHandle, None]:
+        """Last search started by the calling thread."""
+        return getattr(self._local, "handle", None)
+
+    @handle.setter
+    def handle(self, value: Union[SearchHandle, None]) -> None:
+        self._local.handle = value
+
+    @property
+    def search_query(self) -> Union[str, None]:
+        """Query of the calling thread's next ``start_search``."""
+        return getattr(self._local, "search_query", None)
+
+    @search_query.setter
+    def search_query(self, value: Union[str, None]) -> None:
+        self._local.search_query = value
+
+    @property
+    def job(self) -> Union[Job, None]:
+        """Job of the current search."""
+        return self.handle.job if self.handle else None
+
+    @property
+    def job_content(self) -> Union[dict[str, Any], None]:
+        """Job content of the current search."""
+        return self.handle.job_content if self.handle else None
+
+    @property
+    def search_resp(self) -> Union[SplunkSearchResults, None]:
+        """JSON results of the current search once ``get_results`` ran, fetched on first access."""
+        return self.handle.search_resp if self.handle else None
+
+    @property
+    def results(self) -> Union[LazySearchResults, None]:
+        """Lazily fetched results of the current search once ``get_results`` ran."""
+        return self.handle.results if self.handle else None
+
+    @property
+    def history(self) -> List[SearchHandle]:
+        """Searches started through this instance, oldest first."""
+        with self._history_lock:
+            return list(self._history.values())
+
+    @property
+    def raw_results(self) -> List[SearchJobResults]:
+        """Job containers of the searches in ``history``."""
+        return [SearchJobResults(_.job) for _ in self.history]
+
+    def get_handle(self, sid: str) -> SearchHandle:
+        """
+        Search of the history by SID.
+
+        :param sid: Search ID
+        :type sid: str
+        :raises SplunkApiNoOperationRunning: SID is not in the history
+        :return: Search Handle
+        :rtype: SearchHandle
+        """
+        with self._history_lock:
+            handle = self._history.get(sid)
+        return require_handle(handle, f"No search {sid} in the history")
+
+    def _remember(self, handle: SearchHandle) -> None:
+        """Add a search to the history, evicting the oldest once over ``history_size``."""
+        evicted: List[SearchHandle] = []
+        with self._history_lock:
+            self._history[handle.sid] = handle
+            while len(self._history) > max(self.history_size, 1):
+                evicted.append(self._history.popitem(last=False)[1])
+        for old in evicted:
+            old.clear()
+
+    def _forget(self, handle: SearchHandle) -> None:
+        with self._history_lock:
+            self._history.pop(handle.sid, None)
+
+    def _current(self, kwargs: Dict[str, Any], message: str) -> SearchHandle:
+        """Handle of a ``job`` keyword argument, or the current search."""
+        job: Union[Job, None] = kwargs.pop("job", None)
+        if job is not None:
+            return SearchHandle(job, watcher=self._parent_class.watcher)  # type: ignore
+        return require_handle(self.handle, message)
+
+    @property
+    def csv_results(self) -> Union[DataFrame, None]:
+        """CSV Results, fetched on first access."""
+        return self.handle.csv_results if self.handle else None
+
+    @property
+    def json_cols_results(self) -> Union[dict[str, Any], None]:
+        """JSON_COLS Results, fetched on first access."""
+        return self.handle.json_cols_results if self.handle else None
+
+    @property
+    def json_rows_results(self) -> Union[dict[str, Any], None]:
+        """JSON_ROWS Results, fetched on first access."""
+        return self.handle.json_rows_results if self.handle else None
+
+    @property
+    def xml_results(self) -> Union[list[dict[str, Any]], None]:
+        """XML Results as rows, fetched on first access."""
+        return self.handle.xml_results if self.handle else None
 
     @property
     def output_mode(self) -> str:
@@ -266,82 +886,350 @@ class Search:
             raise InvalidNameException(f"Invalid output mode {value}")
         self._output_mode = value.lower()
 
-    def __append_raw_job(self, job: Job):
-        """Build container of Jobs."""
-        self.raw_results.append(SearchJobResults(self.job))
-        self._org_results = job.results  # type: ignore
-
     def add_query(self, search_query: str, **kwargs: Union[str, dict[str, Any]]) -> str:
         """Add New Query."""
         self.search_query = search_query
         if kwargs.get("start_search", False):
-            self.start_search()
-            return self.job.name
+            return self.start_search().job.name
         return search_query
 
-    def start_search(self, **kwargs: Any):
+    def enable_job_cache(
+        self,
+        max_staleness: float = JOB_CACHE_MAX_STALENESS,
+        path: Union[str, None] = None,
+        max_bytes: int = JOB_CACHE_MAX_BYTES,
+    ) -> JobCache:
+        """
+        Reuse jobs and results of identical searches.
+
+        ``start_search`` reuses the job of an identical query (same normalized text,
+        earliest/latest time, app and owner) dispatched less than ``max_staleness`` seconds
+        ago while splunkd still keeps it. ``fetch`` also serves results stored in ``path``.
+
+        :param max_staleness: Seconds a job or stored result may be reused, defaults to JOB_CACHE_MAX_STALENESS
+        :type max_staleness: float, optional
+        :param path: Directory to store results in, defaults to None (no disk cache)
+        :type path: str, optional
+        :param max_bytes: Size of the on-disk result cache, defaults to JOB_CACHE_MAX_BYTES
+        :type max_bytes: int, optional
+        :return: Job Cache
+        :rtype: JobCache
+        """
+        self._job_cache = JobCache(max_staleness=max_staleness, path=path, max_bytes=max_bytes)
+        return self._job_cache
+
+    def disable_job_cache(self) -> None:
+        """Dispatch a new job for every search."""
+        self._job_cache = None
+
+    def _job_cache_key(self, query: str, **kwargs: Any) -> str:
+        namespace: Any = self._parent_class._conn.namespace  # type: ignore
+        return JobCache.key(query, app=namespace.get("app"), owner=namespace.get("owner"), **kwargs)
+
+    def _reusable_job(self, sid: str) -> Union[Job, None]:
+        """Job of a cached SID if splunkd still has it and it did not fail."""
+        try:
+            job = Job(self._parent_class._conn, sid)  # type: ignore
+            job.refresh()
+        except HTTPError:
+            return None
+        content: Dict[str, Any] = job.content  # type: ignore
+        if content.get("isFailed") in ("1", True) or content.get("dispatchState") == "FAILED":
+            return None
+        if float(content.get("ttl") or 0) <= 0:
+            return None
+        return job
+
+    def start_search(self, **kwargs: Any) -> SearchHandle:
         """
         Start Splunk Search Job.
 
-        :raises OperationError: _description_
+        The new search becomes the current search of the calling thread and is added to
+        the history. With ``enable_job_cache`` a recent job of the same query is reused
+        instead of dispatching a new one.
+
+        :param query: Search query, defaults to the query set with ``add_query``
+        :type query: str, optional
+        :param max_staleness: Seconds a cached job may be reused, defaults to the job cache setting
+        :type max_staleness: float, optional
+        :param bypass_cache: Always dispatch a new job, defaults to False
+        :type bypass_cache: bool, optional
+        :raises OperationError: No search query
+        :return: Handle of the new search
+        :rtype: SearchHandle
         """
-        # create a job
-        search_query = ""
-        try:
-            search_query = kwargs.pop("query")
-        except KeyError:
-            pass
-        if not self.search_query:
-            self.search_query = kwargs.get("search_query") if kwargs.get("search_query") else search_query
-        if not self.search_query:
+        search_query: Union[str, None] = (
+            kwargs.pop("query", None) or kwargs.pop("search_query", None) or self.search_query
+        )
+        if not search_query:
             raise OperationError("Unable to run search without a search query")
-        self.add_query(search_query=self.search_query)
-        self.job: Job= self.jobs.create(query=self.search_query, **kwargs)  # type: ignore
-        # Update Job Content to keep loaded
-        self.job_content = self.job.content  # type: ignore
-        # TODO: Once kicked off run a detached job possibly a container here
-        # to check on job and continue to update job_conent to be ready
-        self.__append_raw_job(self.job)
+        self.search_query = search_query
+        max_staleness: Union[float, None] = kwargs.pop("max_staleness", None)
+        bypass_cache: bool = kwargs.pop("bypass_cache", False)
+        job_cache: Union[JobCache, None] = self._job_cache
+        job: Union[Job, None] = None
+        cache_key: str = ""
+        if job_cache is not None:
+            cache_key = self._job_cache_key(search_query, **kwargs)
+            sid = None if bypass_cache else job_cache.get_sid(cache_key, max_staleness=max_staleness)
+            job = self._reusable_job(sid) if sid else None
+            job_cache.record(job is not None)
+        reused: bool = job is not None
+        if job is None:
+            job = self.jobs.create(query=search_query, **kwargs)  # type: ignore
+            if job_cache is not None:
+                job_cache.set_sid(cache_key, job.sid)  # type: ignore
+        handle = SearchHandle(
+            job,
+            query=search_query,
+            watcher=self._parent_class.watcher,  # type: ignore
+            memory_budget=self.results_memory_budget,
+        )
+        handle.output_mode = self._output_mode
+        handle.reused = reused
+        self._remember(handle)
+        self.handle = handle
+        return handle
+
+    def fetch(self, query: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        Run a search and return all of its result rows, using the job cache when enabled.
+
+        Stored results younger than ``max_staleness`` are returned without contacting
+        splunkd; otherwise a recent job of the same query is reused or a new one is
+        dispatched, waited for and its results are stored. Does not change the current job.
+
+        :param query: Search query
+        :type query: str
+        :param max_staleness: Seconds cached results may be reused, defaults to the job cache setting
+        :type max_staleness: float, optional
+        :param bypass_cache: Ignore cached jobs and results, defaults to False
+        :type bypass_cache: bool, optional
+        :param timeout: Seconds to wait for the job, defaults to None
+        :type timeout: float, optional
+        :return: Result rows
+        :rtype: List[Dict[str, Any]]
+        """
+        job_cache: Union[JobCache, None] = self._job_cache
+        timeout: Union[float, None] = kwargs.pop("timeout", None)
+        params: Dict[str, Any] = {k: v for k, v in kwargs.items() if k not in ("max_staleness", "bypass_cache")}
+        cache_key: str = self._job_cache_key(query, **params) if job_cache is not None else ""
+        if job_cache is not None and not kwargs.get("bypass_cache"):
+            rows = job_cache.load(cache_key, max_staleness=kwargs.get("max_staleness"))
+            if rows is not None:
+                job_cache.record(True)
+                return rows
+        # Otherwise start_search counts the lookup once, as a reused job or a miss
+        current: Union[SearchHandle, None] = self.handle
+        try:
+            handle: SearchHandle = self.start_search(query=query, **kwargs)
+        finally:
+            self.handle = current
+        handle.watch().result(timeout=timeout)
+        rows = list(handle.iter_results())  # type: ignore
+        if job_cache is not None:
+            job_cache.store(cache_key, rows)
+        return rows
+
+    def stream(self, query: str, include_preview: bool = False, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Stream search results from the export endpoint while the search runs.
+
+        No job is created or polled, rows are yielded as splunkd emits them. Preview rows of
+        a running search are superseded by the final rows, so they are skipped unless
+        ``include_preview`` is set. ERROR and FATAL messages raise as soon as they are read.
+        Does not change the current job.
+
+        :param query: Search query
+        :type query: str
+        :param include_preview: Also yield preview rows, defaults to False
+        :type include_preview: bool, optional
+        :raises SplunkSearchError: Search returned an ERROR message
+        :raises SplunkSearchFatal: Search returned a FATAL message
+        :yield: Result rows
+        :rtype: Iterator[Dict[str, Any]]
+
+        **Example**::
+
+            for row in splunk.Search.stream("search index=main | head 1000000", earliest_time="-1h"):
+                print(row["_raw"])
+        """
+        kwargs.setdefault("preview", include_preview)
+        response = self.jobs.export(query, output_mode="json", **kwargs)  # type: ignore
+        message: Dict[str, Any] = {}
+        try:
+            for row in Utils.iter_json_results(response, message=message, preview=include_preview):
+                self._check_search_for_error(results=message)
+                yield row
+            self._check_search_for_error(results=message)
+        finally:
+            response.close()
+
+    def watch(self, callback: Union[Callable[[Future], Any], None] = None, **kwargs: Any) -> Future:
+        """
+        Watch the current job in the background until it finishes.
+
+        :param callback: Called with the future once the job finishes, defaults to None
+        :type callback: Callable[[Future], Any], optional
+        :param job: Job to watch instead of the current job
+        :type job: Job, optional
+        :raises SplunkApiNoOperationRunning: No job to watch
+        :return: Future resolving to the finished job content
+        :rtype: Future
+        """
+        return self._current(kwargs, "No Job to watch").watch(callback=callback)
+
+    def run_many(
+        self, queries: List[Union[str, Dict[str, Any]]], max_concurrency: Union[int, None] = None, **kwargs: Any
+    ) -> List[SearchTask]:
+        """
+        Run several searches in parallel and gather their results.
+
+        Does not change the current job. See ``SearchPool`` to consume tasks as they finish.
+
+        :param queries: Search queries, or dictionaries with a ``query`` key and job parameters
+        :type queries: List[Union[str, Dict[str, Any]]]
+        :param max_concurrency: Concurrent jobs, defaults to the user's search jobs quota
+        :type max_concurrency: int, optional
+        :param chunk_size: Rows fetched per results page
+        :type chunk_size: int, optional
+        :param timeout: Seconds a job may run before it is cancelled, see ``SearchPool``
+        :type timeout: float, optional
+        :return: One task per query, in order, with status, timing, results and error
+        :rtype: List[SearchTask]
+        """
+        pool_kwargs: Dict[str, Any] = {key: kwargs.pop(key) for key in ("chunk_size", "timeout") if key in kwargs}
+        with SearchPool(self, max_concurrency=max_concurrency, **pool_kwargs) as pool:
+            return pool.run_many(queries, **kwargs)
 
     def get_results(self, **kwargs: Any) -> bool:
         """
         Generates reults once completed into file format that is permitted.
 
-        :raises InvalidNameException: _description_
-        :return: _description_
-        :rtype: Any
-        """
-        if not self.job_content:
-            raise SplunkApiNoOperationRunning(f"No Job Content Exists {self.job_content}")
-        # Check job Status
-        if self.job.is_done():
-            if kwargs.get("output_mode"):
-                self._output_mode = kwargs.pop("output_mode")
-            self.job_content = self.job.content  # type: ignore
-            # Need to check the results first. This should report a Message
-            self.search_resp = Utils.splunk_exporter(service=self.job.results(output_mode="json"))  # type: ignore
-            # Move this to the creation
-            #self.__append_raw_job(self.job)
-            # Check for Error in Search return Error
-            self._check_search_for_error(results=self.search_resp.message)  # type: ignore
-            try:
-                self.csv_results = Utils.to_csv(
-                    service=self.job.results(output_mode='csv')  # type: ignore
-                )
-                self.json_cols_results = Utils.to_json(
-                    service=self.job.results(output_mode="json_cols"),output_mode="json_cols"   # type: ignore
-                )
-                self.json_rows_results = Utils.to_json(
-                    service=self.job.results(output_mode="json_rows"),output_mode="json_rows"   # type: ignore
-                )
-                self.xml_results = Utils.to_xml(
-                    service=self.job.results(output_mode="xml"),output_mode="xml"  # type: ignore
-                )
-                return self.job.is_done()  # type: ignore
-            except Exception as err:
-                error: str = reformat_exception(err)
-                raise InvalidNameException(error)
-        return False
+        Only the first result row is downloaded here to check the search for errors. The
+        ``search_resp``, ``csv_results``, ``json_cols_results``, ``json_rows_results`` and
+        ``xml_results`` formats are fetched from the job once, the first time each one is
+        read, and are cached within ``memory_budget``.
+
+        :param memory_budget: Bytes of result payload to keep cached across formats, defaults to ``results_memory_budget``
+        :type memory_budget: int, optional
+        :param spool_max_size: Spill json and xml results to a temporary file once larger than this many bytes
+        :type spool_max_size: int, optional
+        :param wait: Block until the job finishes using the background job watcher, defaults to False
+        :type wait: bool, optional
+        :param timeout: Seconds to wait for the job when ``wait`` is set, defaults to None
+        :type timeout: float, optional
+        :param fields: Only return these fields, sent as ``field_list``; see ``Utils.fields_clause``
+        :type fields: Union[str, List[str]], optional
+        :param f: Fields to return, wildcards allowed
+        :type f: Union[str, List[str]], optional
+        :param count: Maximum rows to return, defaults to 0 for all rows
+        :type count: int, optional
+        :param offset: First row to return, defaults to 0
+        :type offset: int, optional
+        :param search: Post-process search applied to the results on the server
+        :type search: str, optional
+        :param compact: Keep ``search_resp.json_response`` as a column oriented ``ResultTable``, defaults to False
+        :type compact: bool, optional
+        :param job: Job to read instead of the current job
+        :type job: Job, optional
+        :raises SplunkApiNoOperationRunning: No current search
+        :return: Job finished and results are available
+        :rtype: bool
+        """
+        handle: SearchHandle = self._current(kwargs, "No Job Content Exists None")
+        if handle.job_content is None:
+            raise SplunkApiNoOperationRunning(f"No Job Content Exists {handle.job_content}")
+        return handle.get_results(memory_budget=kwargs.pop("memory_budget", self.results_memory_budget), **kwargs)
+
+    def iter_results(
+        self, chunk_size: int = RESULTS_CHUNK_SIZE, batch: bool = False, **kwargs: Any
+    ) -> Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Page through the results of a completed job.
+
+        Results are requested ``chunk_size`` rows at a time so only one page is held
+        in memory. Each page is checked for ERROR and FATAL messages before it is yielded.
+
+        :param chunk_size: Number of rows to request per page, defaults to RESULTS_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :param batch: Yield a list of rows per page instead of single rows, defaults to False
+        :type batch: bool, optional
+        :param job: Job to read instead of the current job
+        :type job: Job, optional
+        :param offset: Row to start from, defaults to 0
+        :type offset: int, optional
+        :param count: Maximum rows to read, defaults to all rows
+        :type count: int, optional
+        :param fields: Only return these fields, sent as ``field_list``
+        :type fields: Union[str, List[str]], optional
+        :param search: Post-process search applied to the results on the server
+        :type search: str, optional
+        :raises SplunkApiNoOperationRunning: No job to read results from
+        :raises OperationError: Job has not finished
+        :yield: Result rows or pages of result rows
+        :rtype: Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]
+        """
+        return self._current(kwargs, "No Job to read results from").iter_results(
+            chunk_size=chunk_size, batch=batch, **kwargs
+        )
+
+    def download(
+        self,
+        window_size: int = RESULTS_CHUNK_SIZE,
+        workers: int = DOWNLOAD_WORKERS,
+        ordered: bool = True,
+        batch: bool = False,
+        retries: int = DOWNLOAD_RETRIES,
+        **kwargs: Any,
+    ) -> Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Fetch the results of a completed job in parallel windows.
+
+        The ``resultCount`` of the job is split into ``window_size`` offset/count windows
+        that ``workers`` threads request at the same time; at most ``workers * 2`` windows
+        are held in memory. Windows are yielded in result order, or as soon as they arrive
+        with ``ordered=False``. Connection errors and server errors (5xx) are retried with
+        exponential backoff; ERROR/FATAL messages and client errors (4xx) are raised. Use a
+        client created with ``pooled=True`` so the workers share keep-alive connections.
+        With a post-process ``search`` the row count is unknown and the results are paged
+        sequentially like ``iter_results``.
+
+        :param window_size: Number of rows per request, defaults to RESULTS_CHUNK_SIZE
+        :type window_size: int, optional
+        :param workers: Concurrent requests, defaults to DOWNLOAD_WORKERS
+        :type workers: int, optional
+        :param ordered: Yield the windows in result order, defaults to True
+        :type ordered: bool, optional
+        :param batch: Yield a list of rows per window instead of single rows, defaults to False
+        :type batch: bool, optional
+        :param retries: Retries of a failed window, defaults to DOWNLOAD_RETRIES
+        :type retries: int, optional
+        :param job: Job to read instead of the current job
+        :type job: Job, optional
+        :param offset: Row to start from, defaults to 0
+        :type offset: int, optional
+        :param count: Maximum rows to read, defaults to all rows
+        :type count: int, optional
+        :param fields: Only return these fields, sent as ``field_list``
+        :type fields: Union[str, List[str]], optional
+        :param search: Post-process search applied to the results on the server
+        :type search: str, optional
+        :raises SplunkApiNoOperationRunning: No job to download results from
+        :raises OperationError: Job has not finished
+        :yield: Result rows or windows of result rows
+        :rtype: Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]
+
+        **Example**::
+
+            splunk = SplunkApi(pooled=True, **config)
+            splunk.Search.start_search(query="search index=main earliest=-1d").watch().result()
+            for rows in splunk.Search.download(window_size=50000, workers=8, ordered=False, batch=True):
+                handle(rows)
+        """
+        return self._current(kwargs, "No Job to download results from").download(
+            window_size=window_size, workers=workers, ordered=ordered, batch=batch, retries=retries, **kwargs
+        )
 
     def _check_search_for_error(self, results: dict[str, Any]):
         """
@@ -352,10 +1240,7 @@ class Search:
         :raises SplunkSearchError: _description_
         :raises SplunkSearchFatal: _description_
         """
-        if "ERROR" in results:
-            raise SplunkSearchError(f'ERROR: {results["ERROR"]}')
-        if "FATAL" in results:
-            raise SplunkSearchFatal(f'FATAL: {results["FATAL"]}')
+        check_search_for_error(results=results)
 
     def print_results(self, location: str, output_mode: str = "json") -> str:
         """
@@ -366,23 +1251,51 @@ class Search:
         :param output_mode: _description_, defaults to "json"
         :type output_mode: str, optional
         """
-        extension: str = output_mode.split('_')[0]
-        filename: str = f"{location}/results_sid_{self.job.sid}.{extension}"
-        with open(filename,'wb') as f:
-            f.writelines(self.job.results(output_mode=output_mode))  # type: ignore
-        return filename
+        return self._current({}, "No Job to print results from").print_results(location, output_mode=output_mode)
+
+    def export(
+        self, path: str, export_format: str = "parquet", chunk_size: int = RESULTS_CHUNK_SIZE, **kwargs: Any
+    ) -> ResultsExporter:
+        """
+        Export the results of a completed job to a columnar file.
+
+        Results are paged from the job with ``iter_results`` and every page is written as it
+        arrives, so memory is bounded by ``chunk_size`` rows. The schema is inferred from the
+        first page and locked; multivalue fields become list columns. Parquet and Arrow need
+        the optional ``pyarrow`` dependency (``pip install splunk-sdk928[arrow]``).
+
+        :param path: Output file
+        :type path: str
+        :param export_format: One of parquet, arrow or csv.gz, defaults to "parquet"
+        :type export_format: str, optional
+        :param chunk_size: Rows per page and row group, defaults to RESULTS_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :param job: Job to export instead of the current job
+        :type job: Job, optional
+        :return: Exporter with the locked schema, row and batch counts
+        :rtype: ResultsExporter
+
+        **Example**::
+
+            splunk.Search.start_search(query="search index=main | head 100000")
+            splunk.Search.get_results(wait=True)
+            splunk.Search.export("/tmp/results.parquet")
+        """
+        return self._current(kwargs, "No Job to export results from").export(
+            path, export_format=export_format, chunk_size=chunk_size, **kwargs
+        )
 
     def delete_job(self) -> None:
         """Delete Current Job and it's Cache."""
-        self.job.cancel()
+        handle = self.handle
+        if handle is not None:
+            handle.cancel()
+            self._forget(handle)
         self.cancel_job()
 
     def cancel_job(self) -> None:
         """Removes job fron current content"""
-        self.job_content = None
-        self.search_resp = None
-        self.csv_results = None
-        self.json_cols_results = None
-        self.json_rows_results = None
-        self.xml_results: Union[list[Any], None] = None
+        if self.handle is not None:
+            self.handle.clear()
+        self.handle = None
         self.search_query = None
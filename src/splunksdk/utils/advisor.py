@@ -0,0 +1,389 @@
+"""KV Store Accelerated Field Advisor."""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Union
+
+from splunklib.client import KVStoreCollection
+
+from splunksdk.utils.base import BaseMonitor
+from splunksdk.utils.statics import ADVISOR_MAX_SHAPES, ADVISOR_SAMPLES
+
+# Operators a compound index answers with a point lookup, everything else scans a key range
+EQUALITY_OPERATORS: List[str] = ["$eq", "$in"]
+PHASES: List[str] = ["before", "after"]
+
+
+def parse_sort(sort: Union[str, None]) -> Tuple[Tuple[str, int], ...]:
+    """
+    Fields and directions of a KV Store ``sort`` parameter such as ``host,value:-1``.
+
+    :param sort: Sort parameter
+    :type sort: Union[str, None]
+    :return: Field and direction (1 or -1) pairs
+    :rtype: Tuple[Tuple[str, int], ...]
+    """
+    keys: List[Tuple[str, int]] = []
+    for item in (sort or "").split(","):
+        name, _, direction = item.strip().partition(":")
+        if name:
+            keys.append((name, -1 if direction.strip() in ("-1", "desc") else 1))
+    return tuple(keys)
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """
+    Fields and operators of a KV Store query, without its values.
+
+    Queries that only differ in their values share a shape and the same accelerated field.
+    A query with ``$or`` has one shape per branch in ``alternatives``, since each branch
+    is looked up on its own index.
+    """
+    collection: str
+    equality: Tuple[str, ...] = ()
+    sort: Tuple[Tuple[str, int], ...] = ()
+    range: Tuple[str, ...] = ()
+    operators: Tuple[str, ...] = ()
+    alternatives: Tuple["QueryShape", ...] = ()
+
+    @classmethod
+    def from_query(
+        cls, collection: str, query: Union[str, Dict[str, Any], None] = None, sort: Union[str, None] = None
+    ) -> "QueryShape":
+        """
+        Shape of a ``query``/``sort`` pair.
+
+        Fields compared with ``$eq``, ``$in`` or a plain value are equality fields, fields
+        compared with any other operator are range fields. ``$and`` branches are folded into
+        the shape. Every ``$or`` branch, together with the conditions around the ``$or``,
+        becomes one of the ``alternatives``.
+
+        :param collection: Collection name
+        :type collection: str
+        :param query: KV Store query as JSON or a dictionary, defaults to None
+        :type query: Union[str, Dict[str, Any], None], optional
+        :param sort: KV Store sort parameter, defaults to None
+        :type sort: Union[str, None], optional
+        :return: Query shape
+        :rtype: QueryShape
+        """
+        if isinstance(query, str):
+            query = json.loads(query or "{}")
+        return cls._from_nodes(collection, [query or {}], sort)
+
+    @classmethod
+    def _from_nodes(
+        cls, collection: str, nodes: List[Dict[str, Any]], sort: Union[str, None]
+    ) -> "QueryShape":
+        """Shape of the conjunction of ``nodes``."""
+        equality: Dict[str, None] = {}
+        ranges: Dict[str, None] = {}
+        operators: set = set()
+        conditions: List[Dict[str, Any]] = []
+        disjunctions: List[List[Dict[str, Any]]] = []
+
+        def walk(node: Dict[str, Any]) -> None:
+            for key, value in node.items():
+                if key == "$and":
+                    operators.add(key)
+                    for branch in value:
+                        walk(branch)
+                elif key == "$or":
+                    operators.add(key)
+                    disjunctions.append(value)
+                elif isinstance(value, dict) and value and all(_.startswith("$") for _ in value):
+                    operators.update(value)
+                    if all(_ in EQUALITY_OPERATORS for _ in value):
+                        equality[key] = None
+                    else:
+                        ranges[key] = None
+                    conditions.append({key: value})
+                else:
+                    operators.add("$eq")
+                    equality[key] = None
+                    conditions.append({key: value})
+
+        for node in nodes:
+            walk(node)
+        # Each branch of the first $or with everything around it, further $or expand recursively
+        alternatives: Dict[QueryShape, None] = {}
+        if disjunctions:
+            rest: List[Dict[str, Any]] = conditions + [{"$or": _} for _ in disjunctions[1:]]
+            for branch in disjunctions[0]:
+                shape = cls._from_nodes(collection, rest + [branch], sort)
+                alternatives.update(dict.fromkeys(shape.alternatives or (shape,)))
+        return cls(
+            collection=collection,
+            equality=tuple(sorted(equality)),
+            sort=parse_sort(sort),
+            range=tuple(sorted(_ for _ in ranges if _ not in equality)),
+            operators=tuple(sorted(operators)),
+            alternatives=tuple(alternatives),
+        )
+
+    def accelerated_fields(self) -> Dict[str, int]:
+        """
+        Accelerated field definition serving this shape.
+
+        Fields are ordered equality, then sort, then range so the index narrows to the
+        matching documents, returns them already sorted and scans the range last. ``_key``,
+        the default paging sort, has its own index and is left out. A shape with
+        ``alternatives`` is not served by one index, see ``definitions``.
+
+        :return: Field and direction pairs, empty when no index is needed
+        :rtype: Dict[str, int]
+        """
+        if self.alternatives:
+            return {}
+        definition: Dict[str, int] = {}
+        for name in self.equality:
+            definition.setdefault(name, 1)
+        for name, direction in self.sort:
+            definition.setdefault(name, direction)
+        for name in self.range:
+            definition.setdefault(name, 1)
+        definition.pop("_key", None)
+        return definition
+
+    def definitions(self) -> List[Dict[str, int]]:
+        """
+        Accelerated field definitions serving this shape, one per ``$or`` alternative.
+
+        :return: Field and direction pairs of every index needed
+        :rtype: List[Dict[str, int]]
+        """
+        shapes: Tuple[QueryShape, ...] = self.alternatives or (self,)
+        return [_ for _ in (shape.accelerated_fields() for shape in shapes) if _]
+
+    def __str__(self) -> str:
+        if self.alternatives:
+            branches: str = " | ".join(str(_).split(" ", 1)[1] for _ in self.alternatives)
+            return f"{self.collection} or({branches})"
+        parts: List[str] = []
+        if self.equality:
+            parts.append(f"eq({','.join(self.equality)})")
+        if self.sort:
+            parts.append(f"sort({','.join(f'{_}:{d}' for _, d in self.sort)})")
+        if self.range:
+            parts.append(f"range({','.join(self.range)})")
+        return f"{self.collection} {' '.join(parts) or 'scan'}"
+
+
+@dataclass
+class ShapeTiming(BaseMonitor):
+    """Latency of the requests of one query shape, the last ``ADVISOR_SAMPLES`` are kept."""
+    count: int = 0
+    total: float = 0.0
+    latencies: List[float] = field(default_factory=lambda: [])
+
+    def add(self, seconds: float) -> None:
+        """Record one request."""
+        self.count += 1
+        self.total += seconds
+        self.latencies.append(seconds)
+        if len(self.latencies) > ADVISOR_SAMPLES:
+            del self.latencies[: len(self.latencies) - ADVISOR_SAMPLES]
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def p95(self) -> float:
+        """95th percentile latency of the kept samples in seconds."""
+        if not self.latencies:
+            return 0.0
+        values: List[float] = sorted(self.latencies)
+        return values[min(len(values) - 1, int(round(0.95 * len(values))) - 1)]
+
+
+def definition_name(definition: Dict[str, int]) -> str:
+    """Accelerated field name of a definition, e.g. ``accel_host_value``."""
+    return "accel_" + "_".join(re.sub(r"\W", "_", _) for _ in definition)
+
+
+def existing_definitions(store: KVStoreCollection) -> Dict[str, Dict[str, int]]:
+    """Accelerated field definitions of a collection keyed by name."""
+    store.refresh()
+    definitions: Dict[str, Dict[str, int]] = {}
+    for key, value in store.content.items():
+        if key.startswith("accelerated_fields.") and value:
+            definitions[key.split(".", 1)[1]] = json.loads(value) if isinstance(value, str) else dict(value)
+    return definitions
+
+
+class KVstoreAdvisor:
+    """
+    Recommend KV Store accelerated fields from the queries an application runs.
+
+    Every ``get_collection_data``/``iter_collection_data`` page request and ``get_item``
+    read made while the advisor is enabled is recorded by query shape (filter fields,
+    operators and sort keys) with its latency. ``recommend`` turns the slowest shapes into
+    accelerated field definitions, ``apply`` creates them and times the recorded shapes
+    before and after, and ``report`` compares the two.
+
+    :param max_shapes: Distinct query shapes tracked, the least recent are dropped, defaults to ADVISOR_MAX_SHAPES
+    :type max_shapes: int, optional
+
+    **Example**::
+
+        advisor = splunk.KVstore.enable_advisor()
+        ...  # run the application queries
+        print(advisor.recommend("assets"))
+        splunk.KVstore.apply_accelerated_fields("assets", replay=5)
+        print(advisor)
+    """
+
+    def __init__(self, max_shapes: int = ADVISOR_MAX_SHAPES) -> None:
+        self.max_shapes: int = max_shapes
+        self._timings: "OrderedDict[QueryShape, Dict[str, ShapeTiming]]" = OrderedDict()
+        self._samples: Dict[QueryShape, Dict[str, Any]] = {}
+        self._applied: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, collection: str, seconds: float, **params: Any) -> QueryShape:
+        """
+        Record one request of ``collection``.
+
+        :param collection: Collection name
+        :type collection: str
+        :param seconds: Request latency
+        :type seconds: float
+        :param params: Query parameters of the request (``query``, ``sort``, ``fields``, ``limit``)
+        :type params: Any
+        :return: Shape of the request
+        :rtype: QueryShape
+        """
+        shape = QueryShape.from_query(collection, query=params.get("query"), sort=params.get("sort"))
+        phase: str = "after" if collection in self._applied else "before"
+        with self._lock:
+            timings = self._timings.get(shape)
+            if timings is None:
+                timings = self._timings[shape] = {_: ShapeTiming() for _ in PHASES}
+                self._samples[shape] = {k: v for k, v in params.items() if k != "skip"}
+                while len(self._timings) > max(self.max_shapes, 1):
+                    self._samples.pop(self._timings.popitem(last=False)[0], None)
+            else:
+                self._timings.move_to_end(shape)
+            timings[phase].add(seconds)
+        return shape
+
+    def shapes(self, collection: Union[str, None] = None) -> List[QueryShape]:
+        """Recorded shapes, of ``collection`` only when given, slowest total first."""
+        with self._lock:
+            items = [(k, v) for k, v in self._timings.items() if collection in (None, k.collection)]
+        return [k for k, v in sorted(items, key=lambda _: -(_[1]["before"].total + _[1]["after"].total))]
+
+    def recommend(
+        self, collection: str, existing: Union[Dict[str, Dict[str, int]], None] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Accelerated field definitions for the recorded shapes of ``collection``.
+
+        Shapes are taken slowest first, a ``$or`` shape gets one definition per branch.
+        A definition that is a prefix of another one is served by it and left out, as are
+        definitions already in ``existing``.
+
+        :param collection: Collection name
+        :type collection: str
+        :param existing: Accelerated fields the collection already has, defaults to None
+        :type existing: Dict[str, Dict[str, int]], optional
+        :return: Definitions keyed by accelerated field name
+        :rtype: Dict[str, Dict[str, int]]
+        """
+        current: List[Dict[str, int]] = list((existing or {}).values())
+        new: List[Dict[str, int]] = []
+
+        def covers(index: Dict[str, int], definition: Dict[str, int]) -> bool:
+            return list(index.items())[: len(definition)] == list(definition.items())
+
+        for shape in self.shapes(collection):
+            for definition in shape.definitions():
+                if any(covers(_, definition) for _ in current + new):
+                    continue
+                # A longer definition replaces the shorter ones it covers
+                new = [_ for _ in new if not covers(definition, _)] + [definition]
+        return {definition_name(_): _ for _ in new}
+
+    def replay(self, store: KVStoreCollection, repeat: int = 1) -> None:
+        """
+        Run one recorded request of every shape of the collection ``repeat`` times.
+
+        :param store: Collection the shapes were recorded on
+        :type store: KVStoreCollection
+        :param repeat: Runs per shape, defaults to 1
+        :type repeat: int, optional
+        """
+        for shape in self.shapes(store.name):
+            params: Dict[str, Any] = self._samples.get(shape) or {}
+            for _ in range(repeat):
+                start: float = time.perf_counter()
+                store.data.query(**params)
+                self.record(store.name, time.perf_counter() - start, **params)
+
+    def apply(self, store: KVStoreCollection, replay: int = 0) -> Dict[str, Dict[str, int]]:
+        """
+        Create the recommended accelerated fields on a collection.
+
+        With ``replay`` every recorded shape is run ``replay`` times before and after the
+        definitions are created, so ``report`` compares both. Requests recorded after
+        ``apply`` count towards the after timings.
+
+        :param store: Collection to accelerate
+        :type store: KVStoreCollection
+        :param replay: Runs per shape before and after, defaults to 0
+        :type replay: int, optional
+        :return: Created definitions keyed by accelerated field name
+        :rtype: Dict[str, Dict[str, int]]
+        """
+        if replay:
+            self.replay(store, repeat=replay)
+        definitions = self.recommend(store.name, existing=existing_definitions(store))
+        for name, definition in definitions.items():
+            store.update_accelerated_field(name, definition)
+        with self._lock:
+            self._applied.setdefault(store.name, {}).update(definitions)
+        if replay:
+            self.replay(store, repeat=replay)
+        return definitions
+
+    def report(self, collection: Union[str, None] = None) -> List[Dict[str, Any]]:
+        """
+        Before and after timings of every recorded shape.
+
+        :param collection: Only report this collection, defaults to None
+        :type collection: str, optional
+        :return: One entry per shape with its definition, counts, mean and p95 latency and speedup
+        :rtype: List[Dict[str, Any]]
+        """
+        rows: List[Dict[str, Any]] = []
+        for shape in self.shapes(collection):
+            before, after = self._timings[shape]["before"], self._timings[shape]["after"]
+            rows.append(
+                {
+                    "shape": str(shape),
+                    "accelerated_fields": shape.accelerated_fields(),
+                    "before": {"count": before.count, "mean": before.mean, "p95": before.p95},
+                    "after": {"count": after.count, "mean": after.mean, "p95": after.p95},
+                    "speedup": before.mean / after.mean if before.count and after.mean else None,
+                }
+            )
+        return rows
+
+    def __str__(self) -> str:
+        lines: List[str] = [
+            f"{'shape':<48}{'before':>8}{'mean ms':>10}{'after':>8}{'mean ms':>10}{'speedup':>9}"
+        ]
+        for row in self.report():
+            speedup: str = f"{row['speedup']:.1f}x" if row["speedup"] else "-"
+            lines.append(
+                f"{row['shape']:<48}{row['before']['count']:>8}{row['before']['mean'] * 1000:>10.2f}"
+                f"{row['after']['count']:>8}{row['after']['mean'] * 1000:>10.2f}{speedup:>9}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,54 @@
+"""Dataclass Base."""
+
+from dataclasses import dataclass, fields
+from typing import Any, Dict
+
+from pytoolkit.static import NONETYPE
+
+
+@dataclass
+class BaseMonitor:
+    """
+    Base Dataclass Methods, the same as ``pytoolkit.utilities.BaseMonitor``.
+
+    ``pytoolkit.utilities`` imports pandas when it is loaded; the dataclasses of this
+    package extend this class instead so that importing them does not.
+    """
+
+    @classmethod
+    def create_from_dict(cls, _dict: Dict[str, Any]):
+        """
+        Class Method that returns dataclass using a dictionary and strips invalid params.
+
+        :param _dict: Dictionary of Values
+        :type _dict: Dict[str, Any]
+        :return: Dataclass
+        :rtype: :dataclass: DataModel
+        """
+        class_fields = {_.name for _ in fields(cls)}
+        return cls(**{k: v for k, v in _dict.items() if k in class_fields})
+
+    @classmethod
+    def create_from_kwargs(cls, **kwargs: Any):
+        """
+        Class method that returns dataclass values by unpacking parameter values and strips out invalid params.
+
+        :param kwargs: unpacked key:value pairs
+        :type kwargs: Any
+        :return: Dataclass
+        :rtype: :dataclass: DataModel
+        """
+        return cls.create_from_dict(kwargs)
+
+    def to_dict(self, extend: bool = True) -> Dict[str, Any]:
+        """
+        Returns dataclass as dictionary.
+
+        :param extend: Leave out the fields that are still ``NONETYPE``, defaults to True
+        :type extend: bool, optional
+        :return: dataclass dictionary
+        :rtype: Dict[str, Any]
+        """
+        if not extend:
+            return dict(self.__dict__.items())
+        return {k: v for k, v in self.__dict__.items() if v is not NONETYPE}
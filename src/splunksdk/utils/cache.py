@@ -0,0 +1,106 @@
+"""Client-side Caches."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple, Union
+
+MISSING: Any = object()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with a time to live.
+
+    :param max_size: Entries kept before the least recently used is evicted, defaults to 1024
+    :type max_size: int, optional
+    :param ttl: Seconds an entry stays valid, defaults to 60.0
+    :type ttl: float, optional
+
+    **Example**::
+
+        cache = LRUCache(max_size=100, ttl=30)
+        cache.set(("lookups", "k1"), {"_key": "k1"})
+        if (doc := cache.get(("lookups", "k1"))) is not MISSING:
+            ...
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return bool(entry and entry[0] > time.monotonic())
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counters."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._data)}
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Get a cached value.
+
+        :param key: Cache key
+        :type key: Hashable
+        :param default: Returned on a miss or expired entry, defaults to MISSING
+        :type default: Any, optional
+        :return: Cached value or ``default``
+        :rtype: Any
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Union[float, None] = None) -> None:
+        """
+        Cache a value.
+
+        :param key: Cache key
+        :type key: Hashable
+        :param value: Value to cache
+        :type value: Any
+        :param ttl: Seconds this entry stays valid, defaults to the cache ``ttl``
+        :type ttl: float, optional
+        """
+        expires: float = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a key."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every key matching ``predicate``."""
+        with self._lock:
+            for key in [_ for _ in self._data if predicate(_)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,250 @@
+# pylint: disable=protected-access
+"""Pooled Keep-Alive HTTP Handler."""
+
+import io
+import ssl
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from http import client
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from splunklib import __version__ as splunklib_version
+from splunklib.binding import ResponseReader, _spliturl
+
+from splunksdk.utils.base import BaseMonitor
+from splunksdk.utils.statics import POOL_IDLE_TIMEOUT, POOL_SIZE, STREAM_CHUNK_SIZE
+
+# Errors raised when a kept-alive connection was closed by the server while idle
+STALE_CONNECTION_ERRORS: Tuple[type, ...] = (
+    client.RemoteDisconnected,
+    client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+HostKey = Tuple[str, str, int]
+
+
+@dataclass
+class PoolStats(BaseMonitor):
+    """Connection reuse metrics of a ``PooledHandler``."""
+
+    requests: int = 0
+    opened: int = 0  # new connections, each one a TCP (and TLS) handshake
+    reused: int = 0
+    released: int = 0
+    discarded: int = 0
+    expired: int = 0
+    retries: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests sent on an existing connection."""
+        return self.reused / self.requests if self.requests else 0.0
+
+
+class PooledResponseReader(ResponseReader):
+    """
+    Response reader that hands its connection back to the pool once the body is consumed.
+
+    Closing the reader before the body is read discards the connection, as the unread
+    body would corrupt the next response on it.
+    """
+
+    def __init__(self, response: Any, pool: "PooledHandler", key: HostKey, conn: client.HTTPConnection) -> None:
+        super().__init__(response)
+        self._pool = pool
+        self._key = key
+        self._conn: Union[client.HTTPConnection, None] = conn
+
+    def _release(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool._release(self._key, conn)
+
+    def read(self, size: Union[int, None] = None) -> bytes:
+        data: bytes = super().read(size)
+        if self._response.isclosed():
+            self._release()
+        return data
+
+    def close(self) -> None:
+        if self._conn is not None and not self._response.isclosed():
+            conn, self._conn = self._conn, None
+            self._pool._discard(conn)
+        self._release()
+        self._response.close()
+
+
+class PooledHandler:
+    """
+    Thread safe keep-alive HTTP handler for ``splunklib`` that reuses connections per host.
+
+    Up to ``pool_size`` idle connections are kept per scheme, host and port. Requests above
+    that open extra connections that are closed instead of pooled. Connections idle for more
+    than ``idle_timeout`` seconds are closed rather than reused, and a request that fails on
+    a reused connection the server has since closed is sent once more on a new connection.
+    Small bodies are read up front so the connection goes back to the pool straight away.
+
+    :param pool_size: Idle connections kept per host, defaults to POOL_SIZE
+    :type pool_size: int, optional
+    :param idle_timeout: Seconds an idle connection may be reused, defaults to POOL_IDLE_TIMEOUT
+    :type idle_timeout: float, optional
+    :param timeout: Socket timeout in seconds, defaults to None
+    :type timeout: float, optional
+    :param verify: Verify SSL certificates, defaults to True
+    :type verify: bool, optional
+    :param context: SSLContext used when verify is enabled, defaults to None
+    :type context: SSLContext, optional
+
+    **Example**::
+
+        handler = PooledHandler(pool_size=8)
+        service = client.connect(handler=handler, **login)
+        ...
+        print(handler.stats.reuse_ratio)
+    """
+
+    def __init__(
+        self,
+        pool_size: int = POOL_SIZE,
+        idle_timeout: float = POOL_IDLE_TIMEOUT,
+        timeout: Optional[float] = None,
+        verify: bool = True,
+        context: Optional[ssl.SSLContext] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.pool_size: int = pool_size
+        self.idle_timeout: float = idle_timeout
+        self.timeout: Optional[float] = timeout
+        self.verify: bool = verify
+        self.context: Optional[ssl.SSLContext] = context
+        self.key_file: Optional[str] = kwargs.get("key_file")
+        self.cert_file: Optional[str] = kwargs.get("cert_file")
+        self.stats = PoolStats()
+        self._idle: Dict[HostKey, Deque[Tuple[client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(_) for _ in self._idle.values())
+
+    def _connect(self, scheme: str, host: str, port: int) -> client.HTTPConnection:
+        """Open a new connection."""
+        kwargs: Dict[str, Any] = {}
+        if self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+        if scheme == "http":
+            return client.HTTPConnection(host, port, **kwargs)
+        if scheme == "https":
+            context: Optional[ssl.SSLContext] = self.context if self.verify else ssl._create_unverified_context()
+            if self.cert_file:
+                context = context or ssl.create_default_context()
+                context.load_cert_chain(self.cert_file, self.key_file)
+            if context:
+                kwargs["context"] = context
+            return client.HTTPSConnection(host, port, **kwargs)
+        raise ValueError(f"unsupported scheme: {scheme}")
+
+    def _acquire(self, key: HostKey) -> Tuple[client.HTTPConnection, bool]:
+        """Idle connection for a host, or a new one. Returns the connection and whether it was reused."""
+        now: float = time.monotonic()
+        expired: List[client.HTTPConnection] = []
+        conn: Union[client.HTTPConnection, None] = None
+        with self._lock:
+            self.stats.requests += 1
+            idle = self._idle.get(key)
+            while idle:
+                candidate, released = idle.pop()
+                if now - released > self.idle_timeout:
+                    expired.append(candidate)
+                    self.stats.expired += 1
+                    continue
+                conn = candidate
+                self.stats.reused += 1
+                break
+            if conn is None:
+                self.stats.opened += 1
+        for stale in expired:
+            stale.close()
+        if conn is not None:
+            return conn, True
+        return self._connect(*key), False
+
+    def _release(self, key: HostKey, conn: client.HTTPConnection) -> None:
+        """Return a connection to the pool, or close it when the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.pool_size:
+                idle.append((conn, time.monotonic()))
+                self.stats.released += 1
+                return
+            self.stats.discarded += 1
+        conn.close()
+
+    def _discard(self, conn: client.HTTPConnection) -> None:
+        """Close a connection that can not be reused."""
+        with self._lock:
+            self.stats.discarded += 1
+        conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+    def __call__(self, url: str, message: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        """Send a request, same interface as ``splunklib.binding.handler``."""
+        scheme, host, port, path = _spliturl(url)
+        body = message.get("body", "")
+        head: Dict[str, str] = {
+            "Content-Length": str(len(body)),
+            "Host": host,
+            "User-Agent": f"splunk-sdk-python/{splunklib_version}",
+            "Accept": "*/*",
+            "Connection": "Keep-Alive",
+        }
+        for name, value in message["headers"]:
+            head[name] = value
+        method: str = message.get("method", "GET")
+        key: HostKey = (scheme, host, port)
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request(method, path, body, head)
+                response = conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection, send once more on a new one
+                with self._lock:
+                    self.stats.retries += 1
+                continue
+            except Exception:
+                conn.close()
+                raise
+            break
+        return {
+            "status": response.status,
+            "reason": response.reason,
+            "headers": response.getheaders(),
+            "body": self._body(response, key, conn),
+        }
+
+    def _body(self, response: client.HTTPResponse, key: HostKey, conn: client.HTTPConnection) -> Any:
+        """Response body reader that returns the connection to the pool when done."""
+        if response.will_close:
+            return ResponseReader(response, conn)
+        length: Union[str, None] = response.getheader("Content-Length")
+        if length is not None and int(length) <= STREAM_CHUNK_SIZE:
+            data: bytes = response.read()
+            self._release(key, conn)
+            return ResponseReader(io.BytesIO(data))
+        return PooledResponseReader(response, self, key, conn)
@@ -0,0 +1,179 @@
+"""Columnar export of search results."""
+
+import csv
+import gzip
+from typing import Any, Dict, Iterable, List, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+from splunksdk import InvalidNameException, OperationError
+from splunksdk.utils.statics import ENCODING, EXPORT_FORMATS, MULTIVALUE_SEPARATOR
+
+
+def infer_schema(page: List[Dict[str, Any]]) -> Dict[str, bool]:
+    """
+    Infer the export schema from the first page of results.
+
+    Splunk returns every value as a string, multivalue fields as a list of strings.
+    Fields are kept in the order they first appear.
+
+    :param page: First page of result rows
+    :type page: List[Dict[str, Any]]
+    :return: Field names mapped to whether the field is multivalue
+    :rtype: Dict[str, bool]
+    """
+    schema: Dict[str, bool] = {}
+    for row in page:
+        for field, value in row.items():
+            schema[field] = schema.get(field, False) or isinstance(value, list)
+    return schema
+
+
+def _single(value: Any) -> Union[str, None]:
+    """Value of a single value column, multivalues are joined."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return MULTIVALUE_SEPARATOR.join(str(_) for _ in value)
+    return str(value)
+
+
+def _multi(value: Any) -> Union[List[str], None]:
+    """Value of a multivalue column, single values become one item lists."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [str(_) for _ in value]
+    return [str(value)]
+
+
+def conform(page: List[Dict[str, Any]], schema: Dict[str, bool], lists: bool = True) -> Dict[str, List[Any]]:
+    """
+    Arrange a page of rows into columns following a locked schema.
+
+    Fields missing from the schema are dropped, missing values become null.
+
+    :param page: Result rows
+    :type page: List[Dict[str, Any]]
+    :param schema: Schema from ``infer_schema``
+    :type schema: Dict[str, bool]
+    :param lists: Keep multivalue fields as lists instead of joining them, defaults to True
+    :type lists: bool, optional
+    :return: Column values keyed by field
+    :rtype: Dict[str, List[Any]]
+    """
+    return {
+        field: [(_multi if multivalue and lists else _single)(row.get(field)) for row in page]
+        for field, multivalue in schema.items()
+    }
+
+
+class ResultsExporter:
+    """
+    Write pages of search results to a file without holding more than one page in memory.
+
+    The schema is inferred from the first page and locked for the rest of the export;
+    multivalue fields become list columns (joined with a newline for ``csv.gz``). Every
+    page is written as its own Parquet row group or Arrow record batch.
+
+    :param path: Output file
+    :type path: str
+    :param export_format: One of parquet, arrow or csv.gz, defaults to "parquet"
+    :type export_format: str, optional
+    :param compression: Parquet compression codec, defaults to "snappy"
+    :type compression: str, optional
+    :raises InvalidNameException: Unsupported format
+    :raises OperationError: pyarrow is required and not installed
+
+    **Example**::
+
+        with ResultsExporter("results.parquet") as exporter:
+            for page in pages:
+                exporter.write(page)
+    """
+
+    def __init__(self, path: str, export_format: str = "parquet", compression: str = "snappy") -> None:
+        if export_format not in EXPORT_FORMATS:
+            raise InvalidNameException(f"Unsupported export format {export_format}, must be one of {EXPORT_FORMATS}")
+        if export_format != "csv.gz" and pa is None:
+            raise OperationError(f"pyarrow is required to export {export_format}: pip install splunk-sdk928[arrow]")
+        self.path: str = path
+        self.export_format: str = export_format
+        self.compression: str = compression
+        self.schema: Union[Dict[str, bool], None] = None
+        self.rows: int = 0
+        self.batches: int = 0
+        self._arrow_schema: Any = None
+        self._writer: Any = None
+        self._file: Any = None
+
+    def __enter__(self) -> "ResultsExporter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _open(self) -> None:
+        """Open the writer once the schema is known."""
+        schema: Dict[str, bool] = self.schema  # type: ignore
+        if self.export_format == "csv.gz":
+            self._file = gzip.open(self.path, "wt", encoding=ENCODING, newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(list(schema))
+            return
+        self._arrow_schema = pa.schema(
+            [pa.field(name, pa.list_(pa.string()) if multivalue else pa.string()) for name, multivalue in schema.items()]
+        )
+        if self.export_format == "parquet":
+            self._writer = pq.ParquetWriter(self.path, self._arrow_schema, compression=self.compression)
+        else:
+            self._file = pa.OSFile(self.path, "wb")
+            self._writer = pa.ipc.new_file(self._file, self._arrow_schema)
+
+    def write(self, page: List[Dict[str, Any]]) -> None:
+        """
+        Write one page of result rows.
+
+        :param page: Result rows
+        :type page: List[Dict[str, Any]]
+        """
+        if not page:
+            return
+        if self.schema is None:
+            self.schema = infer_schema(page)
+            self._open()
+        columns: Dict[str, List[Any]] = conform(
+            page, self.schema, lists=self.export_format != "csv.gz"  # type: ignore
+        )
+        if self.export_format == "csv.gz":
+            self._writer.writerows(zip(*columns.values()))
+        else:
+            self._writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=self._arrow_schema))
+        self.rows += len(page)
+        self.batches += 1
+
+    def write_all(self, pages: Iterable[List[Dict[str, Any]]]) -> "ResultsExporter":
+        """Write every page and close the file."""
+        try:
+            for page in pages:
+                self.write(page)
+        finally:
+            self.close()
+        return self
+
+    def close(self) -> None:
+        """Close the file, an export without rows still writes an empty file."""
+        if self.schema is None:
+            self.schema = {}
+            self._open()
+        if self._writer is not None and self.export_format != "csv.gz":
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = None
+        self._file = None
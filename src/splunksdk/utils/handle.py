@@ -0,0 +1,366 @@
+"""Search Job Handle."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Tuple, Union
+
+from splunklib.binding import HTTPError
+from splunklib.client import Job
+
+from splunksdk import OperationError, SplunkApiNoOperationRunning, SplunkSearchError, SplunkSearchFatal
+from splunksdk.utils.results import LazySearchResults
+from splunksdk.utils.search import SplunkSearchResults
+from splunksdk.utils.splunk_utils import Utils
+from splunksdk.utils.statics import (
+    DOWNLOAD_RETRIES,
+    DOWNLOAD_RETRY_DELAY,
+    DOWNLOAD_WORKERS,
+    RESULTS_CHUNK_SIZE,
+    RESULTS_MEMORY_BUDGET,
+    RESULTS_QUERY,
+)
+from splunksdk.utils.watcher import JobWatcher
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+    from splunksdk.utils.export import ResultsExporter
+
+
+def check_search_for_error(results: Dict[str, Any]) -> None:
+    """
+    Check For Error in Response.
+
+    :param results: Splunk messages keyed by type
+    :type results: Dict[str, Any]
+    :raises SplunkSearchError: Search returned an ERROR message
+    :raises SplunkSearchFatal: Search returned a FATAL message
+    """
+    if "ERROR" in results:
+        raise SplunkSearchError(f'ERROR: {results["ERROR"]}')
+    if "FATAL" in results:
+        raise SplunkSearchFatal(f'FATAL: {results["FATAL"]}')
+
+
+def results_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pop the server side result shaping parameters out of ``kwargs``.
+
+    ``fields`` is accepted as a list or comma separated string and sent as ``field_list``.
+
+    :param kwargs: Keyword arguments of a results call, shaping parameters are removed
+    :type kwargs: Dict[str, Any]
+    :return: Parameters for ``job.results``
+    :rtype: Dict[str, Any]
+    """
+    fields: Union[str, List[str], None] = kwargs.pop("fields", None)
+    if fields:
+        kwargs["field_list"] = fields if isinstance(fields, str) else ",".join(fields)
+    return {key: kwargs.pop(key) for key in RESULTS_QUERY if kwargs.get(key) is not None}
+
+
+class SearchHandle:
+    """
+    One search job with its own content and results.
+
+    Returned by ``Search.start_search``. Handles are independent of each other, so several
+    can be used at once from different threads; calls on one handle are serialized.
+
+    :param job: Search Job
+    :type job: Job
+    :param query: Search query of the job, defaults to None
+    :type query: str, optional
+    :param watcher: Job watcher used by ``watch`` and ``get_results(wait=True)``, defaults to None
+    :type watcher: JobWatcher, optional
+    :param memory_budget: Bytes of result payload to keep cached across formats, defaults to RESULTS_MEMORY_BUDGET
+    :type memory_budget: int, optional
+
+    **Example**::
+
+        handle = splunk.Search.start_search(query="search index=main | head 10")
+        handle.get_results(wait=True)
+        print(handle.csv_results)
+    """
+
+    def __init__(
+        self,
+        job: Job,
+        query: Union[str, None] = None,
+        watcher: Union[JobWatcher, None] = None,
+        memory_budget: int = RESULTS_MEMORY_BUDGET,
+    ) -> None:
+        self.job: Job = job
+        self.query: Union[str, None] = query
+        self.job_content: Union[Dict[str, Any], None] = job.content  # type: ignore
+        self.results: Union[LazySearchResults, None] = None
+        self.result_params: Dict[str, Any] = {}
+        self.output_mode: str = "json"
+        self.memory_budget: int = memory_budget
+        self.reused: bool = False  # job reused from the job cache
+        self._watcher: Union[JobWatcher, None] = watcher
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return f"SearchHandle(sid={self.sid!r}, query={self.query!r})"
+
+    @property
+    def sid(self) -> str:
+        """Search ID."""
+        return self.job.sid
+
+    @property
+    def search_resp(self) -> Union[SplunkSearchResults, None]:
+        """JSON results, fetched on first access."""
+        return self._lazy_results("json")
+
+    @property
+    def csv_results(self) -> Union[DataFrame, None]:
+        """CSV Results, fetched on first access."""
+        return self._lazy_results("csv")
+
+    @property
+    def json_cols_results(self) -> Union[Dict[str, Any], None]:
+        """JSON_COLS Results, fetched on first access."""
+        return self._lazy_results("json_cols")
+
+    @property
+    def json_rows_results(self) -> Union[Dict[str, Any], None]:
+        """JSON_ROWS Results, fetched on first access."""
+        return self._lazy_results("json_rows")
+
+    @property
+    def xml_results(self) -> Union[List[Dict[str, Any]], None]:
+        """XML Results as rows, fetched on first access."""
+        return self._lazy_results("xml")
+
+    def _lazy_results(self, output_mode: str) -> Any:
+        """Fetch a result format from the completed job if results are available."""
+        results = self.results
+        if results is None:
+            return None
+        if self._watcher is None or self._watcher.instrumentation is None:
+            return results.get(output_mode)
+        with self._watcher.instrumentation.activate():
+            return results.get(output_mode)
+
+    def is_done(self) -> bool:
+        """Refresh the job and check whether it finished."""
+        return bool(self.job.is_done())
+
+    def watch(self, callback: Union[Callable[[Future], Any], None] = None) -> Future:
+        """
+        Watch the job in the background until it finishes.
+
+        :param callback: Called with the future once the job finishes, defaults to None
+        :type callback: Callable[[Future], Any], optional
+        :raises OperationError: Handle has no job watcher
+        :return: Future resolving to the finished job content
+        :rtype: Future
+        """
+        if self._watcher is None:
+            raise OperationError("SearchHandle has no job watcher")
+        return self._watcher.watch(self.job, callback=callback)
+
+    def get_results(self, **kwargs: Any) -> bool:
+        """
+        Check the finished job for errors and make its results available.
+
+        See ``Search.get_results`` for the parameters.
+
+        :return: Job finished and results are available
+        :rtype: bool
+        """
+        if kwargs.pop("wait", False):
+            self.watch().result(timeout=kwargs.pop("timeout", None))
+        with self._lock:
+            if not self.is_done():
+                return False
+            if kwargs.get("output_mode"):
+                self.output_mode = kwargs.pop("output_mode")
+            memory_budget: int = kwargs.pop("memory_budget", self.memory_budget)
+            spool_max_size: Union[int, None] = kwargs.pop("spool_max_size", None)
+            compact: bool = kwargs.pop("compact", False)
+            params: Dict[str, Any] = {"count": 0, **results_params(kwargs)}
+            self.job_content = self.job.content  # type: ignore
+            if self._watcher is not None and self._watcher.instrumentation is not None:
+                self._watcher.instrumentation.job_state(self.sid, self.job_content)  # type: ignore
+            # Splunk reports ERROR and FATAL messages with every page, one row is enough to see them
+            message: Dict[str, Any] = {}
+            for _ in Utils.iter_json_results(
+                self.job.results(output_mode="json", **{**params, "count": 1}), message=message  # type: ignore
+            ):
+                pass
+            check_search_for_error(results=message)
+            self.result_params = params
+            self.results = LazySearchResults(
+                self.job, max_bytes=memory_budget, spool_max_size=spool_max_size, compact=compact, **params
+            )
+            return True
+
+    def iter_results(
+        self, chunk_size: int = RESULTS_CHUNK_SIZE, batch: bool = False, **kwargs: Any
+    ) -> Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Page through the results of the finished job.
+
+        See ``Search.iter_results`` for the parameters.
+
+        :yield: Result rows or pages of result rows
+        :rtype: Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]
+        """
+        job: Job = self.job
+        if not job.is_done():
+            raise OperationError(f"Search job {job.sid} has not finished")
+        params: Dict[str, Any] = {**results_params(kwargs), **kwargs}
+        # A post-process search changes the row count, page until a short page instead
+        total: int = 0 if params.get("search") else int(job.content.get("resultCount", 0) or 0)  # type: ignore
+        offset: int = int(params.pop("offset", 0))
+        limit: int = int(params.pop("count", 0) or 0)
+        if limit:
+            total = min(total, offset + limit) if total else offset + limit
+        while True:
+            count: int = min(chunk_size, total - offset) if total else chunk_size
+            message: Dict[str, Any] = {}
+            page: List[Dict[str, Any]] = list(
+                Utils.iter_json_results(
+                    job.results(output_mode="json", offset=offset, count=count, **params),  # type: ignore
+                    message=message,
+                )
+            )
+            check_search_for_error(results=message)
+            if page:
+                if batch:
+                    yield page
+                else:
+                    yield from page
+            offset += len(page)
+            if not page or (total and offset >= total) or (not total and len(page) < count):
+                break
+
+    def _fetch_window(self, offset: int, count: int, retries: int, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Rows ``offset`` to ``offset + count`` of the job, retrying server and connection errors."""
+        attempt: int = 0
+        while True:
+            try:
+                message: Dict[str, Any] = {}
+                rows: List[Dict[str, Any]] = list(
+                    Utils.iter_json_results(
+                        self.job.results(output_mode="json", offset=offset, count=count, **params),  # type: ignore
+                        message=message,
+                    )
+                )
+                check_search_for_error(results=message)
+                return rows
+            except (SplunkSearchError, SplunkSearchFatal):
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                if (isinstance(err, HTTPError) and 400 <= err.status < 500) or attempt >= retries:
+                    raise
+                time.sleep(DOWNLOAD_RETRY_DELAY * 2**attempt)
+                attempt += 1
+
+    def download(
+        self,
+        window_size: int = RESULTS_CHUNK_SIZE,
+        workers: int = DOWNLOAD_WORKERS,
+        ordered: bool = True,
+        batch: bool = False,
+        retries: int = DOWNLOAD_RETRIES,
+        **kwargs: Any,
+    ) -> Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Fetch the results of the finished job in parallel offset windows.
+
+        See ``Search.download`` for the parameters.
+
+        :yield: Result rows or windows of result rows
+        :rtype: Iterator[Union[Dict[str, Any], List[Dict[str, Any]]]]
+        """
+        job: Job = self.job
+        if not job.is_done():
+            raise OperationError(f"Search job {job.sid} has not finished")
+        params: Dict[str, Any] = {**results_params(kwargs), **kwargs}
+        if params.get("search"):
+            # A post-process search changes the row count, the windows can not be computed up front
+            yield from self.iter_results(chunk_size=window_size, batch=batch, **params)
+            return
+        start: int = int(params.pop("offset", 0))
+        limit: int = int(params.pop("count", 0) or 0)
+        end: int = int(job.content.get("resultCount", 0) or 0)  # type: ignore
+        if limit:
+            end = min(end, start + limit)
+        windows: List[Tuple[int, int]] = [
+            (offset, min(window_size, end - offset)) for offset in range(start, end, max(window_size, 1))
+        ]
+        executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="splunk-download")
+        # Windows fetched ahead of the one being yielded, bounds the rows held in memory
+        ahead: int = max(workers, 1) * 2
+        pending: Dict[Future, int] = {}
+        done: Dict[int, List[Dict[str, Any]]] = {}
+        submitted: int = 0
+        following: int = 0
+        try:
+            while following < len(windows):
+                while submitted < len(windows) and submitted < following + ahead:
+                    future = executor.submit(self._fetch_window, *windows[submitted], retries, params)
+                    pending[future] = submitted
+                    submitted += 1
+                finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done[pending.pop(future)] = future.result()
+                ready: List[int] = sorted(done) if not ordered else []
+                while ordered and following in done:
+                    ready.append(following)
+                    following += 1
+                if not ordered:
+                    following += len(ready)
+                for index in ready:
+                    page: List[Dict[str, Any]] = done.pop(index)
+                    if batch:
+                        yield page
+                    else:
+                        yield from page
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def export(
+        self, path: str, export_format: str = "parquet", chunk_size: int = RESULTS_CHUNK_SIZE, **kwargs: Any
+    ) -> ResultsExporter:
+        """Export the results of the finished job to a columnar file, see ``Search.export``."""
+        from splunksdk.utils.export import ResultsExporter  # pylint: disable=import-outside-toplevel
+
+        exporter = ResultsExporter(path, export_format=export_format)
+        return exporter.write_all(self.iter_results(chunk_size=chunk_size, batch=True, **kwargs))  # type: ignore
+
+    def print_results(self, location: str, output_mode: str = "json") -> str:
+        """Write the raw results payload to ``location``, see ``Search.print_results``."""
+        extension: str = output_mode.split('_')[0]
+        filename: str = f"{location}/results_sid_{self.sid}.{extension}"
+        with open(filename, 'wb') as f:
+            f.writelines(self.job.results(output_mode=output_mode))  # type: ignore
+        return filename
+
+    def clear(self) -> None:
+        """Drop the job content and cached results."""
+        with self._lock:
+            if self.results is not None:
+                self.results.clear()
+            self.job_content = None
+            self.results = None
+
+    def cancel(self) -> None:
+        """Cancel the job on the server and drop its results."""
+        self.job.cancel()
+        self.clear()
+
+
+def require_handle(handle: Union[SearchHandle, None], message: str) -> SearchHandle:
+    """Raise ``SplunkApiNoOperationRunning`` when there is no current handle."""
+    if handle is None:
+        raise SplunkApiNoOperationRunning(message)
+    return handle
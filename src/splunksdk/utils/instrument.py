@@ -0,0 +1,487 @@
+"""Instrumentation Hooks."""
+
+import functools
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+from splunklib.binding import ResponseReader
+
+from splunksdk.utils.base import BaseMonitor
+
+Sink = Callable[["Event"], Any]
+
+# Path segments that identify one object rather than an operation
+_OBJECT_PATHS = [
+    (re.compile(r"(search(?:/v2)?/jobs)/(?!export\b)[^/?]+"), r"\1/{sid}"),
+    (re.compile(r"(collections/data/[^/?]+)/(?!batch_save\b)[^/?]+"), r"\1/{key}"),
+]
+_NAMESPACE = re.compile(r"^/?(?:servicesNS/[^/]+/[^/]+|services)/")
+# Jobs whose last seen state is kept to detect transitions
+_TRACKED_JOBS: int = 1000
+# Instrumentation of the client running in the current thread or task, it receives the parse events
+_CURRENT: "ContextVar[Union[Instrumentation, None]]" = ContextVar("splunksdk_instrumentation", default=None)
+
+_logger = logging.getLogger("splunksdk")
+
+
+def operation_name(method: str, url: str) -> str:
+    """
+    Operation name of a REST call, the method and endpoint path without namespace or object IDs.
+
+    :param method: HTTP method
+    :type method: str
+    :param url: Request URL
+    :type url: str
+    :return: Operation name, e.g. ``GET search/v2/jobs/{sid}/results``
+    :rtype: str
+    """
+    path: str = re.sub(r"^\w+://[^/]+", "", url).split("?", 1)[0].rstrip("/")
+    path = _NAMESPACE.sub("", path)
+    for pattern, replacement in _OBJECT_PATHS:
+        path = pattern.sub(replacement, path, count=1)
+    return f"{method} {path}"
+
+
+@dataclass
+class Event(BaseMonitor):
+    """
+    One instrumented operation.
+
+    ``kind`` is ``rest`` for a REST call, ``job`` for a search job state transition
+    (``name`` is the new ``dispatchState``) and ``parse`` for a result conversion.
+    """
+
+    kind: str
+    name: str
+    duration: float = 0.0  # seconds
+    nbytes: int = 0
+    error: Union[str, None] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class Instrumentation:
+    """
+    Event hub that hands every instrumented operation to its sinks.
+
+    A sink is any callable taking an ``Event``. Nothing is measured while there are no
+    sinks, so an idle instrumentation costs one attribute check per operation. Parse
+    events from ``Utils`` go to the instrumentation activated by the caller, see ``activate``.
+
+    **Example**::
+
+        exporter = splunk.instrument(PrometheusExporter())
+        splunk.instrument(LoggingSink())
+        ...
+        print(exporter.render())
+    """
+
+    def __init__(self) -> None:
+        self.sinks: List[Sink] = []
+        self._states: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Instrumentation has at least one sink."""
+        return bool(self.sinks)
+
+    def add_sink(self, sink: Sink) -> Sink:
+        """Add a sink and return it."""
+        with self._lock:
+            self.sinks = self.sinks + [sink]
+        return sink
+
+    def remove_sink(self, sink: Sink) -> None:
+        """Remove a sink."""
+        with self._lock:
+            self.sinks = [_ for _ in self.sinks if _ is not sink]
+
+    @contextmanager
+    def activate(self) -> Iterator["Instrumentation"]:
+        """
+        Send the parse events of the ``Utils`` conversions run inside the block to this instrumentation.
+
+        The activation is local to the current thread or asyncio task, so conversions run
+        for other clients at the same time are not reported here.
+
+        **Example**::
+
+            with splunk.instrumentation.activate():
+                frame = Utils.to_csv(service=job.results(output_mode="csv", count=0))
+        """
+        token = _CURRENT.set(self)
+        try:
+            yield self
+        finally:
+            _CURRENT.reset(token)
+
+    def emit(self, event: Event) -> None:
+        """Hand an event to every sink. Errors in a sink are logged and never reach the caller."""
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception:  # pylint: disable=broad-except
+                _logger.exception("instrumentation sink %r failed", sink)
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attributes: Any) -> Iterator[Event]:
+        """
+        Time the block and emit it as one event.
+
+        :param kind: Event kind
+        :type kind: str
+        :param name: Operation name
+        :type name: str
+        :yield: Event, ``nbytes`` and ``attributes`` may be updated inside the block
+        :rtype: Iterator[Event]
+        """
+        event = Event(kind=kind, name=name, attributes=attributes)
+        start: float = time.perf_counter()
+        try:
+            yield event
+        except Exception as err:
+            event.error = type(err).__name__
+            raise
+        finally:
+            event.duration = time.perf_counter() - start
+            self.emit(event)
+
+    def job_state(self, sid: str, content: Dict[str, Any]) -> None:
+        """
+        Emit a job event when the ``dispatchState`` of a SID changed since it was last seen.
+
+        :param sid: Search ID
+        :type sid: str
+        :param content: Job content
+        :type content: Dict[str, Any]
+        """
+        if not self.sinks:
+            return
+        state: str = str(content.get("dispatchState") or "")
+        with self._lock:
+            previous: Union[str, None] = self._states.get(sid)
+            if state == previous:
+                return
+            self._states[sid] = state
+            self._states.move_to_end(sid)
+            if len(self._states) > _TRACKED_JOBS:
+                self._states.popitem(last=False)
+        self.emit(
+            Event(
+                kind="job",
+                name=state,
+                duration=float(content.get("runDuration") or 0),
+                attributes={
+                    "sid": sid,
+                    "previous": previous,
+                    "scanCount": int(content.get("scanCount") or 0),
+                    "resultCount": int(content.get("resultCount") or 0),
+                },
+            )
+        )
+
+    @contextmanager
+    def summary(self) -> Iterator["OperationSummary"]:
+        """
+        Collect the operations of the block into an ``OperationSummary``.
+
+        **Example**::
+
+            with splunk.summary() as summary:
+                splunk.Search.fetch("search index=main | head 100")
+            print(summary)
+        """
+        summary = OperationSummary()
+        self.add_sink(summary)
+        try:
+            yield summary
+        finally:
+            self.remove_sink(summary)
+
+
+def instrumented(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Emit a ``parse`` event with the duration and row count of every call to the active instrumentation."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            instrumentation: Union[Instrumentation, None] = _CURRENT.get()
+            if instrumentation is None or not instrumentation.sinks:
+                return func(*args, **kwargs)
+            event = Event(kind="parse", name=name)
+            start: float = time.perf_counter()
+            try:
+                result: Any = func(*args, **kwargs)
+            except Exception as err:
+                event.error = type(err).__name__
+                raise
+            else:
+                rows: Any = getattr(result, "json_response", result)
+                if hasattr(rows, "__len__"):
+                    event.attributes["rows"] = len(rows)
+                return result
+            finally:
+                event.duration = time.perf_counter() - start
+                instrumentation.emit(event)
+
+        return wrapper
+
+    return decorator
+
+
+class CountingResponseReader(ResponseReader):
+    """Response body that emits the REST event of its request once it is read to the end or closed."""
+
+    def __init__(self, body: Any, event: Event, start: float, instrumentation: Instrumentation) -> None:
+        super().__init__(body)
+        self._event: Union[Event, None] = event
+        self._start: float = start
+        self._instrumentation: Instrumentation = instrumentation
+
+    def _finish(self) -> None:
+        event, self._event = self._event, None
+        if event is not None:
+            event.duration = time.perf_counter() - self._start
+            self._instrumentation.emit(event)
+
+    def read(self, size: Union[int, None] = None) -> bytes:
+        data: bytes = super().read(size)
+        if self._event is not None:
+            self._event.nbytes += len(data)
+            self._event.attributes["bytes_received"] += len(data)
+            if size is None or not data:
+                self._finish()
+        return data
+
+    def peek(self, size: int) -> bytes:
+        data: bytes = super().peek(size)
+        if self._event is not None:
+            # Peeked bytes are counted again when they are read
+            self._event.nbytes -= len(data)
+            self._event.attributes["bytes_received"] -= len(data)
+        return data
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+
+class InstrumentedHandler:
+    """
+    ``splunklib`` HTTP handler wrapper that emits a ``rest`` event for every request.
+
+    The event covers the request up to the last byte of the response body and counts the
+    bytes sent and received. ``attributes["ttfb"]`` holds the seconds until the response
+    headers arrived. The wrapped handler is available as ``handler``.
+
+    :param handler: Wrapped handler
+    :type handler: Callable
+    :param instrumentation: Event hub
+    :type instrumentation: Instrumentation
+    """
+
+    def __init__(self, handler: Callable[..., Dict[str, Any]], instrumentation: Instrumentation) -> None:
+        self.handler: Callable[..., Dict[str, Any]] = handler
+        self.instrumentation: Instrumentation = instrumentation
+
+    def __getattr__(self, name: str) -> Any:
+        # Attributes of the wrapped handler, e.g. ``PooledHandler.stats``
+        return getattr(self.handler, name)
+
+    def __call__(self, url: str, message: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        if not self.instrumentation.sinks:
+            return self.handler(url, message, **kwargs)
+        body: Any = message.get("body") or b""
+        sent: int = len(body.encode() if isinstance(body, str) else body)
+        event = Event(
+            kind="rest",
+            name=operation_name(message.get("method", "GET"), url),
+            nbytes=sent,
+            attributes={"bytes_sent": sent, "bytes_received": 0},
+        )
+        start: float = time.perf_counter()
+        try:
+            response: Dict[str, Any] = self.handler(url, message, **kwargs)
+        except Exception as err:
+            event.error = type(err).__name__
+            event.duration = time.perf_counter() - start
+            self.instrumentation.emit(event)
+            raise
+        event.attributes["ttfb"] = time.perf_counter() - start
+        event.attributes["status"] = response["status"]
+        if int(response["status"]) >= 400:
+            event.error = str(response["status"])
+        response["body"] = CountingResponseReader(response["body"], event, start, self.instrumentation)
+        return response
+
+
+class LoggingSink:
+    """
+    Sink that logs every event.
+
+    :param logger: Logger, defaults to the ``splunksdk`` logger
+    :type logger: logging.Logger, optional
+    :param level: Log level, defaults to logging.DEBUG
+    :type level: int, optional
+    """
+
+    def __init__(self, logger: Union[logging.Logger, None] = None, level: int = logging.DEBUG) -> None:
+        self.logger: logging.Logger = logger or _logger
+        self.level: int = level
+
+    def __call__(self, event: Event) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+        self.logger.log(
+            self.level,
+            "%s %s %.3fs %d bytes%s %s",
+            event.kind,
+            event.name,
+            event.duration,
+            event.nbytes,
+            f" error={event.error}" if event.error else "",
+            event.attributes,
+        )
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(percent / 100 * len(values))) - 1))]
+
+
+class OperationSummary:
+    """
+    Sink that keeps per-operation statistics, see ``Instrumentation.summary``.
+
+    ``report`` returns the count, error count, bytes and latency (total, mean, p50, p95, max)
+    of each operation keyed by ``"<kind> <name>"``.
+    """
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, List[float]] = {}
+        self.nbytes: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        key: str = f"{event.kind} {event.name}"
+        with self._lock:
+            self.durations.setdefault(key, []).append(event.duration)
+            self.nbytes[key] = self.nbytes.get(key, 0) + event.nbytes
+            self.errors[key] = self.errors.get(key, 0) + (1 if event.error else 0)
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Statistics of every operation seen.
+
+        :return: Statistics keyed by ``"<kind> <name>"``
+        :rtype: Dict[str, Dict[str, Any]]
+        """
+        report: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for key, durations in sorted(self.durations.items()):
+                ordered: List[float] = sorted(durations)
+                total: float = sum(ordered)
+                report[key] = {
+                    "count": len(ordered),
+                    "errors": self.errors[key],
+                    "bytes": self.nbytes[key],
+                    "total": total,
+                    "mean": total / len(ordered),
+                    "p50": _percentile(ordered, 50),
+                    "p95": _percentile(ordered, 95),
+                    "max": ordered[-1],
+                }
+        return report
+
+    def __str__(self) -> str:
+        lines: List[str] = [
+            f"{'operation':<60} {'count':>7} {'errors':>6} {'bytes':>12} {'mean':>9} {'p95':>9} {'max':>9}"
+        ]
+        for key, stats in self.report().items():
+            lines.append(
+                f"{key:<60} {stats['count']:>7} {stats['errors']:>6} {stats['bytes']:>12} "
+                f"{stats['mean']:>9.4f} {stats['p95']:>9.4f} {stats['max']:>9.4f}"
+            )
+        return "\n".join(lines)
+
+
+class PrometheusExporter:
+    """
+    Sink that aggregates events into Prometheus metrics.
+
+    ``render`` returns the text exposition format: a ``<namespace>_<kind>_seconds`` summary
+    (count and sum), ``<namespace>_<kind>_bytes_total`` and ``<namespace>_<kind>_errors_total``
+    counters per operation. Job state transitions are counted per state, with the job's
+    ``scanCount`` in ``<namespace>_job_scanned_events_total``.
+
+    :param namespace: Metric name prefix, defaults to "splunksdk"
+    :type namespace: str, optional
+
+    **Example**::
+
+        exporter = splunk.instrument(PrometheusExporter())
+        ...
+        with open("/var/lib/node_exporter/splunksdk.prom", "w", encoding="utf-8") as f:
+            f.write(exporter.render())
+    """
+
+    def __init__(self, namespace: str = "splunksdk") -> None:
+        self.namespace: str = namespace
+        # (kind, name) -> [count, seconds, bytes, errors, scanned]
+        self._metrics: Dict[Tuple[str, str], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            metric = self._metrics.setdefault((event.kind, event.name), [0, 0.0, 0, 0, 0])
+            metric[0] += 1
+            metric[1] += event.duration
+            metric[2] += event.nbytes
+            metric[3] += 1 if event.error else 0
+            metric[4] += int(event.attributes.get("scanCount", 0) or 0)
+
+    @staticmethod
+    def _label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def render(self) -> str:
+        """
+        Metrics in the Prometheus text exposition format.
+
+        :return: Metrics text
+        :rtype: str
+        """
+        with self._lock:
+            metrics = {key: list(value) for key, value in self._metrics.items()}
+        lines: List[str] = []
+        for kind in sorted({_[0] for _ in metrics}):
+            prefix: str = f"{self.namespace}_{kind}"
+            label: str = "state" if kind == "job" else "operation"
+            rows = sorted((name, value) for (_kind, name), value in metrics.items() if _kind == kind)
+            if kind == "job":
+                lines.append(f"# TYPE {prefix}_transitions_total counter")
+                lines.extend(f'{prefix}_transitions_total{{{label}="{self._label(name)}"}} {int(value[0])}' for name, value in rows)
+                lines.append(f"# TYPE {prefix}_scanned_events_total counter")
+                lines.extend(f'{prefix}_scanned_events_total{{{label}="{self._label(name)}"}} {int(value[4])}' for name, value in rows)
+                continue
+            lines.append(f"# TYPE {prefix}_seconds summary")
+            for name, value in rows:
+                labels: str = f'{{{label}="{self._label(name)}"}}'
+                lines.append(f"{prefix}_seconds_count{labels} {int(value[0])}")
+                lines.append(f"{prefix}_seconds_sum{labels} {value[1]:.6f}")
+            lines.append(f"# TYPE {prefix}_bytes_total counter")
+            lines.extend(f'{prefix}_bytes_total{{{label}="{self._label(name)}"}} {int(value[2])}' for name, value in rows)
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+            lines.extend(f'{prefix}_errors_total{{{label}="{self._label(name)}"}} {int(value[3])}' for name, value in rows)
+        return "\n".join(lines) + "\n"
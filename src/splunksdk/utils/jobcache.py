@@ -0,0 +1,194 @@
+"""Search Job Result Reuse Cache."""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Tuple, Union
+
+from splunksdk.utils.statics import ENCODING, JOB_CACHE_MAX_BYTES, JOB_CACHE_MAX_STALENESS
+
+# Runs of whitespace outside of double quoted strings
+_QUOTED_OR_SPACE = re.compile(r'("(?:[^"\\]|\\.)*")|\s+')
+# Job parameters that change the results of the same query text
+JOB_CACHE_PARAMS: List[str] = ["earliest_time", "latest_time", "app", "owner"]
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize search text so equivalent queries share a cache key.
+
+    Whitespace outside quoted strings is collapsed and a leading ``search`` command is made
+    explicit; quoted strings are kept as they are.
+
+    :param query: Search query
+    :type query: str
+    :return: Normalized query
+    :rtype: str
+    """
+    text: str = _QUOTED_OR_SPACE.sub(lambda _: _.group(1) or " ", query).strip()
+    if not text.startswith("|") and not text.startswith("search "):
+        text = f"search {text}"
+    return text
+
+
+class JobCache:
+    """
+    Reuse search jobs and their results for identical queries.
+
+    Queries are keyed by their normalized text, ``earliest_time``/``latest_time`` and the
+    app/owner namespace. The SID of every dispatched job is remembered for ``max_staleness``
+    seconds so the same query reuses the job while splunkd still keeps it (its TTL). With a
+    ``path``, fetched results are also stored on disk as gzipped JSON, evicting the least
+    recently read entries once they take more than ``max_bytes``.
+
+    :param max_staleness: Seconds a job or stored result may be reused, defaults to JOB_CACHE_MAX_STALENESS
+    :type max_staleness: float, optional
+    :param path: Directory of the on-disk result cache, defaults to None (no disk cache)
+    :type path: str, optional
+    :param max_bytes: Size of the on-disk result cache, defaults to JOB_CACHE_MAX_BYTES
+    :type max_bytes: int, optional
+
+    **Example**::
+
+        splunk.Search.enable_job_cache(max_staleness=300, path="/var/cache/splunk")
+        rows = splunk.Search.fetch("search index=main | stats count by host", earliest_time="-1h")
+    """
+
+    def __init__(
+        self,
+        max_staleness: float = JOB_CACHE_MAX_STALENESS,
+        path: Union[str, None] = None,
+        max_bytes: int = JOB_CACHE_MAX_BYTES,
+    ) -> None:
+        self.max_staleness: float = max_staleness
+        self.path: Union[str, None] = path
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._sids: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counters."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def record(self, hit: bool) -> None:
+        """Count one lookup as a hit or a miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @staticmethod
+    def key(query: str, **params: Any) -> str:
+        """
+        Cache key of a query.
+
+        :param query: Search query
+        :type query: str
+        :param params: Job parameters, only ``JOB_CACHE_PARAMS`` are part of the key
+        :type params: Any
+        :return: Cache key
+        :rtype: str
+        """
+        identity: Dict[str, Any] = {"query": normalize_query(query)}
+        identity.update({_: str(params.get(_) or "") for _ in JOB_CACHE_PARAMS})
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode(ENCODING)).hexdigest()
+
+    def _fresh(self, created: float, max_staleness: Union[float, None]) -> bool:
+        staleness: float = self.max_staleness if max_staleness is None else max_staleness
+        return time.time() - created <= staleness
+
+    def get_sid(self, key: str, max_staleness: Union[float, None] = None) -> Union[str, None]:
+        """SID of the last job dispatched for ``key`` if it is recent enough."""
+        with self._lock:
+            entry = self._sids.get(key)
+            if entry and self._fresh(entry[1], max_staleness):
+                return entry[0]
+            self._sids.pop(key, None)
+        return None
+
+    def set_sid(self, key: str, sid: str) -> None:
+        """Remember the job dispatched for ``key``."""
+        with self._lock:
+            self._sids[key] = (sid, time.time())
+
+    def forget(self, key: str) -> None:
+        """Forget the job and stored results of ``key``."""
+        with self._lock:
+            self._sids.pop(key, None)
+        if self.path:
+            try:
+                os.remove(self._file(key))
+            except FileNotFoundError:
+                pass
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json.gz")  # type: ignore
+
+    def load(self, key: str, max_staleness: Union[float, None] = None) -> Union[List[Dict[str, Any]], None]:
+        """
+        Stored results of ``key`` if they are recent enough.
+
+        :return: Result rows, None when missing or stale
+        :rtype: Union[List[Dict[str, Any]], None]
+        """
+        if not self.path:
+            return None
+        filename: str = self._file(key)
+        try:
+            with gzip.open(filename, "rt", encoding=ENCODING) as f:
+                stored: Dict[str, Any] = json.load(f)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        if not self._fresh(stored.get("created", 0), max_staleness):
+            return None
+        try:
+            os.utime(filename)
+        except FileNotFoundError:
+            return None
+        return stored.get("rows") or []
+
+    def store(self, key: str, rows: List[Dict[str, Any]]) -> None:
+        """Store the results of ``key`` on disk and evict old entries over ``max_bytes``."""
+        if not self.path:
+            return
+        filename: str = self._file(key)
+        temp: str = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(temp, "wt", encoding=ENCODING) as f:
+            json.dump({"created": time.time(), "rows": rows}, f)
+        os.replace(temp, filename)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete the least recently read entries until the cache fits in ``max_bytes``."""
+        entries: List[Tuple[float, int, str]] = []
+        for name in os.listdir(self.path):  # type: ignore
+            if not name.endswith(".json.gz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.path, name))  # type: ignore
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total: int = sum(_[1] for _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))  # type: ignore
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.evictions += 1
@@ -1,9 +1,67 @@
 """KVStore Dataclasses."""
 
-from typing import List
+import time
+from typing import Any, Dict, List
 from dataclasses import dataclass, field
 
+from splunksdk.utils.base import BaseMonitor
+
 
 @dataclass
 class Collections:
-    collections: List[str] = field(default_factory=lambda: [])
+    """KVStore Collection Index keyed by collection name."""
+    entities: Dict[str, Any] = field(default_factory=lambda: {})
+    ttl: float = 300.0
+    fetched: float = field(default_factory=time.monotonic)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entities
+
+    @property
+    def collections(self) -> List[str]:
+        """Collection names."""
+        return list(self.entities)
+
+    @property
+    def expired(self) -> bool:
+        """Index is older than its time to live."""
+        return time.monotonic() - self.fetched >= self.ttl
+
+
+@dataclass
+class BulkSaveResults(BaseMonitor):
+    """KVStore Bulk Save Results.
+
+    ``keys`` holds the ``_key`` of every saved document in input order; documents that
+    could not be saved are reported in ``errors`` with their input ``index``, ``_key`` and ``error``.
+    """
+    keys: List[str] = field(default_factory=lambda: [])
+    errors: List[Dict[str, Any]] = field(default_factory=lambda: [])
+    batches: int = 0
+    retries: int = 0
+
+    @property
+    def saved(self) -> int:
+        """Number of documents saved."""
+        return len(self.keys)
+
+
+@dataclass
+class SyncState(BaseMonitor):
+    """KVStore Incremental Sync State persisted between runs."""
+    collection: str
+    watermark_field: str = "_key"
+    watermark: Any = None
+    syncs: int = 0
+    last_reconcile: float = 0.0
+    documents: Dict[str, Dict[str, Any]] = field(default_factory=lambda: {})
+
+
+@dataclass
+class SyncReport(BaseMonitor):
+    """KVStore Incremental Sync Report."""
+    fetched: int = 0
+    deleted: int = 0
+    reconciled: bool = False
+    watermark: Any = None
+    duration: float = 0.0
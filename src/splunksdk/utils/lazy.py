@@ -0,0 +1,51 @@
+"""Deferred Imports."""
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Any, Union
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Used for heavy dependencies such as pandas that only some methods need, so that
+    importing ``splunksdk`` stays fast for callers that never touch them.
+
+    :param name: Module name
+    :type name: str
+
+    **Example**::
+
+        pd = LazyModule("pandas")
+        frame = pd.DataFrame(rows)  # pandas is imported here
+    """
+
+    def __init__(self, name: str) -> None:
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Module has been imported."""
+        return self._name in sys.modules
+
+    def _load(self) -> ModuleType:
+        module: Union[ModuleType, None] = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __repr__(self) -> str:
+        return f"LazyModule({self._name!r}, loaded={self.loaded})"
+
+
+def is_dataframe(value: Any) -> bool:
+    """``isinstance(value, DataFrame)`` without importing pandas, nothing is a DataFrame before it is loaded."""
+    pandas: Union[ModuleType, None] = sys.modules.get("pandas")
+    return pandas is not None and isinstance(value, pandas.DataFrame)
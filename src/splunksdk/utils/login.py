@@ -1,19 +1,34 @@
 # pylint: disable=invalid-name,too-many-instance-attributes
 """Splunk Login Dataclass Structure."""
 
-from typing import Any, Union, Optional
+from typing import Any, Callable, Dict, Union, Optional
 
 from ssl import SSLContext
 from dataclasses import dataclass
 
 import splunklib.client as sp_client 
+from splunklib.binding import handler as default_handler
 from splunklib.client import Service
 
-from pytoolkit.utilities import BaseMonitor, NONETYPE
-from pytoolkit.utils import set_bool
+from pytoolkit.static import NONETYPE
+
+from splunksdk.utils.base import BaseMonitor
+from splunksdk.utils.connection import PooledHandler
+from splunksdk.utils.instrument import Instrumentation, InstrumentedHandler
+from splunksdk.utils.session import DEFAULT_SESSION_CACHE, FileSessionBackend, SessionCache
+from splunksdk.utils.statics import POOL_IDLE_TIMEOUT, POOL_SIZE
 
 SHARING: list[str] = ["global", "system", "app", "user"]
 
+
+def set_bool(value: Any) -> Union[str, bool]:
+    """``pytoolkit.utils.set_bool``, only imported (with its airport data) for values that are not a bool."""
+    if isinstance(value, bool):
+        return value
+    from pytoolkit.utils import set_bool as _set_bool  # pylint: disable=import-outside-toplevel
+
+    return _set_bool(value=value)
+
 def _splunk_connection(**kwargs: Any) -> Service:
     """
     This function connects and logs in to a Splunk instance.
@@ -21,7 +36,8 @@ def _splunk_connection(**kwargs: Any) -> Service:
     This function is a shorthand for :meth:`Service.login`.
     The ``connect`` function makes one round trip to the server (for logging in).
 
-    See ``SplunkLogin`` Dataclass for details.
+    See ``SplunkLogin`` Dataclass for details. With an ``instrumentation`` the request handler
+    is wrapped in an ``InstrumentedHandler`` before logging in, so the login is reported too.
 
     **Example**::
 
@@ -30,12 +46,34 @@ def _splunk_connection(**kwargs: Any) -> Service:
         a = s.apps["my_app"]
         ...
     """
+    instrumentation: Optional[Instrumentation] = kwargs.pop("instrumentation", None)
     if "host" not in kwargs:
         kwargs["host"] = kwargs.get(
             "splunk_host", kwargs.get("hostname", "localhost"))
-    return sp_client.connect(  # type: ignore
-        **SplunkLogin.create_from_kwargs(**kwargs).to_dict()
-    )
+    login: Dict[str, Any] = SplunkLogin.create_from_kwargs(**kwargs).to_dict()
+    pooled: bool = login.pop("pooled")
+    pool_size: int = login.pop("pool_size")
+    idle_timeout: float = login.pop("idle_timeout")
+    if pooled and "handler" not in login:
+        login["handler"] = PooledHandler(
+            pool_size=pool_size,
+            idle_timeout=idle_timeout,
+            verify=login["verify"],
+            context=login.get("context"),
+        )
+    if instrumentation is not None:
+        handler: Any = login.get("handler")
+        if handler is None:
+            handler = default_handler(verify=login["verify"], context=login.get("context"))
+        login["handler"] = InstrumentedHandler(handler, instrumentation)
+    session_cache: Any = login.pop("session_cache", None)
+    if session_cache is True:
+        session_cache = DEFAULT_SESSION_CACHE
+    elif isinstance(session_cache, str):
+        session_cache = SessionCache(FileSessionBackend(path=session_cache))
+    if session_cache:
+        return session_cache.connect(**login)
+    return sp_client.connect(**login)  # type: ignore
 
 
 @dataclass
@@ -78,6 +116,18 @@ class SplunkLogin(BaseMonitor):
     :type retryDelay: ``int`` (in seconds)
     :param `context`: The SSLContext that can be used when setting verify=True (optional)
     :type context: ``SSLContext``
+    :param pooled: Reuse keep-alive connections with a ``PooledHandler`` (optional, the default is False).
+    :type pooled: ``Boolean``
+    :param pool_size: Idle connections kept per host when ``pooled`` (optional, the default is 10).
+    :type pool_size: ``int``
+    :param idle_timeout: Seconds an idle pooled connection may be reused (optional, the default is 30).
+    :type idle_timeout: ``float``
+    :param handler: Custom HTTP request handler, overrides ``pooled`` (optional).
+    :type handler: ``Callable``
+    :param session_cache: Reuse session tokens of the same host, user and app instead of logging in
+        on every connection. ``True`` uses the in-process cache, a string the token file at that
+        path (optional). Implies ``autologin`` so expired tokens are refreshed on 401.
+    :type session_cache: ``SessionCache``, ``Boolean`` or ``string``
     :return: An initialized :class:`Service` connection.
 
     **Example**::
@@ -102,8 +152,14 @@ class SplunkLogin(BaseMonitor):
     retries: int = 0
     retryDelay: int = 10
     context: Optional[SSLContext] = NONETYPE
+    pooled: bool = False
+    pool_size: int = POOL_SIZE
+    idle_timeout: float = POOL_IDLE_TIMEOUT
+    handler: Optional[Callable[..., Any]] = NONETYPE
+    session_cache: Optional[Union[SessionCache, bool, str]] = NONETYPE
 
     def __post_init__(self):
         if self.sharing not in SHARING:
             raise ValueError(f"Invalid param sharing {self.sharing}")
         self.verify: Union[str, bool]= set_bool(value=self.verify) # type: ignore
+        self.pooled = set_bool(value=self.pooled)  # type: ignore
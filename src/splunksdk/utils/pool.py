@@ -0,0 +1,199 @@
+"""Concurrent Search Pool."""
+
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from splunklib.client import Job, Service
+
+from splunksdk.utils.search import SearchTask
+from splunksdk.utils.statics import RESULTS_CHUNK_SIZE, SEARCH_JOB_TIMEOUT, SEARCH_JOBS_QUOTA
+
+Query = Union[str, Dict[str, Any]]
+
+
+def search_jobs_quota(service: Service, default: int = SEARCH_JOBS_QUOTA) -> int:
+    """
+    Concurrent search jobs allowed for the logged in user.
+
+    The quota is the largest ``srchJobsQuota`` of the user's roles. Falls back to ``default``
+    when the roles can not be read.
+
+    :param service: Splunk Service Connection
+    :type service: Service
+    :param default: Quota used when roles are unavailable, defaults to SEARCH_JOBS_QUOTA
+    :type default: int, optional
+    :return: Number of concurrent searches
+    :rtype: int
+    """
+    try:
+        roles = service.users[service.username].role_entities  # type: ignore
+        return max(int(role.content.get("srchJobsQuota", 0) or 0) for role in roles) or default
+    except Exception:  # pylint: disable=broad-except
+        return default
+
+
+class SearchPool:
+    """
+    Run many searches in parallel.
+
+    At most ``max_concurrency`` jobs are dispatched at a time so the pool stays inside
+    the user's concurrent search quota. Every query is tracked by a ``SearchTask`` holding
+    its SID, status, timing, results and error; a failing query never aborts the others.
+    A job still running after ``timeout`` seconds is cancelled on the server and its task
+    fails with ``TimeoutError``; ``shutdown`` cancels the jobs still running and the queries
+    not dispatched yet, so no job keeps holding a quota slot.
+
+    :param search: Search wrapper of a ``SplunkApi`` instance
+    :type search: Search
+    :param max_concurrency: Concurrent jobs, defaults to the user's search jobs quota
+    :type max_concurrency: int, optional
+    :param chunk_size: Rows fetched per results page, defaults to RESULTS_CHUNK_SIZE
+    :type chunk_size: int, optional
+    :param timeout: Seconds a job may run before it is cancelled, None to wait forever, defaults to SEARCH_JOB_TIMEOUT
+    :type timeout: float, optional
+
+    **Example**::
+
+        pool = SearchPool(api.Search, max_concurrency=4)
+        for task in pool.as_completed(["search index=a", "search index=b"]):
+            print(task.query, task.status, task.duration, len(task.results))
+    """
+
+    def __init__(
+        self,
+        search: Any,
+        max_concurrency: Union[int, None] = None,
+        chunk_size: int = RESULTS_CHUNK_SIZE,
+        timeout: Union[float, None] = SEARCH_JOB_TIMEOUT,
+    ):
+        self._search = search
+        self.max_concurrency: int = max_concurrency or search_jobs_quota(search._parent_class.conn)
+        self.chunk_size: int = chunk_size
+        self.timeout: Union[float, None] = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="splunk-search")
+        self._running: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def __enter__(self) -> "SearchPool":
+        return self
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        self.shutdown(cancel=exc_type is not None)
+
+    def shutdown(self, wait: bool = True, cancel: bool = False) -> None:
+        """
+        Shutdown the worker threads.
+
+        :param wait: Wait for the worker threads to exit, defaults to True
+        :type wait: bool, optional
+        :param cancel: Cancel the running jobs and the queries not dispatched yet, defaults to False
+            (always done when leaving the ``with`` block on an exception)
+        :type cancel: bool, optional
+        """
+        if cancel:
+            self._closed.set()
+            with self._lock:
+                running: List[Job] = list(self._running.values())
+            for job in running:
+                self._cancel(job)
+        # Queued queries see the pool closed and finish as CANCELLED without dispatching a job
+        self._executor.shutdown(wait=wait)
+
+    def submit(self, query: Query, **kwargs: Any) -> "Future[SearchTask]":
+        """
+        Queue a query.
+
+        :param query: Search query or dictionary with a ``query`` key and job parameters
+        :type query: Union[str, Dict[str, Any]]
+        :param kwargs: Job parameters applied to the query
+        :type kwargs: Any
+        :return: Future resolving to the finished SearchTask
+        :rtype: Future
+        """
+        query, params = self._split(query, kwargs)
+        return self._executor.submit(self._run, SearchTask(query=query, params=params))
+
+    def run_many(self, queries: Iterable[Query], **kwargs: Any) -> List[SearchTask]:
+        """
+        Run queries and return their tasks in the order given.
+
+        :param queries: Search queries
+        :type queries: Iterable[Union[str, Dict[str, Any]]]
+        :return: Finished tasks
+        :rtype: List[SearchTask]
+        """
+        return [_.result() for _ in [self.submit(query, **kwargs) for query in queries]]
+
+    def as_completed(self, queries: Iterable[Query], **kwargs: Any) -> Iterator[SearchTask]:
+        """
+        Run queries and yield each task as soon as it finishes.
+
+        :param queries: Search queries
+        :type queries: Iterable[Union[str, Dict[str, Any]]]
+        :yield: Finished tasks
+        :rtype: Iterator[SearchTask]
+        """
+        for future in as_completed([self.submit(query, **kwargs) for query in queries]):
+            yield future.result()
+
+    @staticmethod
+    def _split(query: Query, kwargs: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Split a query into the query string and job parameters."""
+        params: Dict[str, Any] = dict(kwargs)
+        if isinstance(query, dict):
+            query = dict(query)
+            params.update(query)
+            query = params.pop("query")
+        return str(query), params
+
+    def _cancel(self, job: Job) -> None:
+        """Cancel a job on the server and stop watching it."""
+        self._search._parent_class.watcher.unwatch(job.sid)
+        try:
+            job.cancel()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    def _run(self, task: SearchTask) -> SearchTask:
+        """Dispatch, wait for and gather one query."""
+        task.started = time.time()
+        if self._closed.is_set():
+            task.status = "CANCELLED"
+            task.finished = time.time()
+            return task
+        task.status = "RUNNING"
+        job: Union[Job, None] = None
+        try:
+            job = self._search.jobs.create(query=task.query, **task.params)
+            task.sid = job.sid
+            # Watch under the lock so a concurrent shutdown either sees the job or the pool closed
+            with self._lock:
+                if self._closed.is_set():
+                    raise CancelledError()
+                self._running[job.sid] = job
+                watched: Future = self._search._parent_class.watcher.watch(job)
+            watched.result(timeout=self.timeout)
+            task.results = list(self._search.iter_results(chunk_size=self.chunk_size, job=job))
+            task.status = "DONE"
+        except FutureTimeout:
+            self._cancel(job)  # type: ignore
+            task.error = TimeoutError(f"Search job {task.sid} did not finish within {self.timeout} seconds")
+            task.status = "FAILED"
+        except CancelledError as err:
+            if job is not None:
+                self._cancel(job)
+            task.error = err
+            task.status = "CANCELLED"
+        except Exception as err:  # pylint: disable=broad-except
+            task.error = err
+            task.status = "FAILED"
+        finally:
+            if job is not None:
+                with self._lock:
+                    self._running.pop(job.sid, None)
+        task.finished = time.time()
+        return task
@@ -0,0 +1,137 @@
+"""Lazy Search Job Results."""
+
+import io
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Union
+
+from splunklib.client import Job
+
+from splunksdk import InvalidNameException
+from splunksdk.utils.splunk_utils import Utils
+from splunksdk.utils.statics import RESULTS_MEMORY_BUDGET
+
+CONVERTERS: Dict[str, Callable[..., Any]] = {
+    "json": lambda stream, compact=False, **_: Utils.splunk_exporter(service=stream, compact=compact),
+    "csv": lambda stream, **_: Utils.to_csv(service=stream),
+    "json_cols": lambda stream, **kwargs: Utils.to_json(service=stream, output_mode="json_cols", **kwargs),
+    "json_rows": lambda stream, **kwargs: Utils.to_json(service=stream, output_mode="json_rows", **kwargs),
+    "xml": lambda stream, **kwargs: Utils.to_xml(service=stream, output_mode="xml", **kwargs),
+}
+
+
+class CountingReader(io.RawIOBase):
+    """File-like wrapper that counts the bytes read from a response stream."""
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+        self.nbytes: int = 0
+
+    def readable(self) -> bool:
+        """Indicates that the reader is readable."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read data into a byte array and count it."""
+        data: bytes = self._stream.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self.nbytes += size
+        return size
+
+    def close(self) -> None:
+        """Close the wrapped stream."""
+        if hasattr(self._stream, "close"):
+            self._stream.close()
+        super().close()
+
+
+class LazySearchResults:
+    """
+    Search job results fetched on demand.
+
+    Each output mode is downloaded and parsed only the first time it is read and then cached.
+    Cached formats are evicted least recently used first once the payload size of all cached
+    formats exceeds ``max_bytes``.
+
+    :param job: Completed Splunk search job
+    :type job: Job
+    :param max_bytes: Memory budget in bytes of downloaded payload to keep cached, defaults to RESULTS_MEMORY_BUDGET
+    :type max_bytes: int, optional
+    :param spool_max_size: Spill json and xml responses to a temporary file while parsing once they are
+        larger than this many bytes, defaults to None
+    :type spool_max_size: int, optional
+    :param compact: Keep ``json`` rows in a column oriented ``ResultTable``, defaults to False
+    :type compact: bool, optional
+    :param params: Additional parameters passed to ``job.results``
+    :type params: Any
+    """
+
+    def __init__(
+        self,
+        job: Job,
+        max_bytes: int = RESULTS_MEMORY_BUDGET,
+        spool_max_size: Union[int, None] = None,
+        compact: bool = False,
+        **params: Any,
+    ) -> None:
+        self.job: Job = job
+        self.max_bytes: int = max_bytes
+        self.spool_max_size: Union[int, None] = spool_max_size
+        self.compact: bool = compact
+        self.params: Dict[str, Any] = params
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, output_mode: str) -> bool:
+        return output_mode in self._cache
+
+    @property
+    def nbytes(self) -> int:
+        """Payload bytes currently cached."""
+        return sum(self._sizes.values())
+
+    def get(self, output_mode: str) -> Union[Any, None]:
+        """
+        Get results in the requested output mode, fetching them on first access.
+
+        :param output_mode: One of ``json``, ``csv``, ``json_cols``, ``json_rows`` or ``xml``
+        :type output_mode: str
+        :raises InvalidNameException: Unsupported output mode or unable to convert results
+        :return: Converted results
+        :rtype: Any
+        """
+        if output_mode not in CONVERTERS:
+            raise InvalidNameException(f"Invalid output mode {output_mode}")
+        with self._lock:
+            if output_mode in self._cache:
+                self._cache.move_to_end(output_mode)
+                return self._cache[output_mode]
+            stream = CountingReader(self.job.results(output_mode=output_mode, **self.params))  # type: ignore
+            try:
+                value = CONVERTERS[output_mode](
+                    io.BufferedReader(stream), spool_max_size=self.spool_max_size, compact=self.compact
+                )
+            except Exception as err:
+                from pytoolkit.utils import reformat_exception  # pylint: disable=import-outside-toplevel
+
+                raise InvalidNameException(reformat_exception(err)) from err
+            self._store(output_mode, value, stream.nbytes)
+            return value
+
+    def _store(self, output_mode: str, value: Any, size: int) -> None:
+        """Cache a converted result and evict older formats over budget."""
+        if size > self.max_bytes:
+            return
+        self._cache[output_mode] = value
+        self._sizes[output_mode] = size
+        while self.nbytes > self.max_bytes:
+            evicted, _ = self._cache.popitem(last=False)
+            self._sizes.pop(evicted)
+
+    def clear(self) -> None:
+        """Drop all cached formats."""
+        with self._lock:
+            self._cache.clear()
+            self._sizes.clear()
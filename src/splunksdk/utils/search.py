@@ -1,17 +1,199 @@
 """Splunk Search Dataclasses."""
 
-from typing import Any, Dict, List
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, overload
 from dataclasses import dataclass, field
 
 from splunklib.client import Job
 
-from pytoolkit.utilities import BaseMonitor
+from splunksdk.utils.base import BaseMonitor
+from splunksdk.utils.lazy import LazyModule
+from splunksdk.utils.statics import RESULT_TABLE_DISTINCT
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+pd: Any = LazyModule("pandas")
+
+
+class ResultTable:
+    """
+    Column oriented search results with one shared field list.
+
+    Rows are stored as one list per field instead of one dictionary per row, so the
+    field names are held once and each cell costs a single pointer. Repeated string
+    values of low cardinality fields (host, sourcetype, status, ...) are stored once
+    per column. Missing cells are ``None``. Iterating, indexing and ``len`` behave like
+    the list of dictionaries it replaces; rows are rebuilt on access without the
+    missing fields.
+
+    :param fields: Initial field order, defaults to None
+    :type fields: Iterable[str], optional
+
+    **Example**::
+
+        results = Utils.splunk_exporter(service=job.results(output_mode="json", count=0), compact=True)
+        for row in results.json_response:
+            print(row["host"])
+        frame = results.json_response.to_dataframe()
+    """
+
+    __slots__ = ("fields", "columns", "_index", "_length", "_memos", "_keys", "_targets", "_absent")
+
+    def __init__(self, fields: Union[Iterable[str], None] = None) -> None:
+        self.fields: List[str] = []
+        self.columns: List[List[Any]] = []
+        self._index: Dict[str, int] = {}
+        self._length: int = 0
+        # Distinct strings per column, dropped once a column has more than RESULT_TABLE_DISTINCT
+        self._memos: List[Union[Dict[str, str], None]] = []
+        # Field order of the last appended row and the columns it maps to
+        self._keys: Tuple[str, ...] = ()
+        self._targets: List[Tuple[List[Any], Union[Dict[str, str], None]]] = []
+        self._absent: List[List[Any]] = []
+        for name in fields or []:
+            self._add_field(name)
+
+    @classmethod
+    def from_records(cls, rows: Iterable[Dict[str, Any]]) -> "ResultTable":
+        """Build a table from result rows."""
+        table = cls()
+        table.extend(rows)
+        return table
+
+    def _add_field(self, name: str) -> None:
+        self._index[name] = len(self.fields)
+        self.fields.append(name)
+        self.columns.append([None] * self._length)
+        self._memos.append({})
+        self._keys = ()
+
+    def _bind(self, keys: Tuple[str, ...]) -> None:
+        """Map the field order of a row to its columns."""
+        for name in keys:
+            if name not in self._index:
+                self._add_field(name)
+        positions: List[int] = [self._index[_] for _ in keys]
+        self._targets = [(self.columns[_], self._memos[_]) for _ in positions]
+        present = set(positions)
+        self._absent = [column for position, column in enumerate(self.columns) if position not in present]
+        self._keys = keys
+
+    def _trim_memos(self) -> None:
+        """Stop deduplicating columns with too many distinct values."""
+        for position, memo in enumerate(self._memos):
+            if memo is not None and len(memo) > RESULT_TABLE_DISTINCT:
+                self._memos[position] = None
+        self._keys = ()
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Add a row, new fields are added as columns that are empty for earlier rows."""
+        self.extend((row,))
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Add rows."""
+        for row in rows:
+            keys: Tuple[str, ...] = tuple(row)
+            if keys != self._keys:
+                self._bind(keys)
+            for (column, memo), value in zip(self._targets, row.values()):
+                if memo is not None and value.__class__ is str:
+                    value = memo.setdefault(value, value)
+                column.append(value)
+            for column in self._absent:
+                column.append(None)
+            self._length += 1
+            if not self._length % RESULT_TABLE_DISTINCT:
+                self._trim_memos()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _row(self, position: int) -> Dict[str, Any]:
+        return {
+            name: column[position]
+            for name, column in zip(self.fields, self.columns)
+            if column[position] is not None
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        fields: List[str] = self.fields
+        for values in zip(*self.columns):
+            yield {name: value for name, value in zip(fields, values) if value is not None}
+
+    @overload
+    def __getitem__(self, key: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(key, slice):
+            return [self._row(_) for _ in range(*key.indices(self._length))]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("ResultTable index out of range")
+        return self._row(key)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ResultTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ResultTable(rows={self._length}, fields={self.fields!r})"
+
+    def column(self, name: str) -> List[Any]:
+        """Values of one field, ``None`` where a row does not have it."""
+        return self.columns[self._index[name]]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Rows as a list of dictionaries."""
+        return list(self)
+
+    def to_dataframe(self) -> DataFrame:
+        """
+        Results as a DataFrame built straight from the columns.
+
+        The cell values are shared with the table, no per-row dictionaries are created.
+
+        :return: One column per field
+        :rtype: DataFrame
+        """
+        return pd.DataFrame(dict(zip(self.fields, self.columns)), columns=self.fields)
+
 
 @dataclass
 class SplunkSearchResults(BaseMonitor):
-    """Splunk Search Results."""
+    """Splunk Search Results, ``json_response`` is a ``ResultTable`` when exported with ``compact=True``."""
     message: Dict[str, Any] = field(default_factory=lambda: {})
-    json_response: List[Dict[str, Any]] = field(default_factory=lambda: [])
+    json_response: Union[List[Dict[str, Any]], ResultTable] = field(default_factory=lambda: [])
+
+@dataclass
+class SearchTask(BaseMonitor):
+    """Status, Timing and Results of a Query run by a SearchPool."""
+    query: str
+    params: Dict[str, Any] = field(default_factory=lambda: {})
+    sid: Optional[str] = None
+    status: str = "PENDING"
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    results: List[Dict[str, Any]] = field(default_factory=lambda: [])
+    error: Optional[Exception] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds from dispatch until results were gathered or the query failed."""
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    @property
+    def ok(self) -> bool:
+        """Query finished without an error."""
+        return self.status == "DONE"
 
 class SearchJobResults:
     """Search Job Container."""
@@ -0,0 +1,268 @@
+"""Shared Session Token Cache."""
+
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+from splunklib.client import Service
+
+from splunksdk import OperationError
+from splunksdk.utils.statics import ENCODING, SESSION_TTL
+
+_logger = logging.getLogger("splunksdk")
+
+
+def default_session_path() -> str:
+    """
+    Per-user token file, ``$XDG_CACHE_HOME/splunksdk/sessions.json`` (``~/.cache`` by default).
+
+    Falls back to a uid suffixed directory in the temp directory when there is no home
+    directory. The directory is created readable by the owner only.
+
+    :return: Token file path
+    :rtype: str
+    """
+    base: str = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+    directory: str = os.path.join(base, "splunksdk")
+    if base.startswith("~"):
+        uid: str = str(os.getuid()) if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+        directory = os.path.join(tempfile.gettempdir(), f"splunksdk-{uid}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return os.path.join(directory, "sessions.json")
+
+
+def _open_private(path: str, flags: int) -> int:
+    """
+    Open a file that must belong to the current user and be private to it.
+
+    Symbolic links are not followed. Ownership and mode are checked on the opened
+    descriptor so the file can not be swapped between the check and the read.
+
+    :raises PermissionError: File is owned by another user or readable by others
+    :return: File descriptor
+    :rtype: int
+    """
+    fd: int = os.open(path, flags | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    if hasattr(os, "getuid"):
+        info = os.fstat(fd)
+        if not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            os.close(fd)
+            raise PermissionError(f"{path} must be a regular file owned by the current user with mode 0600")
+    return fd
+
+
+class MemorySessionBackend:
+    """
+    In-process session token store shared by every connection of the process.
+
+    :param ttl: Seconds a token is reused before logging in again, defaults to SESSION_TTL
+    :type ttl: float, optional
+    """
+
+    def __init__(self, ttl: float = SESSION_TTL) -> None:
+        self.ttl: float = ttl
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        return self._tokens
+
+    def _write(self, tokens: Dict[str, Dict[str, Any]]) -> None:
+        self._tokens = tokens
+
+    def get(self, key: str) -> Union[str, None]:
+        """Cached token of an identity, None when missing or older than ``ttl``."""
+        with self._lock:
+            entry = self._read().get(key)
+        if not entry or time.time() - entry["created"] > self.ttl:
+            return None
+        return entry["token"]
+
+    def set(self, key: str, token: str) -> None:
+        """Store the token of an identity."""
+        with self._lock:
+            tokens = self._read()
+            tokens[key] = {"token": token, "created": time.time()}
+            self._write(tokens)
+
+    def delete(self, key: str) -> None:
+        """Forget the token of an identity."""
+        with self._lock:
+            tokens = self._read()
+            if tokens.pop(key, None):
+                self._write(tokens)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Serialize logins of one identity."""
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+
+class FileSessionBackend(MemorySessionBackend):
+    """
+    Session token store in a JSON file shared by processes on the same host.
+
+    The file is created readable by the owner only and replaced atomically on every
+    write. Logins are also serialized across processes with a lock file where ``fcntl``
+    is available. A token file or lock file owned by another user, readable by others or
+    replaced by a symbolic link is never trusted: its tokens are ignored and logins fail
+    with ``OperationError``.
+
+    :param path: Token file, defaults to ``default_session_path()`` in the user's cache directory
+    :type path: str, optional
+    :param ttl: Seconds a token is reused before logging in again, defaults to SESSION_TTL
+    :type ttl: float, optional
+    """
+
+    def __init__(self, path: Union[str, None] = None, ttl: float = SESSION_TTL) -> None:
+        super().__init__(ttl=ttl)
+        self.path: str = path or default_session_path()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(_open_private(self.path, os.O_RDONLY), "r", encoding=ENCODING) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        except OSError as err:
+            _logger.warning("Ignoring untrusted session file: %s", err)
+            return {}
+
+    def _write(self, tokens: Dict[str, Dict[str, Any]]) -> None:
+        # mkstemp creates a new 0600 file, a planted temp name can not be reused
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+        with open(fd, "w", encoding=ENCODING) as f:
+            json.dump(tokens, f)
+        os.replace(temp, self.path)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with super().lock(key):
+            if fcntl is None:
+                yield
+                return
+            try:
+                fd: int = _open_private(f"{self.path}.lock", os.O_RDWR | os.O_CREAT)
+            except OSError as err:
+                raise OperationError(f"Untrusted session lock file: {err}") from err
+            with open(fd, "r+", encoding=ENCODING) as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class CachedService(Service):
+    """``Service`` whose logins go through a ``SessionCache``."""
+
+    def __init__(self, session_cache: "SessionCache", session_key: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.session_cache: SessionCache = session_cache
+        self.session_key: str = session_key
+
+    def login(self) -> "CachedService":
+        return self.session_cache.login(self)
+
+    def _login(self) -> "CachedService":
+        """Log in to splunkd."""
+        super().login()
+        return self
+
+
+class SessionCache:
+    """
+    Reuse session tokens across ``SplunkApi`` instances of the same identity.
+
+    Tokens are keyed by scheme, host, port, user, app and owner. A connection made with a
+    cached token skips ``auth/login`` entirely. Connections log in again when splunkd
+    answers 401 (``autologin``), and logins of one identity are serialized: a connection
+    whose token expired picks up a token another connection already refreshed instead of
+    logging in a second time.
+
+    :param backend: Token store, defaults to MemorySessionBackend
+    :type backend: Union[MemorySessionBackend, FileSessionBackend], optional
+
+    **Example**::
+
+        cache = SessionCache(FileSessionBackend())
+        splunk = SplunkApi(host=..., username=..., password=..., session_cache=cache)
+    """
+
+    def __init__(self, backend: Union[MemorySessionBackend, None] = None) -> None:
+        self.backend: MemorySessionBackend = backend if backend is not None else MemorySessionBackend()
+        self.logins: int = 0
+        self.hits: int = 0
+
+    @staticmethod
+    def identity(**kwargs: Any) -> str:
+        """Cache key of a login."""
+        return "{scheme}://{username}@{host}:{port}/{app}/{owner}".format(  # pylint: disable=consider-using-f-string
+            scheme=kwargs.get("scheme", "https"),
+            username=kwargs.get("username", ""),
+            host=kwargs.get("host", "localhost"),
+            port=kwargs.get("port", 8089),
+            app=kwargs.get("app") or "-",
+            owner=kwargs.get("owner") or "-",
+        )
+
+    def connect(self, **kwargs: Any) -> CachedService:
+        """
+        Connect with a cached token, logging in only when there is none.
+
+        :return: Splunk Service Connection
+        :rtype: CachedService
+        """
+        kwargs["autologin"] = True
+        key: str = self.identity(**kwargs)
+        if not kwargs.get("token"):
+            kwargs["token"] = self.backend.get(key)
+        service = CachedService(self, key, **kwargs)
+        if kwargs["token"]:
+            self.hits += 1
+        else:
+            service.login()
+        return service
+
+    def login(self, service: CachedService) -> CachedService:
+        """
+        Log a connection in, or hand it a token refreshed by another connection.
+
+        :param service: Connection whose token is missing or was rejected
+        :type service: CachedService
+        :return: Connection with a valid token
+        :rtype: CachedService
+        """
+        rejected: Any = service.token
+        with self.backend.lock(service.session_key):
+            cached: Union[str, None] = self.backend.get(service.session_key)
+            if cached and cached != rejected:
+                service.token = cached
+                self.hits += 1
+                return service
+            service._login()  # pylint: disable=protected-access
+            self.logins += 1
+            self.backend.set(service.session_key, service.token)
+        return service
+
+    def invalidate(self, **kwargs: Any) -> None:
+        """Forget the cached token of a login."""
+        self.backend.delete(self.identity(**kwargs))
+
+
+DEFAULT_SESSION_CACHE: SessionCache = SessionCache()
@@ -1,18 +1,26 @@
 """Utilities."""
 
+from __future__ import annotations
+
+import codecs
+import io
 import json
+import shutil
 import tempfile
-from typing import Any, List
+from xml.etree import ElementTree
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Union
 import uuid
 
-import pandas as pd
-from pandas import DataFrame
-from splunklib.results import JSONResultsReader
+from splunksdk.utils.instrument import instrumented
+from splunksdk.utils.lazy import LazyModule
+from splunksdk.utils.search import ResultTable, SplunkSearchResults
+from splunksdk.utils.statics import ENCODING, STREAM_CHUNK_SIZE
 
-from pytoolkit.utilities import flatten_dict, nested_dict
-from pytoolkit.py_cert.cacert import castore_custom_delete
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
-from splunksdk.utils.search import SplunkSearchResults
+# Loaded by the first method that builds a DataFrame
+pd: Any = LazyModule("pandas")
 
 # TODO: replace with other functions in pytoolkit
 def get_tempdir() -> str:
@@ -24,6 +32,79 @@ def splunk_temp(extension: str) -> str:
     return f"{get_tempdir()}/splunk_{Utils.uuid()}.{extension}"
 
 
+class _JSONStreamReader:
+    """Minimal pull parser that decodes JSON values from a binary stream one at a time."""
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+        self._text = codecs.getincrementaldecoder(ENCODING)()
+        self._decoder = json.JSONDecoder()
+        self._buffer: str = ""
+        self._pos: int = 0
+        self._eof: bool = False
+
+    def _fill(self, size: int = 0) -> bool:
+        """
+        Read at least one chunk, and until ``size`` characters are buffered, from the stream.
+
+        Chunks are collected in a list and joined to the unread text once, returns False at
+        the end of the stream when nothing was read.
+        """
+        if self._eof:
+            return False
+        chunks: List[str] = []
+        total: int = len(self._buffer) - self._pos
+        while not chunks or total < size:
+            data: bytes = self._stream.read(STREAM_CHUNK_SIZE)
+            chunk: str = self._text.decode(data, final=not data)
+            if not data:
+                self._eof = True
+                break
+            chunks.append(chunk)
+            total += len(chunk)
+        if not chunks:
+            return False
+        self._buffer = self._buffer[self._pos :] + "".join(chunks)
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def consume(self, token: str) -> bool:
+        """Consume ``token`` if it is the next character."""
+        self._skip_whitespace()
+        if self._buffer[self._pos : self._pos + 1] == token:
+            self._pos += 1
+            return True
+        return False
+
+    def expect(self, token: str) -> None:
+        """Consume ``token`` or raise ValueError."""
+        if not self.consume(token):
+            raise ValueError(f"Expected {token!r} at position {self._pos} of JSON stream")
+
+    def decode(self) -> Any:
+        """Decode the next complete JSON value, reading more of the stream as needed."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                pass
+            # Retry once the unread text has doubled, a value spanning many chunks is decoded in linear time
+            if not self._fill(2 * (len(self._buffer) - self._pos)):
+                value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+                return value
+
 
 class Utils:
     """Utilities for Internal Usage."""
@@ -56,6 +137,7 @@ class Utils:
         self.dataframe = data
 
     @classmethod
+    @instrumented("to_csv")
     def to_csv(cls, **kwargs: Any) -> DataFrame:
         """Convert Response to CSV DataFrame."""
         try:
@@ -64,39 +146,288 @@ class Utils:
         except KeyError:
             return pd.DataFrame.from_records(kwargs["data"],index='_key')
 
+    @staticmethod
+    def _stream(service: Any, spool_max_size: Union[int, None] = None) -> Any:
+        """
+        Buffered reader over a response stream.
+
+        When ``spool_max_size`` is set the response is first drained into a spooled temporary
+        file, so the connection is released before parsing starts. The file stays in memory
+        up to ``spool_max_size`` bytes and spills to disk past it; the parsers read it back in
+        ``STREAM_CHUNK_SIZE`` chunks, so memory is bounded by ``spool_max_size`` either way.
+        The spooled file is removed once it is closed.
+        """
+        stream = service if isinstance(service, io.BufferedIOBase) else io.BufferedReader(service)
+        if spool_max_size is None:
+            return stream
+        spool = tempfile.SpooledTemporaryFile(max_size=spool_max_size, dir=get_tempdir())  # pylint: disable=consider-using-with
+        shutil.copyfileobj(stream, spool, length=STREAM_CHUNK_SIZE)
+        spool.seek(0)
+        return spool
+
+    @staticmethod
+    def fields_clause(fields: Union[str, Iterable[str]], exclude: bool = False) -> str:
+        """
+        Build a ``| fields`` clause projecting a search onto ``fields``.
+
+        Appending the clause to a query keeps the other fields from being stored with the
+        job and from crossing the wire; pass ``fields`` to ``get_results`` or
+        ``iter_results`` to shape the results of a job that already ran.
+
+        :param fields: Field names, wildcards allowed
+        :type fields: Union[str, Iterable[str]]
+        :param exclude: Remove the fields instead of keeping only them, defaults to False
+        :type exclude: bool, optional
+        :return: Fields clause, e.g. ``| fields host, source``
+        :rtype: str
+
+        **Example**::
+
+            query = "search index=main" + Utils.fields_clause(["_raw"], exclude=True)
+        """
+        names: List[str] = [fields] if isinstance(fields, str) else [str(_) for _ in fields]
+        names = [_.strip() for _ in names if _ and _.strip()]
+        if not names:
+            raise ValueError("fields_clause requires at least one field")
+        return f" | fields {'- ' if exclude else ''}{', '.join(names)}"
+
+    @staticmethod
+    def normalize(records: Iterable[Dict[str, Any]], index: Union[str, None] = "_key", sep: str = ".") -> DataFrame:
+        """
+        Flatten a batch of nested records straight into a DataFrame.
+
+        Nested keys become ``sep`` joined column names, the same names ``flatten_dict``
+        produces, without building an intermediate flattened dictionary per record.
+
+        :param records: Nested records such as KV Store documents or search results
+        :type records: Iterable[Dict[str, Any]]
+        :param index: Column to use as the index when present, defaults to "_key"
+        :type index: Union[str, None], optional
+        :param sep: Separator of nested keys, defaults to "."
+        :type sep: str, optional
+        :return: Flattened DataFrame
+        :rtype: DataFrame
+        """
+        frame: DataFrame = pd.json_normalize(list(records), sep=sep)
+        if index and index in frame.columns:
+            frame = frame.set_index(index)
+        return frame
+
+    @staticmethod
+    def denormalize(frame: DataFrame, sep: str = ".") -> Iterator[Dict[str, Any]]:
+        """
+        Turn a flattened DataFrame back into nested documents, the inverse of ``normalize``.
+
+        Column paths and missing values are worked out once for the whole frame; empty
+        cells are left out of the documents. A named index (such as ``_key``) is added to
+        every document. Documents are yielded one at a time so they can be fed to
+        ``KVstore.bulk_upsert`` without building the whole list.
+
+        :param frame: Flattened DataFrame
+        :type frame: DataFrame
+        :param sep: Separator of nested keys, defaults to "."
+        :type sep: str, optional
+        :yield: Nested documents
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        paths: List[List[str]] = [str(_).split(sep) for _ in frame.columns]
+        index_name: Union[str, None] = frame.index.name
+        keys: List[Any] = frame.index.tolist() if index_name else []
+        values = frame.to_numpy(dtype=object)
+        present = frame.notna().to_numpy()
+        for row_number, (row, row_present) in enumerate(zip(values, present)):
+            document: Dict[str, Any] = {index_name: keys[row_number]} if index_name else {}
+            for path, value, has_value in zip(paths, row, row_present):
+                if not has_value:
+                    continue
+                target: Dict[str, Any] = document
+                for part in path[:-1]:
+                    target = target.setdefault(part, {})
+                target[path[-1]] = value
+            yield document
+
+    @classmethod
+    @instrumented("to_xml")
+    def to_xml(cls, **kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        Convert an XML results response to rows with ``iter_xml``.
+
+        :param service: Response stream
+        :type service: Any
+        :param spool_max_size: Spill the response to disk once it is larger than this many bytes, defaults to None
+        :type spool_max_size: int, optional
+        :param message: Dictionary updated with any Splunk messages keyed by type, defaults to None
+        :type message: Dict[str, Any], optional
+        :return: Result rows, multivalue fields as lists
+        :rtype: List[Dict[str, Any]]
+        """
+        return list(
+            cls.iter_xml(kwargs["service"], message=kwargs.get("message"), spool_max_size=kwargs.get("spool_max_size"))
+        )
+
+    @classmethod
+    @instrumented("to_json")
+    def to_json(cls, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Convert JSON_COLS and JSON_ROWS responses with ``iter_json``.
+
+        The ``rows`` or ``columns`` array is decoded one entry at a time from the response
+        stream; the response text is never held in memory as a whole.
+
+        :param service: Response stream
+        :type service: Any
+        :param output_mode: ``json_rows`` or ``json_cols``, defaults to "json_rows"
+        :type output_mode: str, optional
+        :param spool_max_size: Spill the response to disk once it is larger than this many bytes, defaults to None
+        :type spool_max_size: int, optional
+        :return: Response document
+        :rtype: Dict[str, Any]
+        """
+        output_mode: str = kwargs.get("output_mode") or "json_rows"
+        document: Dict[str, Any] = {}
+        values: List[Any] = list(
+            cls.iter_json(
+                kwargs["service"], output_mode=output_mode, meta=document, spool_max_size=kwargs.get("spool_max_size")
+            )
+        )
+        document[cls._json_target(output_mode)] = values
+        return document
+
+    @staticmethod
+    def _json_target(output_mode: str) -> str:
+        return "columns" if output_mode == "json_cols" else "rows"
+
     @classmethod
-    def to_xml(cls, **kwargs: Any) -> List[Any]:
-        """Convert Resonse to XML list."""
-        filename = splunk_temp(extension="xml")
-        with open(filename, 'wb') as f:
-            f.writelines(kwargs["service"])
-        with open(filename,'rb') as f:
-            values = f.readlines()
-        castore_custom_delete(filename)
-        return values
+    def iter_json(
+        cls,
+        service: Any,
+        output_mode: str = "json_rows",
+        meta: Union[Dict[str, Any], None] = None,
+        spool_max_size: Union[int, None] = None,
+    ) -> Iterator[Any]:
+        """
+        Incrementally parse a JSON_ROWS or JSON_COLS response.
+
+        Only the ``rows`` (json_rows) or ``columns`` (json_cols) array is streamed; every
+        row or column is yielded as soon as it has been decoded so the whole document is
+        never held in memory.
+
+        :param service: Response stream
+        :type service: Any
+        :param output_mode: ``json_rows`` or ``json_cols``, defaults to "json_rows"
+        :type output_mode: str, optional
+        :param meta: Dictionary updated with the other keys of the response (``fields``, ``messages``), defaults to None
+        :type meta: Union[Dict[str, Any], None], optional
+        :param spool_max_size: Spill the response to disk once it is larger than this many bytes, defaults to None
+        :type spool_max_size: int, optional
+        :yield: Rows or columns
+        :rtype: Iterator[Any]
+        """
+        target: str = cls._json_target(output_mode)
+        meta = meta if meta is not None else {}
+        with cls._stream(service, spool_max_size) as stream:
+            reader = _JSONStreamReader(stream)
+            reader.expect("{")
+            while not reader.consume("}"):
+                reader.consume(",")
+                key = reader.decode()
+                reader.expect(":")
+                if key != target:
+                    meta[key] = reader.decode()
+                    continue
+                reader.expect("[")
+                while not reader.consume("]"):
+                    reader.consume(",")
+                    yield reader.decode()
 
     @classmethod
-    def to_json(cls, **kwargs: Any) -> list[dict[str, Any]]:
-        """Convert JSON_COLS and JSON_ROWS to JSON Objects."""
-        filename = splunk_temp(extension='json')
-        with open(filename,'wb') as f:
-            f.writelines(kwargs["service"])
-        with open(filename,'rb') as f:
-            values = json.load(f)
-        castore_custom_delete(filename)
-        return values
+    def iter_xml(
+        cls, service: Any, message: Union[Dict[str, Any], None] = None, spool_max_size: Union[int, None] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Incrementally parse an XML results response into rows.
+
+        Multivalue fields are returned as lists. Elements are cleared once a row has been
+        yielded so memory use stays flat regardless of the number of results.
+
+        :param service: Response stream
+        :type service: Any
+        :param message: Dictionary updated with any Splunk messages keyed by type, defaults to None
+        :type message: Union[Dict[str, Any], None], optional
+        :param spool_max_size: Spill the response to disk once it is larger than this many bytes, defaults to None
+        :type spool_max_size: int, optional
+        :yield: Result rows
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        message = message if message is not None else {}
+        with cls._stream(service, spool_max_size) as stream:
+            for _, elem in ElementTree.iterparse(stream, events=("end",)):
+                if elem.tag == "msg":
+                    message.update({str(elem.get("type")): str(elem.text)})
+                elif elem.tag == "result":
+                    row: Dict[str, Any] = {}
+                    for field in elem.iter("field"):
+                        values = [_.text or "" for _ in field.iter("text")]
+                        if field.find("v") is not None:
+                            values = ["".join(field.find("v").itertext())]  # type: ignore
+                        row[str(field.get("k"))] = values[0] if len(values) == 1 else values
+                    yield row
+                    elem.clear()
+
+    @staticmethod
+    def iter_json_results(
+        service: Any, message: Union[Dict[str, Any], None] = None, preview: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over Splunk JSON results one line of the response at a time.
+
+        Streams the line delimited ``search/jobs/export`` response: each line holds one
+        result, so rows are available as soon as splunkd sends them. A ``results``
+        response (``search/jobs/{sid}/results``) is a single line holding the whole page,
+        which is read into memory at once; keep those pages small with ``count`` or use
+        ``iter_json`` on a ``json_rows`` response to parse a large page incrementally.
+
+        :param service: Response stream of a ``json`` output mode request
+        :type service: Any
+        :param message: Dictionary updated with any Splunk messages keyed by type, defaults to None
+        :type message: Union[Dict[str, Any], None], optional
+        :param preview: Yield preview rows of a running search, defaults to True
+        :type preview: bool, optional
+        :yield: Result rows
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        message = message if message is not None else {}
+        stream = service if isinstance(service, io.BufferedIOBase) else io.BufferedReader(service)
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            parsed: Dict[str, Any] = json.loads(line)
+            for msg in parsed.get("messages") or []:
+                message.update({str(msg.get("type", "Unknown Message Type")): str(msg.get("text"))})
+            if not preview and parsed.get("preview"):
+                continue
+            if "result" in parsed:
+                yield parsed["result"]
+            yield from parsed.get("results") or []
 
     @staticmethod
+    @instrumented("splunk_exporter")
     def splunk_exporter(**kwargs: Any) -> SplunkSearchResults:
         """
         Export Splunk Records and reformat into a dictionary.
 
-        :return: _description_
-        :rtype: list[dict[str, Any]]
+        :param service: Response stream of a ``json`` output mode request
+        :type service: Any
+        :param compact: Keep the rows in a column oriented ``ResultTable`` instead of a list of dictionaries,
+            defaults to False
+        :type compact: bool, optional
+        :return: Messages and result rows
+        :rtype: SplunkSearchResults
         """
-        results = JSONResultsReader(kwargs["service"])
         # TODO: Convert to a dataclass object that can also hold the metadata or use python pipe
         # https://towardsdatascience.com/write-clean-python-code-using-pipes-1239a0f3abf5
         message: dict[str, Any] = {}
-        json_results = [_ if isinstance(_, dict) else message.update({str(_.type): str(_.message)}) for _ in results]
+        rows = Utils.iter_json_results(kwargs["service"], message=message)
+        json_results = ResultTable.from_records(rows) if kwargs.get("compact") else list(rows)
         return SplunkSearchResults(message=message, json_response=json_results)
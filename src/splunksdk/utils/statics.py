@@ -4,4 +4,32 @@ from typing import List
 
 ENCODING = "utf-8"
 KVSTORE_QUERY: List[str] = ["sort", "limit", "skip", "fields"]
+RESULTS_QUERY: List[str] = ["field_list", "f", "count", "offset", "search"]
 SPLUNK_OUTPUTMODES: List[str] = ["xml", "json", "json_cols", "json_rows", "csv", "atom", "raw"]
+RESULTS_MEMORY_BUDGET: int = 256 * 1024 * 1024
+RESULTS_CHUNK_SIZE: int = 10000
+STREAM_CHUNK_SIZE: int = 64 * 1024
+SEARCH_JOBS_QUOTA: int = 3  # Splunk default srchJobsQuota of the user role
+KVSTORE_BATCH_SAVE_LIMIT: int = 1000  # KV Store default max_documents_per_batch_save
+KVSTORE_RETRIES: int = 3
+KVSTORE_RETRY_DELAY: float = 0.5
+KVSTORE_PAGE_SIZE: int = 10000  # keep at or below the server max_rows_per_query (default 50000)
+KVSTORE_OR_KEYS: int = 100  # keys per $or query, keeps the GET query string short
+KVSTORE_COLLECTIONS_TTL: float = 300.0
+
+EXPORT_FORMATS: List[str] = ["parquet", "arrow", "csv.gz"]
+MULTIVALUE_SEPARATOR: str = "\n"  # Splunk joins multivalue fields with newlines
+POOL_SIZE: int = 10  # idle keep-alive connections kept per host
+POOL_IDLE_TIMEOUT: float = 30.0  # below the splunkd keep-alive idle timeout
+SESSION_TTL: float = 3600.0  # splunkd default sessionTimeout of 1h
+ASYNC_MAX_CONCURRENCY: int = 10  # requests in flight per AsyncSplunkApi
+SEARCH_HISTORY_SIZE: int = 100  # searches kept per Search instance
+JOB_CACHE_MAX_STALENESS: float = 300.0  # seconds a cached job or result may be reused
+JOB_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+RESULT_TABLE_DISTINCT: int = 4096  # distinct strings a ResultTable column deduplicates
+DOWNLOAD_WORKERS: int = 4  # concurrent result windows per download
+DOWNLOAD_RETRIES: int = 3
+DOWNLOAD_RETRY_DELAY: float = 0.5
+ADVISOR_MAX_SHAPES: int = 256  # distinct KV Store query shapes tracked by the advisor
+ADVISOR_SAMPLES: int = 1000  # latencies kept per query shape and phase
+SEARCH_JOB_TIMEOUT: float = 3600.0  # seconds a pooled search may run before it is cancelled
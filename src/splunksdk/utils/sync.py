@@ -0,0 +1,164 @@
+"""KVStore Incremental Sync."""
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Dict, Set, Union
+
+from splunksdk.utils.kvstore import SyncReport, SyncState
+from splunksdk.utils.statics import KVSTORE_PAGE_SIZE
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value TEXT)",
+    "CREATE TABLE IF NOT EXISTS documents (key TEXT PRIMARY KEY, document TEXT)",
+)
+
+
+class KVstoreSync:
+    """
+    Keep a local snapshot of a KV Store collection in step with only the changes since the last run.
+
+    Each ``sync`` fetches the documents whose ``modified_field`` is at or past the stored watermark
+    (or, without a ``modified_field``, documents whose ``_key`` sorts after the last seen key, which
+    only picks up inserts with increasing keys). Deletions are found by a key-only scan every
+    ``reconcile_every`` syncs. The snapshot and watermark are saved to the SQLite database at
+    ``path``, one row per document, so a sync only writes the documents it fetched or removed.
+
+    :param kvstore: KVstore wrapper with the collection set
+    :type kvstore: KVstore
+    :param path: SQLite database holding the snapshot and watermark
+    :type path: str
+    :param modified_field: Field updated on every write, such as a last modified epoch, defaults to None
+    :type modified_field: str, optional
+    :param reconcile_every: Syncs between key-only scans for deletions, 0 disables them, defaults to 10
+    :type reconcile_every: int, optional
+    :param page_size: Documents requested per page, defaults to KVSTORE_PAGE_SIZE
+    :type page_size: int, optional
+
+    **Example**::
+
+        s.KVstore.set_kvstore("assets")
+        mirror = KVstoreSync(s.KVstore, "/var/cache/assets.db", modified_field="updated")
+        report = mirror.sync()
+        mirror.documents["host01"]
+    """
+
+    def __init__(
+        self,
+        kvstore: Any,
+        path: str,
+        modified_field: Union[str, None] = None,
+        reconcile_every: int = 10,
+        page_size: int = KVSTORE_PAGE_SIZE,
+    ) -> None:
+        self._kvstore = kvstore
+        self.path: str = path
+        self.reconcile_every: int = reconcile_every
+        self.page_size: int = page_size
+        # Keys written or removed since the last save, everything is rewritten after a reset
+        self._changed: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._reset: bool = False
+        self.state: SyncState = self.load(kvstore.store.name, modified_field or "_key")
+        self.report: Union[SyncReport, None] = None
+
+    @property
+    def documents(self) -> Dict[str, Dict[str, Any]]:
+        """Local snapshot keyed by ``_key``."""
+        return self.state.documents
+
+    def load(self, collection: str, watermark_field: str) -> SyncState:
+        """
+        Load the saved state, starting over when it belongs to another collection or watermark field.
+
+        :return: Sync state
+        :rtype: SyncState
+        """
+        with closing(self._connect()) as db:
+            values: Dict[str, Any] = {k: json.loads(v) for k, v in db.execute("SELECT name, value FROM state")}
+            if values.get("collection") == collection and values.get("watermark_field") == watermark_field:
+                state = SyncState.create_from_dict(values)
+                state.documents = {key: json.loads(_) for key, _ in db.execute("SELECT key, document FROM documents")}
+                return state
+        self._reset = True
+        return SyncState(collection=collection, watermark_field=watermark_field)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path)
+        for statement in _SCHEMA:
+            db.execute(statement)
+        return db
+
+    def save(self) -> None:
+        """Write the changed documents and the watermark to ``path`` in one transaction."""
+        documents: Dict[str, Dict[str, Any]] = self.state.documents
+        changed = list(documents) if self._reset else [_ for _ in self._changed if _ in documents]
+        with closing(self._connect()) as db, db:
+            if self._reset:
+                db.execute("DELETE FROM documents")
+            db.executemany("DELETE FROM documents WHERE key = ?", [(_,) for _ in self._removed])
+            db.executemany(
+                "INSERT OR REPLACE INTO documents (key, document) VALUES (?, ?)",
+                [(_, json.dumps(documents[_])) for _ in changed],
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO state (name, value) VALUES (?, ?)",
+                [(k, json.dumps(v)) for k, v in self.state.to_dict().items() if k != "documents"],
+            )
+        self._changed.clear()
+        self._removed.clear()
+        self._reset = False
+
+    def sync(self, reconcile: Union[bool, None] = None) -> SyncReport:
+        """
+        Pull changes since the last sync and save the snapshot.
+
+        :param reconcile: Force (True) or skip (False) the key-only scan for deletions, defaults to every ``reconcile_every`` syncs
+        :type reconcile: bool, optional
+        :return: Sync report
+        :rtype: SyncReport
+        """
+        started: float = time.time()
+        state: SyncState = self.state
+        report = SyncReport()
+        query: Dict[str, Any] = {}
+        if state.watermark is not None:
+            # Documents written in the same instant as the watermark are fetched again, keys are not reused
+            operator: str = "$gt" if state.watermark_field == "_key" else "$gte"
+            query = {state.watermark_field: {operator: state.watermark}}
+        for document in self._kvstore.iter_collection_data(
+            page_size=self.page_size, query=query, sort=f"{state.watermark_field}:1"
+        ):
+            state.documents[document["_key"]] = document
+            self._changed.add(document["_key"])
+            value = document.get(state.watermark_field)
+            if value is not None and (state.watermark is None or value > state.watermark):
+                state.watermark = value
+            report.fetched += 1
+        state.syncs += 1
+        if reconcile is None:
+            reconcile = bool(self.reconcile_every) and state.syncs % self.reconcile_every == 0
+        if reconcile:
+            report.deleted = self.reconcile()
+            report.reconciled = True
+        report.watermark = state.watermark
+        self.save()
+        report.duration = time.time() - started
+        self.report = report
+        return report
+
+    def reconcile(self) -> int:
+        """
+        Drop documents from the snapshot that no longer exist in the collection.
+
+        :return: Documents removed
+        :rtype: int
+        """
+        keys = {_["_key"] for _ in self._kvstore.iter_collection_data(page_size=self.page_size, fields="_key")}
+        removed = [_ for _ in self.state.documents if _ not in keys]
+        for key in removed:
+            del self.state.documents[key]
+        self._removed.update(removed)
+        self.state.last_reconcile = time.time()
+        return len(removed)
@@ -0,0 +1,236 @@
+"""Search Job Watcher."""
+
+import json
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Dict, List, Union
+
+from splunklib.client import Job, Service
+
+from splunksdk import OperationError, SplunkSearchFatal
+from splunksdk.utils.instrument import Instrumentation
+
+WATCHER_MIN_INTERVAL: float = 0.5
+WATCHER_MAX_INTERVAL: float = 10.0
+WATCHER_BACKOFF: float = 1.5
+WATCHER_MISSING_POLLS: int = 3  # consecutive polls a job may be missing or the listing may fail
+
+
+class JobWatcher:
+    """
+    Background watcher that tracks many search jobs with a single listing call.
+
+    Every poll makes one ``GET search/jobs`` request and resolves the future of each watched
+    SID that has finished with the job content. Failed jobs resolve with ``SplunkSearchFatal``
+    and jobs that disappear from the listing with ``OperationError``. The poll interval starts
+    at ``min_interval`` and backs off by ``backoff`` up to ``max_interval`` while no job finishes.
+
+    :param service: Splunk Service Connection
+    :type service: Service
+    :param min_interval: Shortest wait between polls in seconds, defaults to WATCHER_MIN_INTERVAL
+    :type min_interval: float, optional
+    :param max_interval: Longest wait between polls in seconds, defaults to WATCHER_MAX_INTERVAL
+    :type max_interval: float, optional
+    :param backoff: Interval multiplier applied after a poll where nothing finished, defaults to WATCHER_BACKOFF
+    :type backoff: float, optional
+    :param instrumentation: Receives a job event for every state change seen while polling, defaults to None
+    :type instrumentation: Instrumentation, optional
+
+    **Example**::
+
+        watcher = JobWatcher(service)
+        future = watcher.watch(job, callback=lambda f: print(f.result()["resultCount"]))
+        content = future.result(timeout=300)
+    """
+
+    def __init__(
+        self,
+        service: Service,
+        min_interval: float = WATCHER_MIN_INTERVAL,
+        max_interval: float = WATCHER_MAX_INTERVAL,
+        backoff: float = WATCHER_BACKOFF,
+        instrumentation: Union[Instrumentation, None] = None,
+    ) -> None:
+        self._service: Service = service
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.backoff: float = backoff
+        self.instrumentation: Union[Instrumentation, None] = instrumentation
+        self.interval: float = min_interval
+        self.polls: int = 0
+        self._futures: Dict[str, "Future[Dict[str, Any]]"] = {}
+        self._missing: Dict[str, int] = {}
+        self._errors: int = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Union[threading.Thread, None] = None
+
+    def __enter__(self) -> "JobWatcher":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    @property
+    def running(self) -> bool:
+        """Watcher thread is alive."""
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self) -> "JobWatcher":
+        """Start the watcher thread."""
+        with self._lock:
+            if not self.running:
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._run, name="splunk-job-watcher", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, cancel: bool = True) -> None:
+        """
+        Stop the watcher thread.
+
+        :param cancel: Cancel the futures of jobs still being watched, defaults to True
+        :type cancel: bool, optional
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        if cancel:
+            with self._lock:
+                for future in self._futures.values():
+                    self._abandon(future)
+                self._futures.clear()
+
+    def watch(
+        self, job: Union[Job, str], callback: Union[Callable[["Future[Dict[str, Any]]"], Any], None] = None
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Watch a search job until it finishes.
+
+        :param job: Job or SID to watch
+        :type job: Union[Job, str]
+        :param callback: Called with the future once the job finishes, defaults to None
+        :type callback: Callable[[Future], Any], optional
+        :return: Future resolving to the job content
+        :rtype: Future
+        """
+        sid: str = job if isinstance(job, str) else job.sid
+        with self._lock:
+            future = self._futures.get(sid)
+            if not future:
+                future = Future()
+                future.set_running_or_notify_cancel()
+                self._futures[sid] = future
+            self.interval = self.min_interval
+        if callback:
+            future.add_done_callback(callback)
+        self.start()
+        self._wake.set()
+        return future
+
+    def unwatch(self, sid: str) -> None:
+        """Stop watching a SID and cancel its future."""
+        with self._lock:
+            future = self._futures.pop(sid, None)
+            self._missing.pop(sid, None)
+        if future:
+            self._abandon(future)
+
+    @staticmethod
+    def _abandon(future: Future) -> None:
+        """Fail a watched future with CancelledError, its waiters would block forever otherwise."""
+        # Watched futures are running, so Future.cancel() leaves them pending
+        if not future.done():
+            future.set_exception(CancelledError())
+
+    def poll(self) -> int:
+        """
+        Poll the job listing once and resolve finished jobs.
+
+        :return: Number of jobs resolved
+        :rtype: int
+        """
+        with self._lock:
+            sids = list(self._futures)
+        if not sids:
+            return 0
+        self.polls += 1
+        try:
+            states: Dict[str, Dict[str, Any]] = self.list_jobs()
+        except Exception as err:  # pylint: disable=broad-except
+            # Retry transient listing failures before failing every watched job
+            self._errors += 1
+            if self._errors < WATCHER_MISSING_POLLS:
+                return 0
+            self._resolve_all(err)
+            return len(sids)
+        self._errors = 0
+        resolved: int = 0
+        for sid in sids:
+            content = states.get(sid)
+            if content is not None and self.instrumentation is not None:
+                self.instrumentation.job_state(sid, content)
+            if content is None:
+                self._missing[sid] = self._missing.get(sid, 0) + 1
+                if self._missing[sid] >= WATCHER_MISSING_POLLS:
+                    resolved += self._resolve(sid, error=OperationError(f"Search job {sid} no longer exists"))
+            elif content.get("isFailed") == "1" or content.get("dispatchState") == "FAILED":
+                resolved += self._resolve(sid, error=SplunkSearchFatal(f"FATAL: Search job {sid} failed"))
+            elif content.get("isDone") == "1":
+                resolved += self._resolve(sid, content=content)
+        return resolved
+
+    def list_jobs(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Content of every search job visible to the user from one listing request.
+
+        ``Jobs.list`` discards the listed state and refreshes each job on access,
+        so the JSON listing is read directly instead.
+
+        :return: Job content keyed by SID
+        :rtype: Dict[str, Dict[str, Any]]
+        """
+        response = self._service.jobs.get(count=0, output_mode="json")  # type: ignore
+        entries: List[Dict[str, Any]] = json.loads(response.body.read()).get("entry") or []
+        return {_["content"].get("sid", _.get("name")): _["content"] for _ in entries}
+
+    def _resolve(
+        self, sid: str, content: Union[Dict[str, Any], None] = None, error: Union[Exception, None] = None
+    ) -> int:
+        """Resolve the future of a SID."""
+        with self._lock:
+            future = self._futures.pop(sid, None)
+            self._missing.pop(sid, None)
+        if not future or future.done():
+            return 0
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(content)  # type: ignore
+        return 1
+
+    def _resolve_all(self, error: Exception) -> None:
+        """Fail every watched job with ``error``."""
+        with self._lock:
+            sids = list(self._futures)
+        for sid in sids:
+            self._resolve(sid, error=error)
+
+    def _run(self) -> None:
+        """Watcher loop."""
+        while not self._stopped.is_set():
+            if not self._futures:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            if self.poll():
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,681 @@
+#  pylint: disable=invalid-name,too-many-instance-attributes,too-many-return-statements,too-many-branches
+"""Local Fake splunkd.
+
+A small, threaded stand-in for the splunkd REST API that is good enough for the
+``splunklib`` client and the ``splunksdk`` wrappers. It serves login, server info,
+search jobs (create, listing, entity, results, export) and KV Store collections
+(config and data) with synthetic data of configurable size and latency.
+
+**Example**::
+
+    with FakeSplunkd(result_rows=1000, latency=0.01) as fake:
+        api = SplunkApi(**fake.login_kwargs())
+"""
+
+import csv
+import io
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.sax.saxutils import escape
+
+ATOM_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:s="http://dev.splunk.com/ns/rest" '
+    'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+)
+SID_COUNT = re.compile(r"count=(\d+)")
+
+
+def _sdict(content: Dict[str, Any]) -> str:
+    """Render a dictionary as an ``s:dict`` element."""
+    items: List[str] = []
+    for key, value in content.items():
+        if isinstance(value, dict):
+            items.append(f'<s:key name="{escape(key)}">{_sdict(value)}</s:key>')
+        else:
+            items.append(f'<s:key name="{escape(key)}">{escape(str(value))}</s:key>')
+    return f"<s:dict>{''.join(items)}</s:dict>"
+
+
+def _entry(title: str, href: str, content: Dict[str, Any], acl: Optional[Dict[str, str]] = None) -> str:
+    """Render an atom ``entry``."""
+    content = dict(content)
+    content["eai:acl"] = acl or {"app": "search", "owner": "nobody", "sharing": "app"}
+    return (
+        f"<entry><title>{escape(title)}</title><id>{escape(href)}</id>"
+        f'<link href="{escape(href)}" rel="alternate"/>'
+        f'<content type="text/xml">{_sdict(content)}</content></entry>'
+    )
+
+
+def _feed(entries: List[str]) -> str:
+    """Render an atom ``feed``."""
+    return (
+        f"{ATOM_HEADER}<title>feed</title><opensearch:totalResults>{len(entries)}</opensearch:totalResults>"
+        f"{''.join(entries)}</feed>"
+    )
+
+
+def _lookup(doc: Dict[str, Any], field: str) -> Any:
+    """Resolve a dotted field name inside a document."""
+    value: Any = doc
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Order numbers before strings before anything else, like the KV Store."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return (2, str(value))
+
+
+def _compare(value: Any, operator: str, expected: Any) -> bool:
+    """Apply a KV Store comparison operator."""
+    try:
+        if operator == "$eq":
+            return value == expected
+        if operator == "$ne":
+            return value != expected
+        if operator == "$gt":
+            return value is not None and value > expected
+        if operator == "$gte":
+            return value is not None and value >= expected
+        if operator == "$lt":
+            return value is not None and value < expected
+        if operator == "$lte":
+            return value is not None and value <= expected
+        if operator == "$in":
+            return value in expected
+        if operator == "$nin":
+            return value not in expected
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported operator {operator}")
+
+
+def match_query(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Evaluate a KV Store (mongo style) query against a document."""
+    for key, value in query.items():
+        if key == "$and":
+            if not all(match_query(doc, sub) for sub in value):
+                return False
+        elif key == "$or":
+            if not any(match_query(doc, sub) for sub in value):
+                return False
+        elif isinstance(value, dict):
+            if not all(_compare(_lookup(doc, key), op, exp) for op, exp in value.items()):
+                return False
+        elif _lookup(doc, key) != value:
+            return False
+    return True
+
+
+class FakeSplunkd:
+    """Threaded fake splunkd server.
+
+    :param result_rows: Default number of rows produced by a search (``count=N`` in the query overrides it).
+    :type result_rows: int
+    :param latency: Seconds to sleep before answering each request.
+    :type latency: float
+    :param job_duration: Seconds a search job stays in the ``RUNNING`` state.
+    :type job_duration: float
+    :param max_rows_per_query: KV Store ``max_rows_per_query`` limit.
+    :type max_rows_per_query: int
+    :param max_documents_per_batch_save: KV Store ``max_documents_per_batch_save`` limit.
+    :type max_documents_per_batch_save: int
+    :param version: Reported splunkd version.
+    :type version: str
+    :param scan_cost: Seconds per KV Store document a query examines; queries whose first filter
+        field leads an accelerated field only examine the matching documents.
+    :type scan_cost: float
+    """
+
+    def __init__(
+        self,
+        result_rows: int = 10,
+        latency: float = 0.0,
+        job_duration: float = 0.0,
+        max_rows_per_query: int = 50000,
+        max_documents_per_batch_save: int = 1000,
+        version: str = "9.1.0",
+        scan_cost: float = 0.0,
+    ) -> None:
+        self.result_rows = result_rows
+        self.latency = latency
+        self.job_duration = job_duration
+        self.max_rows_per_query = max_rows_per_query
+        self.max_documents_per_batch_save = max_documents_per_batch_save
+        self.version = version
+        self.scan_cost = scan_cost
+        self.lock = threading.RLock()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.collections: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.logins = 0
+        self.connections = 0
+        self.sessions: Dict[str, float] = {}
+        # Route regex -> number of upcoming matching requests answered with 503
+        self.failures: Dict[str, int] = {}
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # Server lifecycle
+
+    def start(self) -> "FakeSplunkd":
+        """Start serving on a random local port."""
+        fake = self
+
+        class Handler(_Handler):
+            """Bound request handler."""
+
+            splunkd = fake
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self) -> "FakeSplunkd":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def take_failure(self, route: str) -> bool:
+        """Consume one injected failure matching ``route``."""
+        with self.lock:
+            for pattern, remaining in self.failures.items():
+                if remaining and re.search(pattern, route):
+                    self.failures[pattern] = remaining - 1
+                    return True
+        return False
+
+    @property
+    def port(self) -> int:
+        """Listening port."""
+        return self.server.server_address[1]  # type: ignore
+
+    def login_kwargs(self, **kwargs: Any) -> Dict[str, Any]:
+        """Keyword arguments accepted by ``SplunkApi``."""
+        login: Dict[str, Any] = {
+            "host": "127.0.0.1",
+            "port": self.port,
+            "scheme": "http",
+            "username": "admin",
+            "password": "changeme",
+            "app": "search",
+            "owner": "nobody",
+            "sharing": "app",
+            "verify": False,
+        }
+        login.update(kwargs)
+        return login
+
+    def count(self, method: str = "", path: str = "") -> int:
+        """Number of requests matching a method and path fragment."""
+        with self.lock:
+            return len([_ for _ in self.requests if _[0].startswith(method) and path in _[1]])
+
+    # Search data
+
+    def rows_for(self, query: str) -> List[Dict[str, Any]]:
+        """Synthetic rows produced by a search query."""
+        found = SID_COUNT.search(query)
+        total = int(found.group(1)) if found else self.result_rows
+        return [
+            {
+                "_time": f"2023-01-01T00:00:{i % 60:02d}.000+00:00",
+                "host": f"host{i % 7}",
+                "value": str(i),
+                "mv": [f"a{i}", f"b{i}"],
+                "_raw": f"event number {i} " * 4,
+            }
+            for i in range(total)
+        ]
+
+    def messages_for(self, query: str) -> List[Dict[str, str]]:
+        """Messages produced by a search query."""
+        if "fatal" in query:
+            return [{"type": "FATAL", "text": "Fake fatal search"}]
+        if "error" in query:
+            return [{"type": "ERROR", "text": "Fake search error"}]
+        return []
+
+    def create_job(self, query: str, **params: Any) -> str:
+        """Register a new search job."""
+        sid = f"{time.time():.3f}_{uuid.uuid4().hex[:8]}"
+        with self.lock:
+            self.jobs[sid] = {
+                "sid": sid,
+                "query": query,
+                "created": time.time(),
+                "rows": self.rows_for(query),
+                "messages": self.messages_for(query),
+                "params": params,
+                "ttl": int(params.get("ttl", ["600"])[0]) if isinstance(params.get("ttl"), list) else 600,
+            }
+        return sid
+
+    def job_content(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job entity content."""
+        elapsed = time.time() - job["created"]
+        done = elapsed >= self.job_duration
+        failed = "failjob" in job["query"]
+        state = "FAILED" if failed else ("DONE" if done else "RUNNING")
+        return {
+            "sid": job["sid"],
+            "dispatchState": state,
+            "isDone": "1" if done or failed else "0",
+            "isFailed": "1" if failed else "0",
+            "doneProgress": "1.0" if done else f"{min(elapsed / max(self.job_duration, 1e-9), 0.99):.2f}",
+            "resultCount": str(len(job["rows"])) if done else "0",
+            "eventCount": str(len(job["rows"])),
+            "scanCount": str(len(job["rows"])),
+            "runDuration": f"{min(elapsed, self.job_duration):.3f}",
+            "ttl": str(job["ttl"]),
+            "search": job["query"],
+            "earliestTime": job["params"].get("earliest_time", [""])[0],
+            "latestTime": job["params"].get("latest_time", [""])[0],
+        }
+
+    # KV Store data
+
+    def collection(self, name: str, create: bool = False) -> Dict[str, Any]:
+        """KV Store collection state."""
+        with self.lock:
+            if name not in self.collections and create:
+                self.collections[name] = {"docs": {}, "accelerated_fields": {}, "fields": {}}
+            return self.collections[name]
+
+    def load_documents(self, name: str, documents: List[Dict[str, Any]]) -> None:
+        """Seed a collection with documents."""
+        coll = self.collection(name, create=True)
+        with self.lock:
+            for doc in documents:
+                doc = dict(doc)
+                doc.setdefault("_key", uuid.uuid4().hex[:24])
+                coll["docs"][doc["_key"]] = doc
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler for :class:`FakeSplunkd`."""
+
+    protocol_version = "HTTP/1.1"
+    splunkd: FakeSplunkd
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Silence request logging."""
+
+    def setup(self) -> None:
+        super().setup()
+        with self.splunkd.lock:
+            self.splunkd.connections += 1
+
+    # Helpers
+
+    def _send(self, status: int, body: Any, content_type: str = "text/xml") -> None:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        else:
+            self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, body: Any) -> None:
+        self._send(status, json.dumps(body), "application/json")
+
+    def _params(self) -> Dict[str, List[str]]:
+        params = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+        length = int(self.headers.get("Content-Length") or 0)
+        self._body = self.rfile.read(length) if length else b""
+        if self._body and "json" not in (self.headers.get("Content-Type") or ""):
+            params.update(parse_qs(self._body.decode("utf-8"), keep_blank_values=True))
+        return params
+
+    def _route(self) -> str:
+        path = unquote(urlparse(self.path).path)
+        path = re.sub(r"^/servicesNS/[^/]+/[^/]+/", "", path)
+        path = re.sub(r"^/services/", "", path)
+        return path.strip("/")
+
+    def _authorized(self) -> bool:
+        token = (self.headers.get("Authorization") or "").replace("Splunk ", "")
+        return token in self.splunkd.sessions
+
+    # HTTP verbs
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """GET."""
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """POST."""
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:  # pylint: disable=invalid-name
+        """DELETE."""
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str) -> None:
+        fake = self.splunkd
+        params = self._params()
+        route = self._route()
+        with fake.lock:
+            fake.requests.append((method, route))
+        if fake.latency:
+            time.sleep(fake.latency)
+        if fake.take_failure(route):
+            self._send(503, "<response><messages><msg type='ERROR'>Service Unavailable</msg></messages></response>")
+            return
+        if route == "auth/login":
+            self._login(params)
+            return
+        if route != "server/info" and not self._authorized():
+            self._send(401, "<response><messages><msg type='WARN'>call not properly authenticated</msg></messages></response>")
+            return
+        if route == "server/info":
+            self._send(200, _feed([_entry("server-info", "/services/server/info", {"version": fake.version})]))
+        elif route.startswith("search/jobs/export") or route.startswith("search/v2/jobs/export"):
+            self._export(params)
+        elif re.match(r"^search/(v2/)?jobs$", route):
+            self._jobs(method, params)
+        elif re.match(r"^search/(v2/)?jobs/[^/]+/results$", route):
+            self._results(route.split("/")[-2], params)
+        elif re.match(r"^search/(v2/)?jobs/[^/]+(/control)?$", route):
+            self._job(method, route.split("/")[3 if "/v2/" in route else 2], params)
+        elif route.startswith("storage/collections/config"):
+            self._collections_config(method, route, params)
+        elif route.startswith("storage/collections/data/"):
+            self._collections_data(method, route, params)
+        else:
+            self._send(404, "<response><messages><msg type='ERROR'>Not Found</msg></messages></response>")
+
+    # Endpoints
+
+    def _login(self, params: Dict[str, List[str]]) -> None:
+        fake = self.splunkd
+        if params.get("password", [""])[0] != "changeme":
+            self._send(401, "<response><messages><msg type='WARN'>Login failed</msg></messages></response>")
+            return
+        token = uuid.uuid4().hex
+        with fake.lock:
+            fake.logins += 1
+            fake.sessions[token] = time.time()
+        if params.get("output_mode", [""])[0] == "json":
+            self._json(200, {"sessionKey": token})
+            return
+        self._send(200, f"<response><sessionKey>{token}</sessionKey></response>")
+
+    def _jobs(self, method: str, params: Dict[str, List[str]]) -> None:
+        fake = self.splunkd
+        if method == "POST":
+            sid = fake.create_job(params.get("search", [""])[0], **params)
+            if params.get("output_mode", [""])[0] == "json":
+                self._json(201, {"sid": sid})
+            else:
+                self._send(201, f"<response><sid>{sid}</sid></response>")
+            return
+        with fake.lock:
+            jobs = list(fake.jobs.values())
+        if params.get("output_mode", [""])[0] == "json":
+            self._json(200, {"entry": [{"name": _["sid"], "content": fake.job_content(_)} for _ in jobs]})
+            return
+        self._send(200, _feed([_entry(_["sid"], f"/services/search/jobs/{_['sid']}", fake.job_content(_)) for _ in jobs]))
+
+    def _job(self, method: str, sid: str, params: Dict[str, List[str]]) -> None:
+        fake = self.splunkd
+        with fake.lock:
+            job = fake.jobs.get(sid)
+        if job is None:
+            self._send(404, "<response><messages><msg type='FATAL'>Unknown sid.</msg></messages></response>")
+            return
+        if method == "DELETE" or params.get("action", [""])[0] == "cancel":
+            with fake.lock:
+                fake.jobs.pop(sid, None)
+            self._send(200, "<response></response>")
+            return
+        if params.get("action", [""])[0] == "ttl":
+            job["ttl"] = int(params.get("ttl", ["600"])[0])
+            self._send(200, "<response></response>")
+            return
+        if params.get("output_mode", [""])[0] == "json":
+            self._json(200, {"entry": [{"name": sid, "content": fake.job_content(job)}]})
+            return
+        self._send(200, _entry(sid, f"/services/search/jobs/{sid}", fake.job_content(job)).replace(
+            "<entry>", '<entry xmlns="http://www.w3.org/2005/Atom" xmlns:s="http://dev.splunk.com/ns/rest">', 1
+        ))
+
+    def _results(self, sid: str, params: Dict[str, List[str]]) -> None:
+        fake = self.splunkd
+        with fake.lock:
+            job = fake.jobs.get(sid)
+        if job is None:
+            self._send(404, "<response><messages><msg type='FATAL'>Unknown sid.</msg></messages></response>")
+            return
+        offset = int(params.get("offset", ["0"])[0] or 0)
+        count = int(params.get("count", ["100"])[0] or 0)
+        rows = job["rows"]
+        post_process = params.get("search", [""])[0]
+        if post_process:
+            # Only field=value terms are supported
+            terms = [_.split("=", 1) for _ in post_process.replace("search ", "", 1).split() if "=" in _]
+            rows = [row for row in rows if all(str(row.get(k)) == v for k, v in terms)]
+        rows = rows[offset:] if count == 0 else rows[offset : offset + count]
+        fields = params.get("f") or params.get("field_list", [""])[0].split(",")
+        fields = [_ for _ in fields if _]
+        if fields:
+            rows = [{k: v for k, v in row.items() if k in fields} for row in rows]
+        names = list(rows[0]) if rows else fields
+        mode = params.get("output_mode", ["xml"])[0]
+        messages = job["messages"]
+        if mode == "json":
+            self._json(200, {"preview": False, "init_offset": offset, "messages": messages,
+                             "fields": [{"name": _} for _ in names], "results": rows})
+        elif mode == "json_rows":
+            self._json(200, {"preview": False, "init_offset": offset, "messages": messages, "fields": names,
+                             "rows": [[row.get(_) for _ in names] for row in rows]})
+        elif mode == "json_cols":
+            self._json(200, {"preview": False, "init_offset": offset, "messages": messages, "fields": names,
+                             "columns": [[row.get(_) for row in rows] for _ in names]})
+        elif mode == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+            for row in rows:
+                writer.writerow(["\n".join(v) if isinstance(v, list) else v for v in (row.get(_) for _ in names)])
+            self._send(200, buffer.getvalue(), "text/csv")
+        else:
+            body = ["<?xml version='1.0' encoding='UTF-8'?>\n<results preview='0'>"]
+            body.append("<meta><fieldOrder>" + "".join(f"<field>{escape(_)}</field>" for _ in names))
+            body.append("</fieldOrder></meta>")
+            for msg in messages:
+                body.append(f"<messages><msg type=\"{msg['type']}\">{escape(msg['text'])}</msg></messages>")
+            for index, row in enumerate(rows):
+                body.append(f"<result offset='{offset + index}'>")
+                for key, value in row.items():
+                    values = value if isinstance(value, list) else [value]
+                    texts = "".join(f"<value><text>{escape(str(_))}</text></value>" for _ in values)
+                    body.append(f"<field k='{escape(key)}'>{texts}</field>")
+                body.append("</result>")
+            body.append("</results>")
+            self._send(200, "".join(body))
+
+    def _export(self, params: Dict[str, List[str]]) -> None:
+        fake = self.splunkd
+        query = params.get("search", [""])[0]
+        rows = fake.rows_for(query)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        preview_rows = rows[: max(len(rows) // 2, 1)] if "preview" in query and rows else []
+        for index, row in enumerate(preview_rows):
+            self.wfile.write(json.dumps({"preview": True, "offset": index, "result": row}).encode() + b"\n")
+        for msg in fake.messages_for(query):
+            self.wfile.write(json.dumps({"preview": False, "messages": [msg]}).encode() + b"\n")
+        for index, row in enumerate(rows):
+            line = {"preview": False, "offset": index, "result": row}
+            if index == len(rows) - 1:
+                line["lastrow"] = True
+            self.wfile.write(json.dumps(line).encode() + b"\n")
+            self.wfile.flush()
+
+    def _collections_config(self, method: str, route: str, params: Dict[str, List[str]]) -> None:
+        fake = self.splunkd
+        parts = route.split("/")
+        if len(parts) == 3:
+            if method == "POST":
+                name = params["name"][0]
+                coll = fake.collection(name, create=True)
+                coll["accelerated_fields"].update(
+                    {k.split(".", 1)[1]: v[0] for k, v in params.items() if k.startswith("accelerated_fields.")}
+                )
+                self._collection_feed(201, [name], params)
+                return
+            with fake.lock:
+                names = list(fake.collections)
+            self._collection_feed(200, names, params)
+            return
+        name = parts[3]
+        if name not in fake.collections:
+            self._send(404, "<response><messages><msg type='ERROR'>Not Found</msg></messages></response>")
+            return
+        if method == "DELETE":
+            with fake.lock:
+                fake.collections.pop(name)
+            self._send(200, "<response></response>")
+            return
+        if method == "POST":
+            fake.collections[name]["accelerated_fields"].update(
+                {k.split(".", 1)[1]: v[0] for k, v in params.items() if k.startswith("accelerated_fields.")}
+            )
+        self._collection_feed(200, [name], params)
+
+    def _collection_feed(self, status: int, names: List[str], params: Dict[str, List[str]]) -> None:
+        if params.get("output_mode", [""])[0] == "json":
+            self._json(status, {"entry": [{"name": _, "content": self._collection_content(_)} for _ in names]})
+            return
+        self._send(status, _feed([self._collection_entry(_) for _ in names]))
+
+    def _collection_content(self, name: str) -> Dict[str, Any]:
+        coll = self.splunkd.collections[name]
+        return {f"accelerated_fields.{k}": v for k, v in coll["accelerated_fields"].items()}
+
+    def _collection_entry(self, name: str) -> str:
+        content = self._collection_content(name)
+        return _entry(name, f"/servicesNS/nobody/search/storage/collections/config/{name}", content)
+
+    def _collections_data(self, method: str, route: str, params: Dict[str, List[str]]) -> None:
+        fake = self.splunkd
+        parts = route.split("/", 4)
+        name = parts[3]
+        if name not in fake.collections:
+            self._json(404, {"messages": [{"type": "ERROR", "text": "Collection not found"}]})
+            return
+        docs: Dict[str, Dict[str, Any]] = fake.collections[name]["docs"]
+        action = parts[4] if len(parts) > 4 else ""
+        if action == "batch_save":
+            documents = json.loads(self._body)
+            if len(documents) > fake.max_documents_per_batch_save:
+                self._json(400, {"messages": [{"type": "ERROR", "text": "Request exceeds max_documents_per_batch_save"}]})
+                return
+            if any(key.startswith("$") for doc in documents for key in doc):
+                self._json(400, {"messages": [{"type": "ERROR", "text": "Field names may not start with '$'"}]})
+                return
+            keys = []
+            with fake.lock:
+                for doc in documents:
+                    doc.setdefault("_key", uuid.uuid4().hex[:24])
+                    docs[doc["_key"]] = doc
+                    keys.append(doc["_key"])
+            self._json(200, keys)
+        elif action == "batch_find":
+            queries = json.loads(self._body)
+            self._json(200, [[_ for _ in docs.values() if match_query(_, q.get("query", {}))] for q in queries])
+        elif action:
+            if method == "DELETE":
+                with fake.lock:
+                    docs.pop(action, None)
+                self._send(200, "")
+            elif method == "POST":
+                doc = json.loads(self._body)
+                doc["_key"] = action
+                with fake.lock:
+                    docs[action] = doc
+                self._json(200, {"_key": action})
+            elif action in docs:
+                self._json(200, docs[action])
+            else:
+                self._json(404, {"messages": [{"type": "ERROR", "text": "Could not find object."}]})
+        elif method == "POST":
+            doc = json.loads(self._body)
+            doc.setdefault("_key", uuid.uuid4().hex[:24])
+            with fake.lock:
+                docs[doc["_key"]] = doc
+            self._json(201, {"_key": doc["_key"]})
+        elif method == "DELETE":
+            query = json.loads(params.get("query", ["{}"])[0] or "{}")
+            with fake.lock:
+                for key in [k for k, v in docs.items() if match_query(v, query)]:
+                    docs.pop(key)
+            self._send(200, "")
+        else:
+            self._json(200, self._query(list(docs.values()), params, fake.collections[name]["accelerated_fields"]))
+
+    def _query(
+        self, docs: List[Dict[str, Any]], params: Dict[str, List[str]], accelerated: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        fake = self.splunkd
+        query = json.loads(params.get("query", ["{}"])[0] or "{}")
+        examined = len(docs)
+        docs = [_ for _ in docs if match_query(_, query)]
+        if fake.scan_cost:
+            filtered = set(query) | {k for sub in query.get("$and", []) for k in sub}
+            leading = {next(iter(json.loads(_)), None) for _ in (accelerated or {}).values()}
+            if filtered & leading:
+                examined = len(docs)
+            time.sleep(examined * fake.scan_cost)
+        for item in reversed((params.get("sort", [""])[0] or "").split(",")):
+            if not item:
+                continue
+            field, _, direction = item.partition(":")
+            docs.sort(key=lambda d, f=field: _sort_key(_lookup(d, f)), reverse=direction == "-1")
+        skip = int(params.get("skip", ["0"])[0] or 0)
+        limit = int(params.get("limit", ["0"])[0] or 0)
+        limit = min(limit, fake.max_rows_per_query) if limit else fake.max_rows_per_query
+        docs = docs[skip : skip + limit]
+        fields = [_ for _ in (params.get("fields", [""])[0] or "").split(",") if _]
+        if fields:
+            include = [_ for _ in fields if not _.startswith("-")]
+            exclude = [_[1:] for _ in fields if _.startswith("-")]
+            if include:
+                docs = [{k: v for k, v in d.items() if k in include or k == "_key"} for d in docs]
+            if exclude:
+                docs = [{k: v for k, v in d.items() if k not in exclude} for d in docs]
+        return docs
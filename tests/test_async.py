@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+
+from fake_splunkd import FakeSplunkd
+from splunksdk import SplunkSearchFatal
+
+try:
+    import aiohttp  # noqa: F401  pylint: disable=unused-import
+    from splunksdk.async_splunk import AsyncSplunkApi
+except ImportError:
+    AsyncSplunkApi = None
+
+
+@unittest.skipIf(AsyncSplunkApi is None, "aiohttp is not installed")
+class AsyncSplunkApiTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.splunkd = FakeSplunkd(result_rows=25, max_documents_per_batch_save=100).start()
+
+    def tearDown(self):
+        self.splunkd.stop()
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_search(self):
+        async def run():
+            async with AsyncSplunkApi(**self.splunkd.login_kwargs()) as client:
+                await client.Search.start_search(query="search index=main")
+                rows = [_ async for _ in client.Search.iter_results(chunk_size=10)]
+                streamed = [_ async for _ in client.Search.stream("search index=main preview count=4")]
+                await client.Search.start_search(query="search index=main failjob")
+                with self.assertRaises(SplunkSearchFatal):
+                    await client.Search.get_results()
+                return rows, streamed
+
+        rows, streamed = self.run_async(run())
+        self.assertEqual([_["value"] for _ in rows], [str(_) for _ in range(25)])
+        self.assertEqual(len(streamed), 4)
+        self.assertEqual(self.splunkd.logins, 1)
+
+    def test_iter_results_post_process(self):
+        async def run():
+            async with AsyncSplunkApi(**self.splunkd.login_kwargs()) as client:
+                await client.Search.start_search(query="search index=main")
+                return [_ async for _ in client.Search.iter_results(chunk_size=10, search="host=host3")]
+
+        rows = self.run_async(run())
+        self.assertEqual([_["value"] for _ in rows], ["3", "10", "17", "24"])
+        # The short first page ends the paging, the job resultCount does not apply
+        self.assertEqual(self.splunkd.count("GET", "/results"), 1)
+
+    def test_kvstore_bulk_upsert(self):
+        async def run():
+            async with AsyncSplunkApi(max_concurrency=3, **self.splunkd.login_kwargs()) as client:
+                await client.KVstore.create_collection("lookups")
+                results = await client.KVstore.bulk_upsert(
+                    [{"_key": f"k{_:04d}", "value": _} for _ in range(450)], batch_size=100
+                )
+                item = await client.KVstore.get_item("k0007")
+                documents = await client.KVstore.get_collection_data(page_size=200)
+                return results, item, documents
+
+        results, item, documents = self.run_async(run())
+        self.assertEqual((results.saved, results.batches), (450, 5))
+        self.assertEqual(item["value"], 7)
+        self.assertEqual(len(documents), 450)
+
+    def test_relogin_once_on_401(self):
+        async def run():
+            async with AsyncSplunkApi(**self.splunkd.login_kwargs()) as client:
+                await client.KVstore.create_collection("lookups")
+                self.splunkd.sessions.clear()
+                await asyncio.gather(*(client.KVstore.insert_data({"value": _}) for _ in range(5)))
+                return client.logins
+
+        self.assertEqual(self.run_async(run()), 2)
+        self.assertEqual(len(self.splunkd.collections["lookups"]["docs"]), 5)
+
+    def test_stream_relogin_once_on_401(self):
+        async def run():
+            async with AsyncSplunkApi(**self.splunkd.login_kwargs()) as client:
+                self.splunkd.sessions.clear()
+                streamed = [_ async for _ in client.Search.stream("search index=main preview count=4")]
+                return streamed, client.logins
+
+        streamed, logins = self.run_async(run())
+        self.assertEqual((len(streamed), logins), (4, 2))
+
+    def test_kvstore_streams_generator_input(self):
+        async def run():
+            async with AsyncSplunkApi(max_concurrency=2, **self.splunkd.login_kwargs()) as client:
+                await client.KVstore.create_collection("lookups")
+                results = await client.KVstore.bulk_upsert(
+                    ({"_key": f"k{_:04d}", "value": _} for _ in reversed(range(350))), batch_size=100
+                )
+                documents = await client.KVstore.get_collection_data(page_size=100)
+                return results, documents
+
+        results, documents = self.run_async(run())
+        self.assertEqual((results.saved, results.batches), (350, 4))
+        self.assertEqual(results.keys, [f"k{_:04d}" for _ in reversed(range(350))])
+        self.assertEqual([_["_key"] for _ in documents], sorted(f"k{_:04d}" for _ in range(350)))
+
+
+if __name__ == "__main__":
+    unittest.main()
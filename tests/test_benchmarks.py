@@ -0,0 +1,42 @@
+import importlib.util
+import os
+import unittest
+
+BENCH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "bench_splunkd.py")
+
+
+def load_bench():
+    spec = importlib.util.spec_from_file_location("bench_splunkd", BENCH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class BenchmarkTestCase(unittest.TestCase):
+
+    def test_run_and_compare(self):
+        bench = load_bench()
+        report = bench.run(rows=50, docs=30, page_size=10, iterations=2)
+        results = report["results"]
+        self.assertEqual(
+            sorted(results),
+            sorted([f"Search.get_results[{_}]" for _ in bench.RESULT_FORMATS]
+                   + ["Search.iter_results", "Search.download", "Utils.splunk_exporter", "Utils.splunk_exporter[compact]",
+                      "KVstore.get_collection_data", "KVstore.insert_data"]),
+        )
+        collection = results["KVstore.get_collection_data"]
+        self.assertEqual(collection["rows"], 30)
+        self.assertGreater(collection["throughput_rows_per_s"], 0)
+        self.assertLessEqual(collection["latency"]["p50"], collection["latency"]["max"])
+        # 30 documents in pages of 10, plus the empty page that ends the listing
+        self.assertGreaterEqual(collection["rest"]["rest GET storage/collections/data/bench"]["count"], 6)
+        self.assertEqual(results["Search.get_results[csv]"]["rows"], 50)
+
+        slower = {"results": {name: dict(value, throughput_rows_per_s=value["throughput_rows_per_s"] * 10)
+                              for name, value in results.items()}}
+        self.assertEqual(bench.compare(report, report, 0.1), [])
+        self.assertEqual(sorted(bench.compare(report, slower, 0.1)), sorted(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import threading
+import unittest
+
+from fake_splunkd import FakeSplunkd
+from splunksdk.splunk import SplunkApi
+
+
+class ConnectionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.splunkd = FakeSplunkd(result_rows=25).start()
+
+    def tearDown(self):
+        self.splunkd.stop()
+
+    def test_default_handler_has_no_pool(self):
+        client = SplunkApi(**self.splunkd.login_kwargs())
+        self.assertIsNone(client.pool_stats)
+
+    def test_pooled_handler_reuses_connections(self):
+        client = SplunkApi(pooled=True, **self.splunkd.login_kwargs())
+        client.KVstore.create_collection("lookups")
+        client.KVstore.bulk_upsert([{"_key": str(_), "value": _} for _ in range(50)], batch_size=10, workers=1)
+        client.KVstore.get_collection_data()
+        client.Search.start_search(query="search index=main")
+        client.Search.get_results()
+        stats = client.pool_stats
+        self.assertGreater(stats.requests, 10)
+        self.assertEqual(self.splunkd.connections, stats.opened)
+        self.assertLessEqual(stats.opened, 2)
+        self.assertGreater(stats.reuse_ratio, 0.8)
+
+    def test_pooled_handler_threads(self):
+        client = SplunkApi(pooled=True, pool_size=2, **self.splunkd.login_kwargs())
+        client.KVstore.create_collection("lookups")
+        errors = []
+
+        def worker(number):
+            try:
+                for index in range(10):
+                    client.KVstore.insert_data({"_key": f"{number}-{index}", "value": index})
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(err)
+
+        threads = [threading.Thread(target=worker, args=(_,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.splunkd.collections["lookups"]["docs"]), 40)
+        self.assertLessEqual(len(client.conn.http.handler.handler), 2)
+
+    def test_idle_timeout_expires_connections(self):
+        client = SplunkApi(pooled=True, idle_timeout=0, **self.splunkd.login_kwargs())
+        client.KVstore.create_collection("lookups")
+        client.KVstore.create_collection("other")
+        self.assertGreater(client.pool_stats.expired, 0)
+        self.assertEqual(client.pool_stats.reused, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
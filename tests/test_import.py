@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+# Seconds ``import splunksdk.splunk`` may take in a fresh interpreter, best of three runs
+IMPORT_BUDGET = float(os.environ.get("SPLUNKSDK_IMPORT_BUDGET", "0.3"))
+HEAVY_MODULES = ["pandas", "pyarrow", "aiohttp", "airportsdata", "pytoolkit.utilities", "pytoolkit.utils"]
+
+
+def run_python(code):
+    """Run ``code`` in a fresh interpreter and return the JSON it prints."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(_ for _ in sys.path if _))
+    output = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class ImportTestCase(unittest.TestCase):
+
+    def test_import_budget(self):
+        code = f"""
+            import json, sys, time
+            start = time.perf_counter()
+            import splunksdk.splunk
+            elapsed = time.perf_counter() - start
+            print(json.dumps({{"elapsed": elapsed, "loaded": [_ for _ in {HEAVY_MODULES!r} if _ in sys.modules]}}))
+        """
+        runs = [run_python(code) for _ in range(3)]
+        self.assertEqual(runs[0]["loaded"], [])
+        self.assertLess(min(_["elapsed"] for _ in runs), IMPORT_BUDGET)
+
+    def test_pandas_loaded_on_first_dataframe(self):
+        result = run_python("""
+            import json, sys
+            from fake_splunkd import FakeSplunkd
+            import splunksdk
+
+            with FakeSplunkd(result_rows=5) as fake:
+                client = splunksdk.SplunkApi(**fake.login_kwargs())
+                client.KVstore.create_collection("lookups")
+                client.KVstore.insert_data({"_key": "1", "value": 1})
+                client.KVstore.get_collection_data()
+                client.Search.start_search(query="search index=main")
+                client.Search.get_results(wait=True)
+                before = "pandas" in sys.modules
+                rows = len(client.Search.csv_results)
+                client.watcher.stop()
+            print(json.dumps({"before": before, "after": "pandas" in sys.modules, "rows": rows}))
+        """)
+        self.assertEqual(result, {"before": False, "after": True, "rows": 5})
+
+    def test_lazy_attributes(self):
+        import splunksdk
+        from splunksdk.splunk import SplunkApi
+
+        self.assertIs(splunksdk.SplunkApi, SplunkApi)
+        self.assertIn("Utils", dir(splunksdk))
+        with self.assertRaises(AttributeError):
+            splunksdk.NotAnAttribute  # pylint: disable=pointless-statement
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import logging
+import unittest
+
+from fake_splunkd import FakeSplunkd
+from splunksdk.splunk import SplunkApi
+from splunksdk.utils.instrument import LoggingSink, PrometheusExporter, operation_name
+from splunksdk.utils.splunk_utils import Utils
+
+
+class InstrumentTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.splunkd = FakeSplunkd(result_rows=25, job_duration=0.3).start()
+        self.client = SplunkApi(**self.splunkd.login_kwargs())
+
+    def tearDown(self):
+        self.splunkd.stop()
+
+    def test_operation_name(self):
+        self.assertEqual(
+            operation_name("GET", "http://127.0.0.1:8089/servicesNS/nobody/search/search/v2/jobs/1.2_ab/results?count=0"),
+            "GET search/v2/jobs/{sid}/results",
+        )
+        self.assertEqual(
+            operation_name("POST", "https://h/servicesNS/nobody/search/storage/collections/data/lookups/k1"),
+            "POST storage/collections/data/lookups/{key}",
+        )
+
+    def test_rest_job_and_parse_events(self):
+        events = []
+        self.client.instrument(events.append)
+        self.client.Search.start_search(query="search index=main")
+        self.client.Search.get_results(wait=True)
+        self.assertEqual(len(self.client.Search.csv_results), 25)
+        self.assertEqual(len(self.client.Search.search_resp.json_response), 25)
+
+        rest = [_ for _ in events if _.kind == "rest"]
+        results = [_ for _ in rest if _.name == "POST search/v2/jobs/{sid}/results"]
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(_.nbytes > 0 and _.duration > 0 for _ in results))
+        self.assertEqual(results[0].attributes["status"], 200)
+
+        states = [_.name for _ in events if _.kind == "job"]
+        self.assertEqual(states[-1], "DONE")
+        self.assertEqual(states.count("DONE"), 1)
+        done = [_ for _ in events if _.kind == "job"][-1]
+        self.assertEqual(done.attributes["scanCount"], 25)
+
+        parse = {_.name: _ for _ in events if _.kind == "parse"}
+        self.assertEqual(parse["splunk_exporter"].attributes["rows"], 25)
+        self.assertEqual(parse["to_csv"].attributes["rows"], 25)
+
+    def test_login_and_parse_events_are_per_client(self):
+        events, others = [], []
+        client = SplunkApi(sinks=[events.append], **self.splunkd.login_kwargs())
+        self.client.instrument(others.append)
+        self.assertIn("POST auth/login", [_.name for _ in events if _.kind == "rest"])
+
+        client.Search.start_search(query="search index=main")
+        client.Search.get_results(wait=True)
+        self.assertEqual(len(client.Search.csv_results), 25)
+        self.assertIn("to_csv", [_.name for _ in events if _.kind == "parse"])
+        self.assertEqual(others, [])
+        # Conversions outside of a client are only reported inside activate
+        Utils.to_csv(data=[{"_key": "1"}])
+        self.assertEqual(len([_ for _ in others if _.kind == "parse"]), 0)
+        with self.client.instrumentation.activate():
+            Utils.to_csv(data=[{"_key": "1"}])
+        self.assertEqual([_.name for _ in others if _.kind == "parse"], ["to_csv"])
+        client.watcher.stop()
+
+    def test_summary_and_prometheus(self):
+        exporter = self.client.instrument(PrometheusExporter())
+        self.client.KVstore.create_collection("lookups")
+        with self.client.summary() as summary:
+            self.client.KVstore.bulk_upsert([{"_key": str(_)} for _ in range(20)], batch_size=10, workers=1)
+        report = summary.report()
+        self.assertEqual(report["rest POST storage/collections/data/lookups/batch_save"]["count"], 2)
+        self.assertIn("p95", str(summary))
+        # The summary only saw the block
+        self.assertNotIn("rest POST storage/collections/config", report)
+
+        text = exporter.render()
+        self.assertIn('splunksdk_rest_seconds_count{operation="POST storage/collections/data/lookups/batch_save"} 2', text)
+        self.assertIn("# TYPE splunksdk_rest_bytes_total counter", text)
+
+    def test_logging_sink_and_idle(self):
+        with self.assertLogs("splunksdk", level=logging.DEBUG) as logs:
+            sink = self.client.instrument(LoggingSink())
+            self.client.KVstore.create_collection("lookups")
+        self.assertTrue(any("rest POST storage/collections/config" in _ for _ in logs.output))
+        self.client.instrumentation.remove_sink(sink)
+        self.assertFalse(self.client.instrumentation.enabled)
+        # Conversions are not measured without sinks
+        self.assertEqual(len(Utils.to_csv(data=[{"_key": "1", "a": 1}])), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
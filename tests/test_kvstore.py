@@ -0,0 +1,184 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fake_splunkd import FakeSplunkd
+from splunksdk.splunk import SplunkApi
+from splunksdk.utils.advisor import QueryShape
+from splunksdk.utils.sync import KVstoreSync
+
+
+class KVstoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.splunkd = FakeSplunkd(max_documents_per_batch_save=100).start()
+        self.client = SplunkApi(**self.splunkd.login_kwargs())
+        self.client.KVstore.create_collection("lookups")
+
+    def tearDown(self):
+        self.splunkd.stop()
+
+    def documents(self, count):
+        return [{"_key": f"k{_:05d}", "value": _, "nested": {"even": _ % 2 == 0}} for _ in range(count)]
+
+    def test_bulk_upsert(self):
+        results = self.client.KVstore.bulk_upsert(iter(self.documents(450)), batch_size=100, workers=3)
+        self.assertEqual(results.saved, 450)
+        self.assertEqual(results.batches, 5)
+        self.assertEqual(results.keys, [f"k{_:05d}" for _ in range(450)])
+        self.assertEqual(len(self.splunkd.collections["lookups"]["docs"]), 450)
+        self.assertEqual(self.splunkd.count("POST", "batch_save"), 5)
+
+    def test_bulk_upsert_isolates_rejected_documents(self):
+        documents = self.documents(10)
+        documents[3]["$bad"] = 1
+        results = self.client.KVstore.bulk_upsert(documents, batch_size=250, retries=0)
+        self.assertEqual(results.saved, 9)
+        self.assertEqual([(_["index"], _["_key"]) for _ in results.errors], [(3, "k00003")])
+        self.assertNotIn("k00003", results.keys)
+
+    def test_iter_collection_data_pages_past_max_rows(self):
+        self.splunkd.max_rows_per_query = 50
+        self.splunkd.load_documents("lookups", self.documents(230))
+        pages = list(self.client.KVstore.iter_collection_data(page_size=50, batch=True))
+        self.assertEqual([len(_) for _ in pages], [50, 50, 50, 50, 30])
+        self.client.KVstore.get_collection_data(page_size=50, workers=3)
+        self.assertEqual([_["_key"] for _ in self.client.KVstore.raw_data], [f"k{_:05d}" for _ in range(230)])
+        self.assertEqual(self.client.KVstore.flat_data[1]["nested.even"], False)
+
+    def test_iter_collection_data_query_keys(self):
+        self.splunkd.load_documents("lookups", self.documents(100))
+        docs = list(
+            self.client.KVstore.iter_collection_data(
+                page_size=7, skip=5, limit=20, sort="value:-1", fields="value", flatten=True,
+                query={"nested.even": True},
+            )
+        )
+        self.assertEqual([_["value"] for _ in docs], list(range(88, 48, -2)))
+        self.assertEqual(set(docs[0]), {"_key", "value"})
+        with self.assertRaises(ValueError):
+            next(self.client.KVstore.iter_collection_data(flatten=True, nested=True))
+
+    def test_cache_get_item_and_get_items(self):
+        self.splunkd.load_documents("lookups", self.documents(20))
+        cache = self.client.KVstore.enable_cache(max_size=10, ttl=60)
+        self.assertEqual(self.client.KVstore.get_item("k00001")["value"], 1)
+        self.assertEqual(self.client.KVstore.get_item("k00001")["value"], 1)
+        self.assertEqual(self.splunkd.count("GET", "data/lookups/k00001"), 1)
+
+        documents = self.client.KVstore.get_items(["k00001", "k00002", "k00003", "missing"])
+        self.assertEqual(sorted(documents), ["k00001", "k00002", "k00003"])
+        self.assertEqual(self.splunkd.count("GET", "data/lookups"), 2)
+        self.assertEqual(cache.stats["hits"], 2)
+
+        # Changing a returned document leaves the cached copy alone
+        self.client.KVstore.get_item("k00001")["value"] = -1
+        self.client.KVstore.get_items(["k00003"])["k00003"]["value"] = -3
+        self.assertEqual(self.client.KVstore.get_item("k00001")["value"], 1)
+        self.assertEqual(self.client.KVstore.get_items(["k00003"])["k00003"]["value"], 3)
+
+        self.client.KVstore.update_data("k00002", {"value": 200})
+        self.assertEqual(self.client.KVstore.get_item("k00002")["value"], 200)
+        self.assertEqual(self.client.KVstore.cache_stats["misses"], 5)
+
+    def test_incremental_sync(self):
+        self.splunkd.load_documents("lookups", [dict(_, updated=_["value"]) for _ in self.documents(30)])
+        path = os.path.join(tempfile.mkdtemp(), "lookups.db")
+        mirror = self.client.KVstore.sync(path, modified_field="updated")
+        self.assertEqual((mirror.report.fetched, len(mirror.documents)), (30, 30))
+
+        self.splunkd.load_documents("lookups", [{"_key": "k00002", "value": -2, "updated": 100}])
+        self.splunkd.collections["lookups"]["docs"].pop("k00005")
+        statements = []
+        connect = KVstoreSync._connect
+
+        def traced(mirror):
+            db = connect(mirror)
+            db.set_trace_callback(statements.append)
+            return db
+
+        with mock.patch.object(KVstoreSync, "_connect", traced):
+            mirror = self.client.KVstore.sync(path, modified_field="updated", reconcile=True)
+        # Only the documents fetched by the delta are written
+        self.assertEqual(len([_ for _ in statements if _.startswith("INSERT OR REPLACE INTO documents")]), 2)
+        # The document at the previous watermark is fetched again
+        self.assertEqual((mirror.report.fetched, mirror.report.deleted, mirror.report.watermark), (2, 1, 100))
+        self.assertEqual(mirror.documents["k00002"]["value"], -2)
+        self.assertNotIn("k00005", mirror.documents)
+        self.assertEqual(mirror.state.syncs, 2)
+        reloaded = KVstoreSync(self.client.KVstore, path, modified_field="updated")
+        self.assertEqual((reloaded.documents, reloaded.state.watermark), (mirror.documents, 100))
+
+    def test_collection_index_is_cached(self):
+        def listings():
+            return self.splunkd.requests.count(("GET", "storage/collections/config"))
+
+        before = listings()
+        for name in ["a", "b", "c"]:
+            self.client.KVstore.create_collection(name)
+        self.client.KVstore.set_kvstore("b")
+        self.client.KVstore.delete_collection("c")
+        self.assertEqual(self.client.KVstore.collections, ["lookups", "a", "b"])
+        self.assertEqual(listings() - before, 0)
+
+        # Collections created elsewhere are found by a refresh on a miss
+        self.splunkd.collection("elsewhere", create=True)
+        self.client.KVstore.set_kvstore("elsewhere")
+        self.assertIn("elsewhere", self.client.KVstore.collections)
+        self.assertEqual(listings() - before, 1)
+
+    def test_query_shapes(self):
+        shape = QueryShape.from_query(
+            "lookups",
+            query=json.dumps({"$and": [{"env": "prod"}, {"ts": {"$gt": 5}}, {"host": {"$in": ["a", "b"]}}]}),
+            sort="value:-1",
+        )
+        self.assertEqual(str(shape), "lookups eq(env,host) sort(value:-1) range(ts)")
+        self.assertEqual(shape.accelerated_fields(), {"env": 1, "host": 1, "value": -1, "ts": 1})
+        self.assertEqual(shape, QueryShape.from_query("lookups", {"$and": [{"env": "dev"}, {"ts": {"$gt": 9}},
+                                                                          {"host": {"$in": ["c"]}}]}, "value:-1"))
+        self.assertEqual(QueryShape.from_query("lookups", {"_key": "k1"}).accelerated_fields(), {})
+
+    def test_or_query_shapes_get_one_index_per_branch(self):
+        shape = QueryShape.from_query("lookups", {"$or": [{"a": 1}, {"b": 2}]})
+        self.assertEqual(str(shape), "lookups or(eq(a) | eq(b))")
+        self.assertEqual(shape.accelerated_fields(), {})
+        self.assertEqual(shape.definitions(), [{"a": 1}, {"b": 1}])
+        scoped = QueryShape.from_query("lookups", {"env": "prod", "$or": [{"a": 1}, {"ts": {"$gt": 5}}]}, "value")
+        self.assertEqual(scoped.definitions(), [{"a": 1, "env": 1, "value": 1}, {"env": 1, "value": 1, "ts": 1}])
+
+        advisor = self.client.KVstore.enable_advisor()
+        self.client.KVstore.get_collection_data(query={"$or": [{"a": 1}, {"b": 2}]})
+        self.assertEqual(advisor.recommend("lookups"), {"accel_a": {"a": 1}, "accel_b": {"b": 1}})
+
+    def test_advisor_recommends_and_applies_accelerated_fields(self):
+        self.splunkd.load_documents("lookups", self.documents(300))
+        self.splunkd.scan_cost = 0.0001
+        advisor = self.client.KVstore.enable_advisor()
+        self.client.KVstore.get_collection_data(query={"nested.even": True, "value": {"$lt": 50}}, sort="value")
+        self.client.KVstore.get_collection_data(query={"nested.even": False})
+        self.client.KVstore.get_item("k00001")
+        self.assertEqual(len(advisor.shapes("lookups")), 3)
+        # The shorter definition is served by the longer one
+        self.assertEqual(
+            self.client.KVstore.recommend_accelerated_fields(),
+            {"accel_nested_even_value": {"nested.even": 1, "value": 1}},
+        )
+
+        self.assertEqual(list(self.client.KVstore.apply_accelerated_fields(replay=2)), ["accel_nested_even_value"])
+        self.assertEqual(
+            json.loads(self.splunkd.collections["lookups"]["accelerated_fields"]["accel_nested_even_value"]),
+            {"nested.even": 1, "value": 1},
+        )
+        self.assertEqual(self.client.KVstore.recommend_accelerated_fields(), {})
+        report = {_["shape"]: _ for _ in advisor.report("lookups")}
+        ranged = report["lookups eq(nested.even) sort(value:1) range(value)"]
+        self.assertEqual((ranged["before"]["count"], ranged["after"]["count"]), (3, 2))
+        self.assertGreater(ranged["speedup"], 1)
+        self.assertIn("speedup", str(advisor))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,288 @@
+import csv
+import gzip
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from splunklib.binding import HTTPError
+
+from fake_splunkd import FakeSplunkd
+from splunksdk import SplunkSearchError, SplunkSearchFatal
+from splunksdk.splunk import SplunkApi
+from splunksdk.utils.pool import SearchPool
+
+
+class SearchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.splunkd = FakeSplunkd(result_rows=25).start()
+        self.client = SplunkApi(**self.splunkd.login_kwargs())
+
+    def tearDown(self):
+        self.splunkd.stop()
+
+    def test_get_results_lazy_formats(self):
+        self.client.Search.start_search(query="search index=main")
+        self.assertTrue(self.client.Search.get_results())
+        # One row is enough to check the search for errors
+        self.assertEqual(self.splunkd.count("POST", "/results"), 1)
+
+        self.assertEqual(self.client.Search.csv_results.shape, (25, 5))
+        self.assertEqual(len(self.client.Search.csv_results), 25)
+        self.assertEqual(self.splunkd.count("POST", "/results"), 2)
+
+        self.assertEqual(len(self.client.Search.json_rows_results["rows"]), 25)
+        self.assertEqual(self.splunkd.count("POST", "/results"), 3)
+        self.assertEqual(self.client.Search.xml_results[1]["value"], "1")
+        self.assertEqual(self.splunkd.count("POST", "/results"), 4)
+
+        self.assertEqual(len(self.client.Search.search_resp.json_response), 25)
+        self.assertIs(self.client.Search.search_resp, self.client.Search.search_resp)
+        self.assertEqual(self.splunkd.count("POST", "/results"), 5)
+
+    def test_get_results_compact(self):
+        self.client.Search.start_search(query="search index=main")
+        self.client.Search.get_results(compact=True)
+        table = self.client.Search.search_resp.json_response
+        self.assertEqual(len(table), 25)
+        self.assertEqual([_["value"] for _ in table], [str(_) for _ in range(25)])
+        self.assertEqual(table.to_dataframe().shape, (25, 5))
+
+    def test_get_results_memory_budget(self):
+        self.client.Search.start_search(query="search index=main")
+        self.client.Search.get_results(memory_budget=1)
+        self.assertIsNotNone(self.client.Search.csv_results)
+        self.assertIsNotNone(self.client.Search.csv_results)
+        # Formats larger than the budget are never cached
+        self.assertEqual(self.splunkd.count("POST", "/results"), 3)
+        self.assertEqual(self.client.Search.results.nbytes, 0)
+
+    def test_iter_results_pages(self):
+        self.client.Search.start_search(query="search index=main")
+        rows = list(self.client.Search.iter_results(chunk_size=10))
+        self.assertEqual([_["value"] for _ in rows], [str(_) for _ in range(25)])
+        self.assertEqual(self.splunkd.count("POST", "/results"), 3)
+
+        pages = list(self.client.Search.iter_results(chunk_size=10, batch=True, offset=5))
+        self.assertEqual([len(_) for _ in pages], [10, 10])
+
+    def test_iter_results_raises_search_error(self):
+        self.client.Search.start_search(query="search index=main error")
+        with self.assertRaises(SplunkSearchError):
+            next(self.client.Search.iter_results(chunk_size=10))
+
+    def test_download_windows(self):
+        self.client.Search.start_search(query="search index=main count=95")
+        self.client.Search.get_results(wait=True)
+        requests = self.splunkd.count("POST", "/results")
+        rows = list(self.client.Search.download(window_size=10, workers=3))
+        self.assertEqual([_["value"] for _ in rows], [str(_) for _ in range(95)])
+        self.assertEqual(self.splunkd.count("POST", "/results") - requests, 10)
+
+        pages = list(self.client.Search.download(window_size=10, workers=3, ordered=False, batch=True, offset=5, count=30))
+        self.assertEqual(sorted(len(_) for _ in pages), [10, 10, 10])
+        self.assertEqual(sorted(int(row["value"]) for _ in pages for row in _), list(range(5, 35)))
+
+        rows = list(self.client.Search.download(window_size=10, search="host=host3", fields="value"))
+        self.assertEqual(rows[:2], [{"value": "3"}, {"value": "10"}])
+
+    def test_download_retries_failed_windows(self):
+        self.client.Search.start_search(query="search index=main")
+        self.client.Search.get_results(wait=True)
+        self.splunkd.failures[r"/results$"] = 2
+        rows = list(self.client.Search.download(window_size=10, workers=2))
+        self.assertEqual([_["value"] for _ in rows], [str(_) for _ in range(25)])
+        self.assertEqual(self.splunkd.failures[r"/results$"], 0)
+
+        self.splunkd.failures[r"/results$"] = 5
+        with self.assertRaises(HTTPError):
+            list(self.client.Search.download(window_size=10, workers=1, retries=1))
+
+    def test_watcher_batches_job_polling(self):
+        self.splunkd.job_duration = 0.2
+        self.client.watcher.min_interval = 0.05
+        jobs = [self.client.conn.jobs.create(f"search index=main n={_}") for _ in range(20)]
+        futures = [self.client.watcher.watch(_) for _ in jobs]
+        self.assertTrue(all(_.result(timeout=10)["isDone"] == "1" for _ in futures))
+        self.assertLess(self.splunkd.count("GET", "search/v2/jobs"), len(jobs))
+        self.client.watcher.stop()
+
+    def test_get_results_wait(self):
+        self.splunkd.job_duration = 0.2
+        self.client.watcher.min_interval = 0.05
+        self.client.Search.start_search(query="search index=main")
+        self.assertTrue(self.client.Search.get_results(wait=True, timeout=10))
+        self.client.watcher.stop()
+
+    def test_run_many_isolates_errors(self):
+        self.client.watcher.min_interval = 0.05
+        tasks = self.client.Search.run_many(
+            ["search index=main count=3", "search index=main fatal", {"query": "search index=main count=5"}],
+            max_concurrency=2,
+        )
+        self.assertEqual([_.status for _ in tasks], ["DONE", "FAILED", "DONE"])
+        self.assertEqual([len(_.results) for _ in tasks], [3, 0, 5])
+        self.assertIsInstance(tasks[1].error, SplunkSearchFatal)
+        self.assertTrue(all(_.duration is not None for _ in tasks))
+        self.client.watcher.stop()
+
+    def test_search_pool_cancels_stuck_jobs(self):
+        self.splunkd.job_duration = 30
+        self.client.watcher.min_interval = 0.05
+        tasks = self.client.Search.run_many(["search index=main"], max_concurrency=1, timeout=0.3)
+        self.assertEqual(tasks[0].status, "FAILED")
+        self.assertIsInstance(tasks[0].error, TimeoutError)
+        self.assertNotIn(tasks[0].sid, self.splunkd.jobs)
+
+        pool = SearchPool(self.client.Search, max_concurrency=1, timeout=None)
+        running, queued = pool.submit("search index=main"), pool.submit("search index=main count=3")
+        while not self.splunkd.jobs:
+            time.sleep(0.01)
+        pool.shutdown(cancel=True)
+        self.assertEqual([running.result().status, queued.result().status], ["CANCELLED", "CANCELLED"])
+        self.assertIsNone(queued.result().sid)
+        self.assertEqual(self.splunkd.jobs, {})
+        self.client.watcher.stop()
+
+    def test_cancel_job_clears_results(self):
+        self.client.Search.start_search(query="search index=main")
+        self.client.Search.get_results()
+        self.client.Search.cancel_job()
+        self.assertIsNone(self.client.Search.csv_results)
+        self.assertIsNone(self.client.Search.xml_results)
+
+    def test_stream(self):
+        self.client.Search.add_query(search_query="search index=main count=3")
+        rows = list(self.client.Search.stream("search index=main preview count=10"))
+        # The streamed query does not replace the one a later start_search runs
+        self.assertEqual(self.client.Search.search_query, "search index=main count=3")
+        self.assertEqual([_["value"] for _ in rows], [str(_) for _ in range(10)])
+        rows = list(self.client.Search.stream("search index=main preview count=10", include_preview=True))
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(self.splunkd.count("POST", "search/v2/jobs"), self.splunkd.count("POST", "/export"))
+        with self.assertRaises(SplunkSearchFatal):
+            list(self.client.Search.stream("search index=main fatal"))
+
+    def test_get_results_shapes_results_on_server(self):
+        handle = self.client.Search.start_search(query="search index=main count=150")
+        handle.get_results()
+        self.assertEqual(len(handle.csv_results), 150)
+        full = handle.results.nbytes
+        handle.get_results(fields=["host", "value"], count=20, offset=10)
+        self.assertEqual(list(handle.csv_results.columns), ["host", "value"])
+        self.assertEqual(handle.csv_results["value"].tolist(), list(range(10, 30)))
+        self.assertLess(handle.results.nbytes * 10, full)
+        rows = list(handle.iter_results(chunk_size=4, search="host=host3", fields="value"))
+        self.assertEqual(rows[:2], [{"value": "3"}, {"value": "10"}])
+        self.assertEqual(len(list(handle.iter_results(chunk_size=7, offset=5, count=16))), 16)
+
+    def test_start_search_returns_independent_handles(self):
+        first = self.client.Search.start_search(query="search index=main count=3")
+        second = self.client.Search.start_search(query="search index=main count=7")
+        self.assertNotEqual(first.sid, second.sid)
+        self.assertIs(self.client.Search.handle, second)
+        self.assertTrue(first.get_results())
+        self.assertEqual(len(first.csv_results), 3)
+        self.assertIsNone(second.results)
+        self.assertEqual(len(list(second.iter_results())), 7)
+
+    def test_history_is_bounded_per_instance(self):
+        other = SplunkApi(**self.splunkd.login_kwargs())
+        self.client.Search.history_size = 3
+        handles = [self.client.Search.start_search(query="search index=main n=0")]
+        handles[0].get_results()
+        self.assertIsNotNone(handles[0].results)
+        handles += [self.client.Search.start_search(query=f"search index=main n={_}") for _ in range(1, 5)]
+        self.assertEqual([_.sid for _ in self.client.Search.history], [_.sid for _ in handles[2:]])
+        self.assertIsNone(handles[0].results)
+        self.assertEqual(len(self.client.Search.raw_results), 3)
+        self.assertEqual(other.Search.history, [])
+
+    def test_search_shared_by_threads(self):
+        def run(count):
+            self.client.Search.start_search(query=f"search index=main count={count}")
+            self.client.Search.get_results()
+            return len(self.client.Search.csv_results)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            counts = list(executor.map(run, range(1, 9)))
+        self.assertEqual(counts, list(range(1, 9)))
+        self.assertIsNone(self.client.Search.handle)
+
+    def test_job_cache_reuses_sid(self):
+        self.client.Search.enable_job_cache(max_staleness=60)
+        first = self.client.Search.start_search(query="search  index=main   count=5", earliest_time="-1h")
+        second = self.client.Search.start_search(query="search index=main count=5", earliest_time="-1h")
+        other_range = self.client.Search.start_search(query="search index=main count=5", earliest_time="-2h")
+        bypassed = self.client.Search.start_search(
+            query="search index=main count=5", earliest_time="-1h", bypass_cache=True
+        )
+        self.assertEqual(first.sid, second.sid)
+        self.assertTrue(second.reused)
+        self.assertNotEqual(first.sid, other_range.sid)
+        self.assertNotEqual(first.sid, bypassed.sid)
+        self.assertEqual(len(self.splunkd.jobs), 3)
+
+        self.splunkd.jobs.pop(bypassed.sid)
+        expired = self.client.Search.start_search(query="search index=main count=5", earliest_time="-1h")
+        self.assertFalse(expired.reused)
+        stale = self.client.Search.start_search(
+            query="search index=main count=5", earliest_time="-1h", max_staleness=0
+        )
+        self.assertNotEqual(stale.sid, expired.sid)
+
+    def test_job_cache_counts_each_lookup_once(self):
+        cache = self.client.Search.enable_job_cache(max_staleness=60)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: cache.record(_ % 3 == 0), range(3000)))
+        self.assertEqual((cache.stats["hits"], cache.stats["misses"]), (1000, 2000))
+
+    def test_job_cache_on_disk(self):
+        self.client.watcher.min_interval = 0.05
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = self.client.Search.enable_job_cache(path=tmp, max_bytes=10**6)
+            rows = self.client.Search.fetch("search index=main count=40")
+            self.assertEqual(self.client.Search.fetch("search index=main count=40"), rows)
+            self.assertEqual(len(self.splunkd.jobs), 1)
+            self.assertEqual((cache.stats["hits"], cache.stats["misses"]), (1, 1))
+            self.assertEqual(len(self.client.Search.fetch("search index=main count=40", bypass_cache=True)), 40)
+            self.assertEqual(len(self.splunkd.jobs), 2)
+
+            cache.max_bytes = 1
+            self.client.Search.fetch("search index=main count=3")
+            self.assertEqual(os.listdir(tmp), [])
+            self.assertGreater(cache.evictions, 0)
+        self.client.watcher.stop()
+
+    def test_export_formats(self):
+        self.client.Search.start_search(query="search index=main")
+        with tempfile.TemporaryDirectory() as tmp:
+            exporter = self.client.Search.export(f"{tmp}/results.csv.gz", export_format="csv.gz", chunk_size=10)
+            self.assertEqual((exporter.rows, exporter.batches), (25, 3))
+            with gzip.open(f"{tmp}/results.csv.gz", "rt") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[1]["mv"], "a1\nb1")
+            if pa is None:
+                return
+            self.client.Search.export(f"{tmp}/results.parquet", chunk_size=10)
+            parquet = pq.ParquetFile(f"{tmp}/results.parquet")
+            self.assertEqual(parquet.metadata.num_row_groups, 3)
+            table = parquet.read()
+            self.assertEqual(table.num_rows, 25)
+            self.assertEqual(table.column("mv")[0].as_py(), ["a0", "b0"])
+            self.client.Search.export(f"{tmp}/results.arrow", export_format="arrow", chunk_size=10)
+            with pa.ipc.open_file(f"{tmp}/results.arrow") as reader:
+                self.assertEqual(reader.num_record_batches, 3)
+                self.assertEqual(reader.schema.field("mv").type, pa.list_(pa.string()))
+
+
+if __name__ == "__main__":
+    unittest.main()
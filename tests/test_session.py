@@ -0,0 +1,96 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from fake_splunkd import FakeSplunkd
+from splunksdk import OperationError
+from splunksdk.splunk import SplunkApi
+from splunksdk.utils.session import FileSessionBackend, SessionCache
+
+
+class SessionCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.splunkd = FakeSplunkd().start()
+
+    def tearDown(self):
+        self.splunkd.stop()
+
+    def test_memory_cache_reuses_token(self):
+        cache = SessionCache()
+        clients = [SplunkApi(session_cache=cache, **self.splunkd.login_kwargs()) for _ in range(5)]
+        self.assertEqual(self.splunkd.logins, 1)
+        self.assertEqual(cache.hits, 4)
+        self.assertEqual(len({_.conn.token for _ in clients}), 1)
+        other = dict(self.splunkd.login_kwargs(), app="lookup_editor")
+        SplunkApi(session_cache=cache, **other)
+        self.assertEqual(self.splunkd.logins, 2)
+
+    def test_file_cache_shared_between_caches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sessions.json")
+            SplunkApi(session_cache=path, **self.splunkd.login_kwargs())
+            client = SplunkApi(session_cache=SessionCache(FileSessionBackend(path)), **self.splunkd.login_kwargs())
+            client.KVstore.create_collection("lookups")
+            self.assertEqual(self.splunkd.logins, 1)
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "POSIX file ownership")
+    def test_file_cache_ignores_untrusted_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sessions.json")
+            backend = FileSessionBackend(path)
+            backend.set("identity", "token")
+            self.assertEqual(backend.get("identity"), "token")
+            os.chmod(path, 0o644)
+            self.assertIsNone(backend.get("identity"))
+            os.chmod(path, 0o600)
+            os.symlink(path, os.path.join(tmp, "link.json"))
+            self.assertIsNone(FileSessionBackend(os.path.join(tmp, "link.json")).get("identity"))
+            with open(f"{path}.lock", "w", encoding="utf-8"):
+                pass
+            os.chmod(f"{path}.lock", 0o666)
+            with self.assertRaises(OperationError):
+                with backend.lock("identity"):
+                    pass
+
+    def test_default_file_is_per_user(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            original = os.environ.get("XDG_CACHE_HOME")
+            os.environ["XDG_CACHE_HOME"] = tmp
+            try:
+                path = FileSessionBackend().path
+            finally:
+                if original is None:
+                    os.environ.pop("XDG_CACHE_HOME")
+                else:
+                    os.environ["XDG_CACHE_HOME"] = original
+            self.assertEqual(path, os.path.join(tmp, "splunksdk", "sessions.json"))
+            self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o777, 0o700)
+
+    def test_refresh_on_401_logs_in_once(self):
+        self.splunkd.latency = 0.05
+        cache = SessionCache()
+        clients = [SplunkApi(session_cache=cache, **self.splunkd.login_kwargs()) for _ in range(4)]
+        self.splunkd.sessions.clear()
+        errors = []
+
+        def worker(client):
+            try:
+                client.KVstore.create_collection(f"c{id(client)}")
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(err)
+
+        threads = [threading.Thread(target=worker, args=(_,)) for _ in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.splunkd.logins, 2)
+        self.assertEqual(cache.logins, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
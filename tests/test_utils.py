@@ -0,0 +1,142 @@
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from splunksdk.utils import search, splunk_utils
+from splunksdk.utils.search import ResultTable
+from splunksdk.utils.splunk_utils import Utils
+
+JSON_ROWS = {
+    "preview": False,
+    "init_offset": 0,
+    "messages": [{"type": "INFO", "text": 'not "rows":[0]'}],
+    "fields": ["count", "rows"],
+    "rows": [[1, "x"], [22.5, {"k": [1, 2]}], [123456789, None]],
+}
+
+
+class UtilsTestCase(unittest.TestCase):
+
+    def test_iter_json_streams_rows(self):
+        stream = io.BytesIO(json.dumps(JSON_ROWS).encode())
+        original = splunk_utils.STREAM_CHUNK_SIZE
+        splunk_utils.STREAM_CHUNK_SIZE = 5
+        try:
+            self.assertEqual(list(Utils.iter_json(stream, output_mode="json_rows")), JSON_ROWS["rows"])
+        finally:
+            splunk_utils.STREAM_CHUNK_SIZE = original
+
+    def test_to_json_without_temp_files(self):
+        before = set(os.listdir(tempfile.gettempdir()))
+        values = Utils.to_json(service=io.BytesIO(json.dumps(JSON_ROWS).encode()), output_mode="json_rows")
+        self.assertEqual(values, JSON_ROWS)
+        values = Utils.to_json(service=io.BytesIO(json.dumps(JSON_ROWS).encode()), spool_max_size=16)
+        self.assertEqual(values, JSON_ROWS)
+        self.assertEqual(set(os.listdir(tempfile.gettempdir())) - before, set())
+
+    def test_iter_xml(self):
+        body = (
+            b"<results preview='0'><messages><msg type='WARN'>careful</msg></messages>"
+            b"<result offset='0'><field k='host'><value><text>h1</text></value></field>"
+            b"<field k='mv'><value><text>a</text></value><value><text>b</text></value></field>"
+            b"<field k='_raw'><v xml:space='preserve' trunc='0'>raw <sg>event</sg></v></field></result></results>"
+        )
+        message = {}
+        rows = list(Utils.iter_xml(io.BytesIO(body), message=message))
+        self.assertEqual(rows, [{"host": "h1", "mv": ["a", "b"], "_raw": "raw event"}])
+        self.assertEqual(message, {"WARN": "careful"})
+        self.assertEqual(Utils.to_xml(service=io.BytesIO(body), spool_max_size=16), rows)
+
+    def test_to_json_streams_from_spool(self):
+        columns = {"fields": ["a", "b"], "columns": [[1, 2], ["é", "x"]]}
+        original = splunk_utils.STREAM_CHUNK_SIZE
+        splunk_utils.STREAM_CHUNK_SIZE = 3
+        try:
+            values = Utils.to_json(
+                service=io.BytesIO(json.dumps(columns, ensure_ascii=False).encode()),
+                output_mode="json_cols",
+                spool_max_size=8,
+            )
+        finally:
+            splunk_utils.STREAM_CHUNK_SIZE = original
+        self.assertEqual(values, columns)
+
+    def test_to_json_large_json_cols_in_linear_time(self):
+        rows = 800000
+        body = json.dumps(
+            {"fields": ["a", "b"], "columns": [[str(_) for _ in range(rows)], [_ % 7 for _ in range(rows)]]}
+        ).encode()
+        start = time.perf_counter()
+        expected = json.loads(body)
+        baseline = time.perf_counter() - start
+        start = time.perf_counter()
+        values = Utils.to_json(service=io.BytesIO(body), output_mode="json_cols")
+        elapsed = time.perf_counter() - start
+        self.assertEqual(values, expected)
+        # Re-decoding a column after every chunk is quadratic in its size
+        self.assertLess(elapsed, 10 * baseline + 1)
+
+    def test_fields_clause(self):
+        self.assertEqual(Utils.fields_clause(["host", "source"]), " | fields host, source")
+        self.assertEqual(Utils.fields_clause("_raw", exclude=True), " | fields - _raw")
+        with self.assertRaises(ValueError):
+            Utils.fields_clause([])
+
+    def test_normalize_round_trip(self):
+        records = [
+            {"_key": "a", "host": "h1", "meta": {"owner": "x", "tags": ["t1", "t2"]}},
+            {"_key": "b", "host": "h2", "meta": {"level": 3}},
+        ]
+        frame = Utils.normalize(records)
+        self.assertEqual(frame.index.name, "_key")
+        self.assertEqual(sorted(frame.columns), ["host", "meta.level", "meta.owner", "meta.tags"])
+        documents = list(Utils.denormalize(frame))
+        self.assertEqual(documents[0], records[0])
+        self.assertEqual(documents[1]["meta"], {"level": 3.0})
+        self.assertEqual(documents[1]["_key"], "b")
+
+
+    def test_result_table_compact_exporter(self):
+        rows = [
+            {"host": "a", "value": "1", "mv": ["x", "y"]},
+            {"host": "b", "value": "2"},
+            {"value": "3", "extra": "e"},
+        ]
+        payload = json.dumps({"preview": False, "messages": [], "results": rows}).encode()
+        results = Utils.splunk_exporter(service=io.BytesIO(payload), compact=True)
+        table = results.json_response
+        self.assertIsInstance(table, ResultTable)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(list(table), rows)
+        self.assertEqual(table, rows)
+        self.assertEqual(table[-1], rows[-1])
+        self.assertEqual(table[1:], rows[1:])
+        self.assertEqual(table.fields, ["host", "value", "mv", "extra"])
+        self.assertEqual(table.column("extra"), [None, None, "e"])
+        frame = table.to_dataframe()
+        self.assertEqual(list(frame.columns), table.fields)
+        self.assertEqual(frame.shape, (3, 4))
+
+    def test_result_table_deduplicates_low_cardinality(self):
+        original = search.RESULT_TABLE_DISTINCT
+        search.RESULT_TABLE_DISTINCT = 8
+        try:
+            table = ResultTable.from_records(
+                {"host": "".join(["host", str(_ % 2)]), "id": "".join(["id", str(_)])} for _ in range(40)
+            )
+        finally:
+            search.RESULT_TABLE_DISTINCT = original
+        hosts = table.column("host")
+        self.assertIs(hosts[0], hosts[2])
+        ids = table.column("id")
+        self.assertEqual(ids[39], "id39")
+        # High cardinality columns stop being deduplicated
+        self.assertIsNone(table._memos[1])  # pylint: disable=protected-access
+        self.assertEqual(len(table._memos[0]), 2)  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    unittest.main()